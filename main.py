@@ -1,20 +1,49 @@
-
 import sys
 import os
-from PyQt5.QtWidgets import QApplication
-import qdarkstyle
+import argparse
+import logging
 
 # Add src directory to Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-from src.views.main_window import MainWindow
-from src.utils.database import create_tables
+from src.utils.startup_profiler import StartupProfiler
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="TaskFlow - Gestor de Tareas")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="print per-phase startup timings (imports, DB init, UI build, first paint)")
+    return parser.parse_known_args(argv)
+
+def main(argv=None):
+    args, qt_args = parse_args(sys.argv[1:] if argv is None else argv)
+    # Slow-operation warnings and debug traces go through logging.
+    logging.basicConfig(level=os.environ.get("TASKFLOW_LOG_LEVEL", "WARNING").upper(),
+                        format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    profiler = StartupProfiler(enabled=args.profile_startup)
+
+    with profiler.phase("imports"):
+        from PyQt5.QtWidgets import QApplication
+        from src.views.main_window import MainWindow
+        from src.utils.database import create_tables
+
+    with profiler.phase("db_init"):
+        create_tables()
+
+    with profiler.phase("ui_build"):
+        import qdarkstyle
+        app = QApplication(sys.argv[:1] + qt_args)
+        app.setStyleSheet(qdarkstyle.load_stylesheet_pyqt5())
+        main_window = MainWindow()
+
+    if args.profile_startup:
+        from src.views.first_paint import notify_first_paint
+
+        def report_first_paint():
+            profiler.mark("first_paint")
+            profiler.print_report()
+
+        notify_first_paint(main_window, report_first_paint)
 
-def main():
-    create_tables()
-    app = QApplication(sys.argv)
-    app.setStyleSheet(qdarkstyle.load_stylesheet_pyqt5())
-    main_window = MainWindow()
     main_window.show()
     sys.exit(app.exec_())
 
@@ -0,0 +1,29 @@
+# pytest-qt benchmark for the main window; not collected by the regular
+# suite. Run with:
+#   python -m pytest src/benchmarks/bench_main_window.py -s
+# TASKFLOW_BENCH_SIZES picks the data sizes (default 10000).
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import pytest
+from src.benchmarks.datagen import generate_dataset
+from src.benchmarks.suite import BenchContext, measure
+from src.benchmarks.ui import bench_load_tasks
+from src.utils.database import create_database_engine, migrate
+
+SIZES = [int(size) for size in os.environ.get("TASKFLOW_BENCH_SIZES", "10000").split(",")]
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_main_window_load_tasks(qtbot, tmp_path, size):
+    engine = create_database_engine(f"sqlite:///{tmp_path / 'bench.db'}")
+    migrate(engine)
+    ctx = BenchContext(engine, generate_dataset(engine, size), str(tmp_path))
+    try:
+        result = measure(ctx, "main_window_load_tasks", bench_load_tasks)
+    finally:
+        engine.dispose()
+    print(f"\n{size:>9} main_window_load_tasks median {result.median * 1000:.2f} ms")
+    # Only the first page is loaded, whatever the table size.
+    assert result.median < 1.0
@@ -0,0 +1,101 @@
+import random
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, NamedTuple, Tuple
+from sqlalchemy import insert
+from sqlalchemy.engine import Engine
+from src.controllers.task_controller import TASK_STATUSES
+from src.models.category import rebuild_category_index
+from src.models.task import Task
+from src.models.time_entry import TimeEntry, TimeRollup, split_by_day
+
+DEFAULT_SEED = 1234
+GENERATE_CHUNK_SIZE = 10000
+
+CATEGORY_COUNT = 40
+HISTORY_DAYS = 90
+MAX_SESSIONS_PER_TASK = 3
+MAX_SESSION_SECONDS = 2 * 3600
+# Generated history ends here so runs on different days stay comparable.
+DATASET_END = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+_WORDS = [
+    "informe", "revisar", "llamar", "cliente", "factura", "diseño", "reunión", "código", "pruebas", "correo",
+    "presupuesto", "planificar", "documentar", "migrar", "servidor", "backup", "compra", "lectura", "deporte",
+    "médico", "viaje", "proyecto", "equipo", "entrega", "borrador", "análisis", "datos", "seguimiento",
+]
+
+
+class Dataset(NamedTuple):
+    size: int
+    seed: int
+    categories: List[str]
+    time_entries: int
+    running_task_id: int
+
+
+# Reproducible synthetic history: the same (size, seed) always produces the
+# same tasks, sessions and rollups, with time_spent and the category index
+# consistent with the time entries so every query sees realistic data.
+def generate_dataset(engine: Engine, size: int, seed: int = DEFAULT_SEED,
+                     now: datetime = DATASET_END) -> Dataset:
+    rng = random.Random(seed)
+    categories = [f"Categoría {number:02d}" for number in range(CATEGORY_COUNT)]
+    # Skewed so a few categories hold most tasks, like real lists do.
+    weights = [1 / (rank + 1) for rank in range(CATEGORY_COUNT)]
+    running_task_id = rng.randint(1, size) if size else 0
+    entry_count = 0
+
+    with engine.begin() as connection:
+        next_id = 1
+        for chunk in _chunks(size):
+            tasks, entries = [], []
+            rollups: Dict[Tuple, List] = defaultdict(lambda: [None, 0])
+            for task_id in range(next_id, next_id + chunk):
+                category = rng.choices(categories, weights)[0]
+                created_at = now - timedelta(days=rng.uniform(0, HISTORY_DAYS))
+                time_spent = 0
+                for _ in range(rng.randint(0, MAX_SESSIONS_PER_TASK)):
+                    started_at = created_at + timedelta(seconds=rng.uniform(0, (now - created_at).total_seconds()))
+                    ended_at = min(started_at + timedelta(seconds=rng.randint(60, MAX_SESSION_SECONDS)), now)
+                    buckets = [bucket for bucket in split_by_day(started_at, ended_at) if bucket[1] > 0]
+                    seconds = sum(bucket_seconds for _, bucket_seconds in buckets)
+                    entries.append({"task_id": task_id, "category": category, "started_at": started_at,
+                                    "ended_at": ended_at, "seconds": seconds})
+                    for day, bucket_seconds in buckets:
+                        rollup = rollups[(day, task_id)]
+                        rollup[0] = category
+                        rollup[1] += bucket_seconds
+                    time_spent += seconds
+                running = task_id == running_task_id
+                tasks.append({
+                    "id": task_id,
+                    "title": _title(rng),
+                    "category": category,
+                    "status": "In Progress" if running else rng.choice(TASK_STATUSES),
+                    "time_spent": time_spent,
+                    "started_at": now - timedelta(minutes=5) if running else None,
+                    "created_at": created_at,
+                    "updated_at": created_at,
+                })
+            connection.execute(insert(Task.__table__), tasks)
+            if entries:
+                connection.execute(insert(TimeEntry.__table__), entries)
+                connection.execute(insert(TimeRollup.__table__), [
+                    {"day": day, "task_id": task_id, "category": category, "seconds": seconds}
+                    for (day, task_id), (category, seconds) in rollups.items()
+                ])
+            entry_count += len(entries)
+            next_id += chunk
+        rebuild_category_index(connection)
+
+    return Dataset(size, seed, categories, entry_count, running_task_id)
+
+
+def _title(rng: random.Random) -> str:
+    return " ".join(rng.sample(_WORDS, rng.randint(2, 4))).capitalize()
+
+
+def _chunks(size: int) -> Iterator[int]:
+    for start in range(0, size, GENERATE_CHUNK_SIZE):
+        yield min(GENERATE_CHUNK_SIZE, size - start)
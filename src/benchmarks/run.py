@@ -0,0 +1,81 @@
+import argparse
+import os
+import sys
+import tempfile
+from typing import List
+from src.benchmarks.datagen import DEFAULT_SEED, generate_dataset
+from src.benchmarks.suite import (
+    BENCHMARKS, DEFAULT_REPEAT, DEFAULT_THRESHOLD, BenchContext, BenchResult,
+    compare_results, load_results, measure, run_suite, write_results,
+)
+from src.utils.database import PROFILES, create_database_engine, migrate
+
+DEFAULT_SIZES = "10000,100000,1000000"
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="TaskFlow benchmarks over synthetic data.")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="comma-separated task counts")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--only", help="comma-separated benchmark names")
+    parser.add_argument("--ui", action="store_true", help="also time MainWindow.load_tasks (needs PyQt5)")
+    parser.add_argument("--out", help="write results as JSON")
+    parser.add_argument("--compare", help="baseline JSON to check for regressions")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="desktop",
+                        help="database engine profile (memory keeps each dataset in RAM)")
+    return parser.parse_args(argv)
+
+
+def run_size(size: int, args, workdir: str) -> List[BenchResult]:
+    engine = create_database_engine(f"sqlite:///{os.path.join(workdir, f'bench_{size}.db')}"
+                                    if not PROFILES[args.profile].in_memory else None, args.profile)
+    try:
+        migrate(engine)
+        dataset = generate_dataset(engine, size, seed=args.seed)
+        ctx = BenchContext(engine, dataset, workdir)
+        only = args.only.split(",") if args.only else None
+        results = run_suite(ctx, repeat=args.repeat, only=only)
+        if args.ui:
+            from src.benchmarks.ui import bench_load_tasks
+            results.append(measure(ctx, "main_window_load_tasks", bench_load_tasks, args.repeat))
+        return results
+    finally:
+        engine.dispose()
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    if args.only:
+        unknown = set(args.only.split(",")) - set(BENCHMARKS)
+        if unknown:
+            print(f"Unknown benchmarks: {', '.join(sorted(unknown))}", file=sys.stderr)
+            return 2
+    if args.ui:
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        from PyQt5.QtWidgets import QApplication
+        app = QApplication.instance() or QApplication([])
+
+    results: List[BenchResult] = []
+    with tempfile.TemporaryDirectory(prefix="taskflow-bench-") as workdir:
+        for size in (int(size) for size in args.sizes.split(",")):
+            for result in run_size(size, args, workdir):
+                print(f"{result.size:>9} {result.name:<24} min {result.min * 1000:10.2f} ms"
+                      f"  median {result.median * 1000:10.2f} ms")
+                results.append(result)
+
+    if args.out:
+        write_results(args.out, results, args.seed)
+    if args.compare:
+        regressions = compare_results(results, load_results(args.compare), args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression.name} @ {regression.size}: "
+                  f"{regression.baseline * 1000:.2f} ms -> {regression.current * 1000:.2f} ms "
+                  f"(x{regression.ratio:.2f})")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,221 @@
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, NamedTuple, Optional
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+from src.benchmarks.datagen import Dataset, DATASET_END, HISTORY_DAYS
+from src.controllers.task_controller import TaskController
+from src.models.category import Category
+from src.utils.csv_export import export_tasks_csv
+
+RESULTS_FORMAT = 1
+DEFAULT_REPEAT = 5
+# Write benchmarks time this many operations per run.
+CRUD_OPERATIONS = 100
+# A median this much slower than the baseline is reported as a regression.
+DEFAULT_THRESHOLD = 0.25
+# ...and by at least this many seconds, so sub-millisecond jitter is ignored.
+MIN_REGRESSION_SECONDS = 0.002
+
+
+class BenchResult(NamedTuple):
+    name: str
+    size: int
+    repeat: int
+    min: float
+    median: float
+
+
+class Regression(NamedTuple):
+    name: str
+    size: int
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline if self.baseline else float("inf")
+
+
+# What a benchmark gets to work with. Sessions are opened fresh for every
+# run so nothing is served from a previous run's identity map.
+class BenchContext:
+    def __init__(self, engine: Engine, dataset: Dataset, workdir: str):
+        self.engine = engine
+        self.dataset = dataset
+        self.workdir = workdir
+        self._session_factory = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+        self._cleanups: List[Callable[[], None]] = []
+
+    def session(self) -> Session:
+        session = self._session_factory()
+        self.defer(session.close)
+        return session
+
+    def controller(self) -> TaskController:
+        return TaskController(self.session())
+
+    def defer(self, cleanup: Callable[[], None]) -> None:
+        self._cleanups.append(cleanup)
+
+    def cleanup(self) -> None:
+        while self._cleanups:
+            self._cleanups.pop()()
+
+
+# A benchmark prepares whatever it needs and returns the callable to time;
+# setup and cleanup stay outside the measurement.
+Benchmark = Callable[[BenchContext], Callable[[], object]]
+
+
+def bench_create_task(ctx: BenchContext):
+    controller = ctx.controller()
+    created: List[int] = []
+    ctx.defer(lambda: controller.delete_tasks(created))
+
+    def run():
+        for number in range(CRUD_OPERATIONS):
+            created.append(controller.create_task(f"Bench {number}", ctx.dataset.categories[0]).id)
+    return run
+
+
+def bench_update_task(ctx: BenchContext):
+    controller = ctx.controller()
+    task_ids = _spread_ids(ctx.dataset, CRUD_OPERATIONS)
+
+    def run():
+        # A fresh title every run so each update is a real write.
+        stamp = time.perf_counter_ns()
+        for task_id in task_ids:
+            controller.update_task(task_id, title=f"Bench {stamp}")
+    return run
+
+
+def bench_delete_task(ctx: BenchContext):
+    controller = ctx.controller()
+    with controller.batch():
+        task_ids = [controller.create_task(f"Bench {number}", ctx.dataset.categories[0]).id
+                    for number in range(CRUD_OPERATIONS)]
+
+    def run():
+        for task_id in task_ids:
+            controller.delete_task(task_id)
+    return run
+
+
+def bench_get_all_tasks(ctx: BenchContext):
+    return ctx.controller().get_all_tasks
+
+
+def bench_get_tasks_by_category(ctx: BenchContext):
+    controller = ctx.controller()
+    return lambda: controller.get_tasks_by_category(ctx.dataset.categories[0])
+
+
+def bench_get_running_task(ctx: BenchContext):
+    return ctx.controller().get_running_task
+
+
+def bench_first_page(ctx: BenchContext):
+    return ctx.controller().get_tasks_page
+
+
+def bench_search(ctx: BenchContext):
+    controller = ctx.controller()
+    return lambda: controller.search("inf")
+
+
+def bench_statistics_categories(ctx: BenchContext):
+    # The aggregate the statistics dialog loads.
+    session = ctx.session()
+    return lambda: session.query(Category.name, Category.time_spent).order_by(Category.name).all()
+
+
+def bench_statistics_time_range(ctx: BenchContext):
+    controller = ctx.controller()
+    end = DATASET_END.date()
+    start = end - timedelta(days=HISTORY_DAYS)
+    return lambda: controller.get_time_by_category(start, end)
+
+
+def bench_csv_export(ctx: BenchContext):
+    path = os.path.join(ctx.workdir, "export.csv")
+    ctx.defer(lambda: os.path.exists(path) and os.remove(path))
+    return lambda: export_tasks_csv(path, bind=ctx.engine)
+
+
+BENCHMARKS: Dict[str, Benchmark] = {
+    "create_task": bench_create_task,
+    "update_task": bench_update_task,
+    "delete_task": bench_delete_task,
+    "get_all_tasks": bench_get_all_tasks,
+    "get_tasks_by_category": bench_get_tasks_by_category,
+    "get_running_task": bench_get_running_task,
+    "get_tasks_page": bench_first_page,
+    "search": bench_search,
+    "statistics_categories": bench_statistics_categories,
+    "statistics_time_range": bench_statistics_time_range,
+    "csv_export": bench_csv_export,
+}
+
+
+def measure(ctx: BenchContext, name: str, benchmark: Benchmark, repeat: int = DEFAULT_REPEAT) -> BenchResult:
+    timings = []
+    for _ in range(repeat):
+        try:
+            run = benchmark(ctx)
+            started = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - started)
+        finally:
+            ctx.cleanup()
+    return BenchResult(name, ctx.dataset.size, repeat, min(timings), statistics.median(timings))
+
+
+def run_suite(ctx: BenchContext, repeat: int = DEFAULT_REPEAT,
+              only: Optional[List[str]] = None) -> List[BenchResult]:
+    return [measure(ctx, name, benchmark, repeat) for name, benchmark in BENCHMARKS.items()
+            if only is None or name in only]
+
+
+def compare_results(current: List[BenchResult], baseline: List[BenchResult],
+                    threshold: float = DEFAULT_THRESHOLD) -> List[Regression]:
+    # Medians are compared: a single slow run shouldn't flag anything.
+    previous = {(result.name, result.size): result.median for result in baseline}
+    regressions = []
+    for result in current:
+        before = previous.get((result.name, result.size))
+        if (before is not None and result.median > before * (1 + threshold)
+                and result.median - before >= MIN_REGRESSION_SECONDS):
+            regressions.append(Regression(result.name, result.size, before, result.median))
+    return regressions
+
+
+def write_results(path: str, results: List[BenchResult], seed: int) -> None:
+    document = {
+        "format": RESULTS_FORMAT,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "machine": platform.machine(),
+        "seed": seed,
+        "results": [result._asdict() for result in results],
+    }
+    with open(path, "w", encoding="utf-8") as output:
+        json.dump(document, output, indent=2)
+
+
+def load_results(path: str) -> List[BenchResult]:
+    with open(path, "r", encoding="utf-8") as source:
+        document = json.load(source)
+    return [BenchResult(**result) for result in document["results"]]
+
+
+def _spread_ids(dataset: Dataset, count: int) -> List[int]:
+    step = max(dataset.size // count, 1)
+    return list(range(1, dataset.size + 1, step))[:count]
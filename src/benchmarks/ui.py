@@ -0,0 +1,21 @@
+import os
+from src.benchmarks.suite import BenchContext
+from src.utils import database
+
+# Needs a running QApplication. The window's session factory is pointed at
+# the benchmark engine and its journal kept inside the work directory.
+def bench_load_tasks(ctx: BenchContext):
+    from src.views.main_window import MainWindow
+
+    previous_cwd = os.getcwd()
+    os.chdir(ctx.workdir)
+    database.SessionLocal.configure(bind=ctx.engine)
+    window = MainWindow()
+
+    def restore():
+        window.close()
+        window.deleteLater()
+        database.SessionLocal.configure(bind=database.engine)
+        os.chdir(previous_cwd)
+    ctx.defer(restore)
+    return window.load_tasks
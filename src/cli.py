@@ -0,0 +1,176 @@
+import argparse
+import json
+import sys
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
+
+# Console entry point for scripts and shell prompts. It is built on the
+# controller and the database module only: nothing here may import PyQt5,
+# matplotlib or plyer, directly or through src.views.
+from src.controllers.task_controller import TaskController, DEFAULT_PAGE_SIZE
+from src.models.task import TaskSnapshot, format_duration
+from src.models.task_filter import FILTER_SORT_KEYS, TaskFilter
+from src.utils.archive import ARCHIVE_AFTER_DAYS
+from src.utils.database import create_tables, get_db_session
+from src.utils.exceptions import TaskFlowError
+
+REPORT_DAYS = 7
+
+
+def task_to_dict(task: TaskSnapshot) -> dict:
+    return {
+        "id": task.id,
+        "title": task.title,
+        "category": task.category,
+        "status": task.status,
+        "running": task.is_running,
+        "time_spent": task.time_spent,
+        "total_seconds": task.get_total_time_seconds(),
+        "total_human": task.total_time_str(),
+        "started_at": task.started_at.isoformat() if task.started_at else None,
+    }
+
+
+def cmd_start(controller: TaskController, args) -> dict:
+    return task_to_dict(controller.switch_timer(args.task_id).snapshot())
+
+
+def cmd_stop(controller: TaskController, args) -> dict:
+    task_id = args.task_id
+    if task_id is None:
+        running = controller.get_running_task()
+        if running is None:
+            return {"stopped": None}
+        task_id = running.id
+    return {"stopped": task_to_dict(controller.stop_task_timer(task_id).snapshot())}
+
+
+def cmd_status(controller: TaskController, args) -> dict:
+    running = controller.get_running_task()
+    return {"running": task_to_dict(running.snapshot()) if running else None}
+
+
+def cmd_list(controller: TaskController, args) -> dict:
+    if args.search:
+        return {"tasks": [task_to_dict(task) for task in controller.search(args.search, args.limit, args.category,
+                                                                         args.include_archived)],
+                "next_after": None}
+    if args.status or args.running or args.min_seconds is not None or args.max_seconds is not None or args.sort:
+        spec = TaskFilter(
+            categories={args.category} if args.category else frozenset(),
+            statuses=set(args.status or ()),
+            running=True if args.running else None,
+            min_time_spent=args.min_seconds,
+            max_time_spent=args.max_seconds,
+            sort=tuple((key.lstrip("-"), key.startswith("-")) for key in args.sort or ["id"]),
+        )
+        result = controller.filter_tasks(spec, args.limit)
+        return {"tasks": [task_to_dict(task) for task in result.items], "truncated": result.truncated}
+    after = (args.after, args.after) if args.after is not None else None
+    page = controller.get_tasks_page(after=after, limit=args.limit, category=args.category)
+    return {"tasks": [task_to_dict(task) for task in page.items],
+            "next_after": page.next_cursor[1] if page.has_more else None}
+
+
+def cmd_report(controller: TaskController, args) -> dict:
+    until = args.until or datetime.now(timezone.utc).date()
+    since = args.since or until - timedelta(days=REPORT_DAYS - 1)
+    if args.by == "category":
+        rows = [{"category": name, "seconds": seconds}
+                for name, seconds in controller.get_time_by_category(since, until, args.include_archived)]
+    elif args.by == "day":
+        rows = [{"day": day.isoformat(), "seconds": seconds}
+                for day, seconds in controller.get_time_by_day(since, until, args.category, args.include_archived)]
+    else:
+        rows = [{"task_id": task_id, "seconds": seconds}
+                for task_id, seconds in controller.get_time_by_task(since, until, args.include_archived)]
+    for row in rows:
+        row["human"] = format_duration(row["seconds"])
+    return {"since": since.isoformat(), "until": until.isoformat(), "by": args.by, "rows": rows,
+            "total_seconds": sum(row["seconds"] for row in rows)}
+
+
+def cmd_export(controller: TaskController, args) -> dict:
+    from src.utils.csv_export import export_tasks_csv
+    return {"path": args.path, "rows": export_tasks_csv(args.path, include_archived=args.include_archived)}
+
+
+def cmd_archive(controller: TaskController, args) -> dict:
+    return {"archived": controller.archive_completed_tasks(args.older_than)}
+
+
+def _day(value: str) -> date:
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid date '{value}' (expected YYYY-MM-DD)")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    output = argparse.ArgumentParser(add_help=False)
+    output.add_argument("--indent", type=int, default=None, help="pretty-print the JSON output")
+    history = argparse.ArgumentParser(add_help=False)
+    history.add_argument("--include-archived", action="store_true", help="also read the archive database")
+    parser = argparse.ArgumentParser(prog="taskflow", description="TaskFlow desde la línea de comandos (salida JSON).")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    start = commands.add_parser("start", parents=[output], help="start a task's timer, stopping the running one")
+    start.add_argument("task_id", type=int)
+    start.set_defaults(handler=cmd_start)
+
+    stop = commands.add_parser("stop", parents=[output], help="stop the running timer (or the given task's)")
+    stop.add_argument("task_id", type=int, nargs="?")
+    stop.set_defaults(handler=cmd_stop)
+
+    status = commands.add_parser("status", parents=[output], help="show the running task")
+    status.set_defaults(handler=cmd_status)
+
+    listing = commands.add_parser("list", parents=[output, history], help="list tasks a page at a time")
+    listing.add_argument("--category")
+    listing.add_argument("--search", help="full-text prefix search")
+    listing.add_argument("--limit", type=int, default=DEFAULT_PAGE_SIZE)
+    listing.add_argument("--after", type=int, help="continue after this task id (next_after)")
+    listing.add_argument("--status", action="append", help="filter by status (repeatable)")
+    listing.add_argument("--running", action="store_true", help="only the running task")
+    listing.add_argument("--min-seconds", type=int)
+    listing.add_argument("--max-seconds", type=int)
+    listing.add_argument("--sort", action="append", metavar="[-]KEY",
+                         help=f"sort key, --sort=-KEY for descending (repeatable): {', '.join(FILTER_SORT_KEYS)}")
+    listing.set_defaults(handler=cmd_list)
+
+    report = commands.add_parser("report", parents=[output, history], help="tracked time over a day range")
+    report.add_argument("--since", type=_day)
+    report.add_argument("--until", type=_day)
+    report.add_argument("--by", choices=("category", "day", "task"), default="category")
+    report.add_argument("--category", help="only with --by day")
+    report.set_defaults(handler=cmd_report)
+
+    export = commands.add_parser("export", parents=[output, history], help="export every task to CSV")
+    export.add_argument("path")
+    export.set_defaults(handler=cmd_export)
+
+    archive = commands.add_parser("archive", parents=[output], help="move old completed tasks to the archive")
+    archive.add_argument("--older-than", type=int, default=ARCHIVE_AFTER_DAYS, metavar="DAYS",
+                         help=f"completed and untouched for this many days (default {ARCHIVE_AFTER_DAYS})")
+    archive.set_defaults(handler=cmd_archive)
+    return parser
+
+
+def main(argv: Optional[list] = None, stdout=None, stderr=None) -> int:
+    stdout = stdout or sys.stdout
+    stderr = stderr or sys.stderr
+    args = build_parser().parse_args(argv)
+
+    create_tables()
+    db_session = get_db_session()
+    try:
+        result = args.handler(TaskController(db_session), args)
+    except TaskFlowError as e:
+        json.dump({"error": str(e)}, stderr)
+        stderr.write("\n")
+        return 1
+    finally:
+        db_session.close()
+    json.dump(result, stdout, indent=args.indent, ensure_ascii=False)
+    stdout.write("\n")
+    return 0
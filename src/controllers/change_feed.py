@@ -0,0 +1,57 @@
+from typing import List, Optional
+from sqlalchemy.engine import Connection, Engine
+from src.models.task_changes import TaskChange, last_change_seq, read_changes
+from src.utils import database
+
+# Cross-instance change feed over the task_changes log.
+#
+# Holds one dedicated connection and asks SQLite for PRAGMA data_version,
+# which only moves when some other connection commits; while it stands
+# still a poll costs no query on any table. Once it moves, the log is read
+# from the watermark on:
+#
+#     changes = feed.poll()
+#     if changes:
+#         controller.apply_changes(changes)
+#
+# The feed starts at the log's current end: whatever happened before the
+# instance started is already in what it loads.
+class ChangeFeed:
+    def __init__(self, bind: Optional[Engine] = None):
+        self.bind = bind or database.engine
+        self.watermark = 0
+        self._connection: Optional[Connection] = None
+        self._data_version: Optional[int] = None
+
+    def start(self) -> None:
+        if self._connection is not None:
+            return
+        self._connection = self.bind.connect()
+        self._data_version = self._read_data_version()
+        self.watermark = last_change_seq(self._connection)
+        self._connection.rollback()
+
+    def poll(self) -> List[TaskChange]:
+        if self._connection is None:
+            self.start()
+            return []
+        try:
+            data_version = self._read_data_version()
+            if data_version == self._data_version:
+                return []
+            self._data_version = data_version
+            changes = read_changes(self._connection, self.watermark)
+        finally:
+            # Never keep a read transaction open between polls.
+            self._connection.rollback()
+        if changes:
+            self.watermark = changes[-1].seq
+        return changes
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _read_data_version(self) -> int:
+        return self._connection.exec_driver_sql("PRAGMA data_version").scalar()
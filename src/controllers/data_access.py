@@ -0,0 +1,87 @@
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, List, Optional, TypeVar
+from sqlalchemy.orm import Session
+from src.controllers.task_controller import TaskController, TaskListener
+from src.utils.database import get_db_session
+
+logger = logging.getLogger(__name__)
+
+READ_POOL_SIZE = 2
+
+T = TypeVar("T")
+
+
+# Asynchronous access to the database off the GUI thread.
+#
+# Every write goes through one writer thread that owns its own session and
+# TaskController; commands run one at a time in submission order, so each
+# sees the effects of the ones before it. Reads run on a small pool, each
+# with a short-lived session. Commands get the controller and must return
+# session-free values (snapshots, ids, counts), never ORM objects:
+#
+#     future = data_access.write(lambda controller: controller.switch_timer(task_id).snapshot())
+#
+# Change events from the writer's controller are forwarded to listeners on
+# the writer thread, before the command's future completes.
+class DataAccess:
+    def __init__(self, session_factory: Callable[[], Session] = get_db_session, readers: int = READ_POOL_SIZE):
+        self._session_factory = session_factory
+        self._listeners: List[TaskListener] = []
+        self._writer_controller: Optional[TaskController] = None
+        self._closed = False
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="taskflow-writer",
+                                          initializer=self._start_writer)
+        self._readers = ThreadPoolExecutor(max_workers=readers, thread_name_prefix="taskflow-reader")
+
+    def add_listener(self, listener: TaskListener) -> None:
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: TaskListener) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def write(self, command: Callable[[TaskController], T]) -> "Future[T]":
+        return self._writer.submit(self._run_write, command)
+
+    def read(self, query: Callable[[TaskController], T]) -> "Future[T]":
+        return self._readers.submit(self._run_read, query)
+
+    def drain(self) -> None:
+        # Blocks until every write submitted so far has finished.
+        self._writer.submit(lambda: None).result()
+
+    def shutdown(self) -> None:
+        # Queued writes still run; only then is the writer's session closed.
+        if self._closed:
+            return
+        self._closed = True
+        self._writer.submit(self._stop_writer)
+        self._writer.shutdown(wait=True)
+        self._readers.shutdown(wait=True)
+
+    def _start_writer(self) -> None:
+        self._writer_controller = TaskController(self._session_factory())
+        self._writer_controller.add_listener(self._forward)
+
+    def _stop_writer(self) -> None:
+        if self._writer_controller is not None:
+            self._writer_controller.db_session.close()
+            self._writer_controller = None
+
+    def _run_write(self, command: Callable[[TaskController], T]) -> T:
+        return command(self._writer_controller)
+
+    def _run_read(self, query: Callable[[TaskController], T]) -> T:
+        session = self._session_factory()
+        try:
+            return query(TaskController(session))
+        finally:
+            session.close()
+
+    def _forward(self, event, task_id, snapshot) -> None:
+        for listener in list(self._listeners):
+            try:
+                listener(event, task_id, snapshot)
+            except Exception:
+                logger.exception("Change listener failed for %s %s", event, task_id)
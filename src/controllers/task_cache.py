@@ -0,0 +1,133 @@
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional, Set
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from src.models.task import Task, TaskSnapshot
+
+# Read-side cache of task snapshots keyed by id.
+#
+# The owning controller refreshes entries after its own writes; any other
+# write that goes through a bound session is caught by the flush/commit
+# events and evicted, so a hit is never older than the last commit.
+class TaskCache:
+    def __init__(self):
+        self._snapshots: Dict[int, TaskSnapshot] = {}
+        self._flushed_ids: Set[int] = set()
+        self.hits = 0
+        self.misses = 0
+
+    def bind(self, session: Session) -> None:
+        event.listen(session, "after_flush", self._after_flush)
+        event.listen(session, "after_commit", self._after_commit)
+        event.listen(session, "after_rollback", self._after_rollback)
+
+    def unbind(self, session: Session) -> None:
+        event.remove(session, "after_flush", self._after_flush)
+        event.remove(session, "after_commit", self._after_commit)
+        event.remove(session, "after_rollback", self._after_rollback)
+
+    def get(self, task_id: int) -> Optional[TaskSnapshot]:
+        snapshot = self._snapshots.get(task_id)
+        if snapshot is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return snapshot
+
+    def put(self, snapshot: TaskSnapshot) -> None:
+        self._snapshots[snapshot.id] = snapshot
+
+    def invalidate(self, task_id: int) -> None:
+        self._snapshots.pop(task_id, None)
+
+    def invalidate_many(self, task_ids: Iterable[int]) -> None:
+        for task_id in task_ids:
+            self._snapshots.pop(task_id, None)
+
+    def clear(self) -> None:
+        self._snapshots.clear()
+        self._flushed_ids.clear()
+
+    def __len__(self) -> int:
+        return len(self._snapshots)
+
+    def __contains__(self, task_id: int) -> bool:
+        return task_id in self._snapshots
+
+    @property
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._snapshots),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def _after_flush(self, session, flush_context) -> None:
+        for instance in list(session.new) + list(session.dirty) + list(session.deleted):
+            if isinstance(instance, Task) and instance.id is not None:
+                self._flushed_ids.add(instance.id)
+
+    def _after_commit(self, session) -> None:
+        self.invalidate_many(self._flushed_ids)
+        self._flushed_ids.clear()
+
+    def _after_rollback(self, session) -> None:
+        self.invalidate_many(self._flushed_ids)
+        self._flushed_ids.clear()
+
+
+FILTER_CACHE_SIZE = 16
+
+
+# Small LRU of filter results keyed on the filter spec.
+#
+# Entries are only valid at the data version they were read at (the last
+# task_changes seq, which every writer moves); once it moves, the whole
+# cache is dropped on the next lookup.
+class FilterCache:
+    def __init__(self, max_size: int = FILTER_CACHE_SIZE):
+        self.max_size = max_size
+        self._results: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._version: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, version: int) -> Optional[Any]:
+        if version != self._version:
+            self._results.clear()
+            self._version = version
+        result = self._results.get(key)
+        if result is None:
+            self.misses += 1
+            return None
+        self._results.move_to_end(key)
+        self.hits += 1
+        return result
+
+    def put(self, key: Hashable, version: int, result: Any) -> None:
+        if version != self._version:
+            self._results.clear()
+            self._version = version
+        self._results[key] = result
+        self._results.move_to_end(key)
+        while len(self._results) > self.max_size:
+            self._results.popitem(last=False)
+
+    def clear(self) -> None:
+        self._results.clear()
+        self._version = None
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    @property
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._results),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
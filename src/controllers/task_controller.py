@@ -1,24 +1,335 @@
-from typing import List, Optional
-from sqlalchemy.orm import Session
-from src.models.task import Task
-from src.utils.exceptions import TaskNotFoundError, TaskValidationError, DatabaseError
+import logging
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta, timezone
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
+from sqlalchemy import case, delete, func, insert, select, tuple_, update
+from sqlalchemy.orm import Query, Session
+from sqlalchemy.orm.exc import StaleDataError
+from src.models.task import Task, TaskSnapshot, DEFAULT_CATEGORY, as_utc
+from src.models.category import Category, track_category_index, apply_category_deltas
+from src.models.time_entry import TimeEntry, TimeRollup, record_time_entry
+from src.models.task_search import build_match_expression, search_query
+from src.models.task_changes import TaskChange, CHANGE_DELETED, CHANGE_GAP, CHANGE_INSERTED, last_change_seq
+from src.models.task_filter import TaskFilter, filter_query
+from src.controllers.task_cache import FilterCache, TaskCache
+from src.utils.exceptions import (
+    TaskFlowError, TaskNotFoundError, TaskValidationError, DatabaseError, ConcurrentModificationError,
+)
+from src.utils.importer import ImportResult, import_tasks_file
+from src.utils.archive import (
+    ARCHIVE_AFTER_DAYS, ArchiveStore, archive_cutoff, default_archive_path, shared_archive_store,
+)
+
+logger = logging.getLogger(__name__)
+
+TASK_INSERTED = "inserted"
+TASK_UPDATED = "updated"
+TASK_REMOVED = "removed"
+# Many rows changed at once; listeners should reload (task_id is 0).
+TASKS_RELOADED = "reloaded"
+
+TASK_STATUSES = ("Pending", "In Progress", "Completed")
+IMPORT_BATCH_SIZE = 5000
+
+# Keeps every "WHERE id IN (...)" under SQLite's bound-parameter limit.
+ID_CHUNK_SIZE = 900
+# Past this many row events in one commit, listeners get one TASKS_RELOADED.
+BULK_EVENT_LIMIT = 200
+BULK_UPDATE_FIELDS = ("title", "category", "status")
+
+DEFAULT_PAGE_SIZE = 200
+DEFAULT_SEARCH_LIMIT = 50
+# Filtered lists are read whole, up to this many rows.
+FILTER_LIMIT = 1000
+# Every sort key is backed by an index ending in id, so each page is a seek.
+PAGE_SORT_KEYS = {
+    "id": Task.id,
+    "title": Task.title,
+    "updated_at": Task.updated_at,
+}
+
+# Position after the last row of a page: (sort value, id).
+PageCursor = Tuple[Any, int]
+
+class TaskPage(NamedTuple):
+    items: List[TaskSnapshot]
+    next_cursor: Optional[PageCursor]
+
+    @property
+    def has_more(self) -> bool:
+        return self.next_cursor is not None
+
+class FilterResult(NamedTuple):
+    # A tuple: results are shared through the filter cache.
+    items: Tuple[TaskSnapshot, ...]
+    truncated: bool
+
+# listener(event, task_id, snapshot) -- snapshot is None for TASK_REMOVED
+TaskListener = Callable[[str, int, Optional[TaskSnapshot]], None]
+
+def _chunks(task_ids: Iterable[int]) -> Iterable[List[int]]:
+    task_ids = iter(task_ids)
+    while True:
+        chunk = list(islice(task_ids, ID_CHUNK_SIZE))
+        if not chunk:
+            return
+        yield chunk
+
+def _as_deltas(category_deltas: Dict[str, List[int]]) -> Dict[str, Tuple[int, int]]:
+    return {name: tuple(delta) for name, delta in category_deltas.items()}
+
+def _conflict(error: StaleDataError) -> ConcurrentModificationError:
+    return ConcurrentModificationError(f"The task was changed by another window or process; reload and try again. ({error})")
+
+def _merge_totals(*sources: Iterable[Tuple[Any, int]]) -> List[Tuple[Any, int]]:
+    totals: Dict[Any, int] = defaultdict(int)
+    for rows in sources:
+        for key, seconds in rows:
+            totals[key] += seconds or 0
+    return sorted(totals.items())
 
 class TaskController:
-    def __init__(self, db_session: Session):
+    def __init__(self, db_session: Session, archive: Optional[ArchiveStore] = None):
         self.db_session = db_session
+        self._archive = archive
+        self._listeners: List[TaskListener] = []
+        self._pending_events: List[Tuple[str, int, Optional[Union[Task, TaskSnapshot]]]] = []
+        self._batch_depth = 0
+        self.cache = TaskCache()
+        self.cache.bind(db_session)
+        self.filter_cache = FilterCache()
+        track_category_index(db_session)
+
+    def add_listener(self, listener: TaskListener) -> None:
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: TaskListener) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _notify(self, event: str, task_id: int, task: Optional[Union[Task, TaskSnapshot]] = None) -> None:
+        # Delivered (and cached) only once the surrounding commit succeeds.
+        self._pending_events.append((event, task_id, task))
+
+    def _dispatch_pending(self) -> None:
+        events, self._pending_events = self._pending_events, []
+        delivered = []
+        for event, task_id, task in events:
+            snapshot = None
+            if task is None:
+                self.cache.invalidate(task_id)
+            else:
+                # Sessions don't expire on commit, so this reads no rows.
+                snapshot = task if isinstance(task, TaskSnapshot) else task.snapshot()
+                self.cache.put(snapshot)
+            delivered.append((event, task_id, snapshot))
+        if len(delivered) > BULK_EVENT_LIMIT:
+            delivered = [(TASKS_RELOADED, 0, None)]
+        for event, task_id, snapshot in delivered:
+            for listener in list(self._listeners):
+                listener(event, task_id, snapshot)
+
+    def apply_external_change(self, event: str, task_id: int, snapshot: Optional[TaskSnapshot]) -> None:
+        # A change committed through another session (the writer thread):
+        # bring the cache and identity map in line, then tell listeners.
+        if event == TASKS_RELOADED:
+            self.cache.clear()
+            self.db_session.expire_all()
+        else:
+            task = self.db_session.identity_map.get(self.db_session.identity_key(Task, task_id))
+            if task is not None:
+                if snapshot is None:
+                    self.db_session.expunge(task)
+                else:
+                    self.db_session.expire(task)
+            if snapshot is None:
+                self.cache.invalidate(task_id)
+            else:
+                self.cache.put(snapshot)
+        for listener in list(self._listeners):
+            listener(event, task_id, snapshot)
+
+    def apply_changes(self, changes: Sequence[TaskChange]) -> int:
+        # Change-feed entries committed by anyone (this instance included):
+        # rows this controller already holds at that version are skipped,
+        # the rest are re-read with one SELECT per chunk and notified.
+        if self.in_batch:
+            raise TaskFlowError("Cannot apply outside changes inside a batch.")
+        if any(change.op == CHANGE_GAP for change in changes):
+            self._reload_all()
+            return 1
+        latest: Dict[int, TaskChange] = {}
+        inserted = set()
+        for change in changes:
+            latest[change.task_id] = change
+            if change.op == CHANGE_INSERTED:
+                inserted.add(change.task_id)
+        stale = []
+        for task_id, change in latest.items():
+            if change.op == CHANGE_DELETED:
+                self._forget(task_id, deleted=True)
+                self._notify(TASK_REMOVED, task_id)
+                continue
+            cached = self.cache.get(task_id)
+            if cached is None or cached.version != change.version:
+                stale.append(task_id)
+        if len(stale) > BULK_EVENT_LIMIT:
+            self._reload_all()
+            return len(latest)
+        for chunk in _chunks(stale):
+            for task_id in chunk:
+                self._forget(task_id)
+            rows = {row.id: row for row in self.db_session.execute(
+                select(*Task.__table__.c).where(Task.id.in_(chunk))
+            )}
+            for task_id in chunk:
+                if task_id not in rows:
+                    self._forget(task_id, deleted=True)
+                    self._notify(TASK_REMOVED, task_id)
+                else:
+                    event = TASK_INSERTED if task_id in inserted else TASK_UPDATED
+                    self._notify(event, task_id, TaskSnapshot.from_row(rows[task_id]))
+        # Ends the read transaction, so the next read sees newer commits.
+        self.db_session.commit()
+        changed = len(self._pending_events)
+        self._dispatch_pending()
+        return changed
+
+    def _forget(self, task_id: int, deleted: bool = False) -> None:
+        task = self.db_session.identity_map.get(self.db_session.identity_key(Task, task_id))
+        if task is not None:
+            if deleted:
+                self.db_session.expunge(task)
+            else:
+                self.db_session.expire(task)
+        self.cache.invalidate(task_id)
+
+    def _reload_all(self) -> None:
+        self.db_session.commit()
+        self.db_session.expire_all()
+        self.cache.clear()
+        self._notify(TASKS_RELOADED, 0)
+        self._dispatch_pending()
+
+    @contextmanager
+    def batch(self):
+        # Groups several controller calls into a single commit:
+        #
+        #     with controller.batch():
+        #         controller.stop_task_timer(old_id)
+        #         controller.start_task_timer(new_id)
+        #
+        # Inside the block writes are only flushed; an error anywhere rolls
+        # back the whole batch. Batches nest.
+        self._batch_depth += 1
+        try:
+            yield self
+        except Exception:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self._abort()
+            raise
+        self._batch_depth -= 1
+        if self._batch_depth == 0:
+            try:
+                self.db_session.commit()
+            except StaleDataError as e:
+                self._abort()
+                raise _conflict(e)
+            except Exception as e:
+                self._abort()
+                raise DatabaseError(f"Error committing batch: {e}")
+            self._dispatch_pending()
+
+    @property
+    def in_batch(self) -> bool:
+        return self._batch_depth > 0
+
+    @contextmanager
+    def _write(self, error_message: str):
+        try:
+            yield
+            if self._batch_depth:
+                self.db_session.flush()
+            else:
+                self.db_session.commit()
+        except Exception as e:
+            self._abort()
+            if isinstance(e, TaskFlowError):
+                raise
+            if isinstance(e, StaleDataError):
+                raise _conflict(e)
+            raise DatabaseError(f"{error_message}: {e}")
+        if not self._batch_depth:
+            self._dispatch_pending()
+
+    def _abort(self) -> None:
+        self._pending_events = []
+        self.db_session.rollback()
 
     def create_task(self, title: str, category: str = "General") -> Task:
         if not title:
             raise TaskValidationError("Task title cannot be empty.")
-        try:
+        with self._write("Error creating task"):
             new_task = Task(title=title, category=category)
             self.db_session.add(new_task)
-            self.db_session.commit()
-            self.db_session.refresh(new_task)
-            return new_task
-        except Exception as e:
-            self.db_session.rollback()
-            raise DatabaseError(f"Error creating task: {e}")
+            self.db_session.flush()
+            self._notify(TASK_INSERTED, new_task.id, new_task)
+        return new_task
+
+    def bulk_create_tasks(self, rows: Iterable[Dict], batch_size: int = IMPORT_BATCH_SIZE) -> int:
+        # All batches share one transaction: the import is all or nothing.
+        created = 0
+        category_deltas: Dict[str, List[int]] = defaultdict(lambda: [0, 0])
+        rows = iter(rows)
+        with self._write("Error importing tasks"):
+            connection = self.db_session.connection()
+            while True:
+                batch = [self._validate_import_row(row, created + offset + 1)
+                         for offset, row in enumerate(islice(rows, batch_size))]
+                if not batch:
+                    break
+                connection.execute(insert(Task.__table__), batch)
+                for values in batch:
+                    delta = category_deltas[values["category"]]
+                    delta[0] += 1
+                    delta[1] += values["time_spent"]
+                created += len(batch)
+            apply_category_deltas(connection, _as_deltas(category_deltas))
+            if created:
+                self._notify(TASKS_RELOADED, 0)
+        return created
+
+    def import_tasks(self, path: str, batch_size: int = IMPORT_BATCH_SIZE) -> ImportResult:
+        return import_tasks_file(self, path, batch_size)
+
+    @staticmethod
+    def _validate_import_row(row: Dict, number: int) -> Dict:
+        where = f"Line {row['_line']}" if "_line" in row else f"Row {number}"
+        title = str(row.get("title") or "").strip()
+        if not title:
+            raise TaskValidationError(f"{where}: task title cannot be empty.")
+        status = row.get("status") or "Pending"
+        if status not in TASK_STATUSES:
+            raise TaskValidationError(f"{where}: unknown status '{status}'.")
+        try:
+            time_spent = int(row.get("time_spent") or 0)
+        except (TypeError, ValueError):
+            raise TaskValidationError(f"{where}: time spent must be a whole number of seconds.")
+        if time_spent < 0:
+            raise TaskValidationError(f"{where}: time spent cannot be negative.")
+        # executemany needs every row to bind the same columns.
+        now = datetime.now(timezone.utc)
+        return {
+            "title": title,
+            "category": str(row.get("category") or "").strip() or DEFAULT_CATEGORY,
+            "status": status,
+            "time_spent": time_spent,
+            "created_at": row.get("created_at") or now,
+            "updated_at": row.get("updated_at") or row.get("created_at") or now,
+        }
 
     def get_task(self, task_id: int) -> Task:
         task = self.db_session.get(Task, task_id)
@@ -26,6 +337,92 @@ class TaskController:
             raise TaskNotFoundError(f"Task with ID {task_id} not found.")
         return task
 
+    def get_task_snapshot(self, task_id: int) -> TaskSnapshot:
+        snapshot = self.cache.get(task_id)
+        if snapshot is None:
+            snapshot = self.get_task(task_id).snapshot()
+            self.cache.put(snapshot)
+        return snapshot
+
+    def list_task_snapshots(self, category: Optional[str] = None) -> List[TaskSnapshot]:
+        tasks = self.get_all_tasks() if category is None else self.get_tasks_by_category(category)
+        snapshots = [task.snapshot() for task in tasks]
+        for snapshot in snapshots:
+            self.cache.put(snapshot)
+        return snapshots
+
+    def tasks_page_query(self, after: Optional[PageCursor] = None, limit: int = DEFAULT_PAGE_SIZE,
+                         category: Optional[str] = None, sort_key: str = "id", descending: bool = False):
+        if sort_key not in PAGE_SORT_KEYS:
+            raise TaskValidationError(f"Cannot page tasks by {sort_key}.")
+        column = PAGE_SORT_KEYS[sort_key]
+        query = select(*Task.__table__.c)
+        if category is not None:
+            query = query.where(Task.category == category)
+        if after is not None:
+            value, last_id = after
+            if sort_key == "id":
+                query = query.where(Task.id < last_id if descending else Task.id > last_id)
+            else:
+                position = tuple_(column, Task.id)
+                query = query.where(position < tuple_(value, last_id) if descending else position > tuple_(value, last_id))
+        if sort_key == "id":
+            order = [Task.id.desc() if descending else Task.id]
+        else:
+            order = [column.desc(), Task.id.desc()] if descending else [column, Task.id]
+        return query.order_by(*order).limit(limit + 1)
+
+    def get_tasks_page(self, after: Optional[PageCursor] = None, limit: int = DEFAULT_PAGE_SIZE,
+                       category: Optional[str] = None, sort_key: str = "id", descending: bool = False) -> TaskPage:
+        # Keyset (seek) pagination: pass the previous page's next_cursor as
+        # `after`. Every page costs the same no matter how deep it is.
+        rows = self.db_session.execute(self.tasks_page_query(after, limit, category, sort_key, descending)).all()
+        items = [TaskSnapshot.from_row(row) for row in rows[:limit]]
+        for snapshot in items:
+            self.cache.put(snapshot)
+        next_cursor = None
+        if len(rows) > limit:
+            last = rows[limit - 1]
+            next_cursor = (getattr(last, PAGE_SORT_KEYS[sort_key].key), last.id)
+        return TaskPage(items, next_cursor)
+
+    def search(self, query: str, limit: int = DEFAULT_SEARCH_LIMIT, category: Optional[str] = None,
+               include_archived: bool = False) -> List[TaskSnapshot]:
+        # Full-text prefix search over titles and categories, best match first.
+        match_expression = build_match_expression(query)
+        if match_expression is None:
+            return []
+        rows = self.db_session.execute(search_query(match_expression, limit, category)).all()
+        snapshots = [TaskSnapshot.from_row(row) for row in rows]
+        for snapshot in snapshots:
+            self.cache.put(snapshot)
+        if include_archived and self.has_archive:
+            # Archived rows aren't cached: they are never edited.
+            ranked = [(row.rank, snapshot) for row, snapshot in zip(rows, snapshots)]
+            ranked += self.archive.search(match_expression, limit, category)
+            snapshots = [snapshot for _, snapshot in sorted(ranked, key=lambda item: item[0])[:limit]]
+        return snapshots
+
+    def filter_tasks(self, spec: TaskFilter, limit: int = FILTER_LIMIT) -> FilterResult:
+        # One query per spec; repeating a spec while no task changed (by
+        # anyone: the change log's seq is the data version) costs one
+        # MAX(seq) lookup.
+        unknown = spec.statuses - set(TASK_STATUSES)
+        if unknown:
+            raise TaskValidationError(f"Unknown status '{', '.join(sorted(unknown))}'.")
+        version = last_change_seq(self.db_session.connection())
+        key = (spec, limit)
+        result = self.filter_cache.get(key, version)
+        if result is not None:
+            return result
+        rows = self.db_session.execute(filter_query(spec, limit + 1)).all()
+        items = tuple(TaskSnapshot.from_row(row) for row in rows[:limit])
+        for snapshot in items:
+            self.cache.put(snapshot)
+        result = FilterResult(items, len(rows) > limit)
+        self.filter_cache.put(key, version, result)
+        return result
+
     def get_all_tasks(self) -> List[Task]:
         return self.db_session.query(Task).all()
 
@@ -33,71 +430,315 @@ class TaskController:
         task = self.get_task(task_id)
         if "title" in kwargs and not kwargs["title"]:
             raise TaskValidationError("Task title cannot be empty.")
-        try:
+        with self._write("Error updating task"):
+            old_category = task.category
             for key, value in kwargs.items():
                 setattr(task, key, value)
-            self.db_session.commit()
-            self.db_session.refresh(task)
-            return task
-        except Exception as e:
-            self.db_session.rollback()
-            raise DatabaseError(f"Error updating task: {e}")
+            if task.category != old_category:
+                self._move_time_history([task.id], task.category)
+            self._notify(TASK_UPDATED, task.id, task)
+        return task
 
     def delete_task(self, task_id: int) -> None:
         task = self.get_task(task_id)
-        try:
+        with self._write("Error deleting task"):
+            self._delete_time_history([task.id])
             self.db_session.delete(task)
-            self.db_session.commit()
-        except Exception as e:
-            self.db_session.rollback()
-            raise DatabaseError(f"Error deleting task: {e}")
+            self._notify(TASK_REMOVED, task_id)
+
+    def delete_tasks(self, task_ids: Iterable[int]) -> int:
+        deleted = 0
+        with self._write("Error deleting tasks"):
+            self.db_session.flush()
+            category_deltas: Dict[str, List[int]] = defaultdict(lambda: [0, 0])
+            for chunk in _chunks(task_ids):
+                rows = self.db_session.execute(
+                    delete(Task).where(Task.id.in_(chunk)).returning(Task.id, Task.category, Task.time_spent),
+                    execution_options={"synchronize_session": "fetch"},
+                ).all()
+                self._delete_time_history(chunk)
+                for task_id, category, time_spent in rows:
+                    delta = category_deltas[category]
+                    delta[0] -= 1
+                    delta[1] -= time_spent or 0
+                    self._notify(TASK_REMOVED, task_id)
+                deleted += len(rows)
+            apply_category_deltas(self.db_session.connection(), _as_deltas(category_deltas))
+        return deleted
+
+    def update_tasks(self, task_ids: Iterable[int], **fields) -> int:
+        unknown = set(fields) - set(BULK_UPDATE_FIELDS)
+        if unknown:
+            raise TaskValidationError(f"Cannot bulk update {', '.join(sorted(unknown))}.")
+        if "title" in fields and not fields["title"]:
+            raise TaskValidationError("Task title cannot be empty.")
+        if "status" in fields and fields["status"] not in TASK_STATUSES:
+            raise TaskValidationError(f"Unknown status '{fields['status']}'.")
+        if "category" in fields and not fields["category"]:
+            raise TaskValidationError("Category cannot be empty.")
+        if not fields:
+            return 0
+        return self._update_task_rows(task_ids, fields, "Error updating tasks")
+
+    def reset_timers(self, task_ids: Iterable[int]) -> int:
+        # Like reset_task_timer, an open session is dropped, not recorded:
+        # resetting discards the tracked time, so it stays out of the reports.
+        fields = {"time_spent": 0, "started_at": None, "status": "Pending"}
+        return self._update_task_rows(task_ids, fields, "Error resetting timers")
+
+    def rename_category(self, old_name: str, new_name: str) -> int:
+        if not new_name:
+            raise TaskValidationError("Category cannot be empty.")
+        if new_name == old_name:
+            return 0
+        with self._write(f"Error renaming category {old_name}"):
+            self.db_session.flush()
+            rows = self.db_session.execute(
+                update(Task).where(Task.category == old_name)
+                .values(category=new_name, version=Task.version + 1).returning(*Task.__table__.c),
+                execution_options={"synchronize_session": "fetch"},
+            ).all()
+            totals = self.db_session.execute(
+                select(Category.task_count, Category.time_spent).where(Category.name == old_name)
+            ).first()
+            if totals is not None:
+                task_count, time_spent = totals
+                apply_category_deltas(self.db_session.connection(), {
+                    old_name: (-task_count, -time_spent),
+                    new_name: (task_count, time_spent),
+                })
+            connection = self.db_session.connection()
+            connection.execute(update(TimeEntry).where(TimeEntry.category == old_name).values(category=new_name))
+            connection.execute(update(TimeRollup).where(TimeRollup.category == old_name).values(category=new_name))
+            for row in rows:
+                self._notify(TASK_UPDATED, row.id, TaskSnapshot.from_row(row))
+        return len(rows)
+
+    def _update_task_rows(self, task_ids: Iterable[int], fields: Dict, error_message: str) -> int:
+        # One UPDATE ... WHERE id IN (...) RETURNING per chunk. The category
+        # index needs the old totals, read with one grouped SELECT per chunk.
+        # Moving a running task to another status stops its timer in the same
+        # UPDATE: the open session is credited and recorded as stop_timer does.
+        stops_timers = "status" in fields and fields["status"] != "In Progress" and "started_at" not in fields
+        updated = 0
+        with self._write(error_message):
+            self.db_session.flush()
+            category_deltas: Dict[str, List[int]] = defaultdict(lambda: [0, 0])
+            for chunk in _chunks(task_ids):
+                values = dict(fields)
+                sessions: Dict[int, Tuple[datetime, int]] = {}
+                if stops_timers:
+                    now = datetime.now(timezone.utc)
+                    for task_id, started_at in self.db_session.execute(
+                        select(Task.id, Task.started_at).where(Task.id.in_(chunk), Task.started_at.isnot(None))
+                    ):
+                        started_at = as_utc(started_at)
+                        sessions[task_id] = (started_at, int((now - started_at).total_seconds()))
+                    values["started_at"] = None
+                    if sessions:
+                        elapsed = case({task_id: seconds for task_id, (_, seconds) in sessions.items()},
+                                       value=Task.id, else_=0)
+                        values["time_spent"] = func.coalesce(Task.time_spent, 0) + elapsed
+                if "category" in values or "time_spent" in values:
+                    for category, count, time_spent in self.db_session.execute(
+                        select(Task.category, func.count(Task.id), func.coalesce(func.sum(Task.time_spent), 0))
+                        .where(Task.id.in_(chunk))
+                        .group_by(Task.category)
+                    ):
+                        delta = category_deltas[category]
+                        delta[0] -= count
+                        delta[1] -= time_spent
+                rows = self.db_session.execute(
+                    update(Task).where(Task.id.in_(chunk))
+                    .values(**values, version=Task.version + 1).returning(*Task.__table__.c),
+                    execution_options={"synchronize_session": "fetch"},
+                ).all()
+                if "category" in values or "time_spent" in values:
+                    for row in rows:
+                        delta = category_deltas[row.category]
+                        delta[0] += 1
+                        delta[1] += row.time_spent or 0
+                if "category" in fields:
+                    self._move_time_history(chunk, fields["category"])
+                for row in rows:
+                    if row.id in sessions:
+                        self._record_session(row, *sessions[row.id])
+                    self._notify(TASK_UPDATED, row.id, TaskSnapshot.from_row(row))
+                updated += len(rows)
+            apply_category_deltas(self.db_session.connection(), _as_deltas(category_deltas))
+        return updated
 
     def start_task_timer(self, task_id: int) -> Task:
         task = self.get_task(task_id)
-        try:
+        with self._write(f"Error starting timer for task {task_id}"):
             task.start_timer()
-            self.db_session.commit()
-            self.db_session.refresh(task)
-            return task
-        except Exception as e:
-            self.db_session.rollback()
-            raise DatabaseError(f"Error starting timer for task {task_id}: {e}")
+            self._notify(TASK_UPDATED, task.id, task)
+        return task
 
     def stop_task_timer(self, task_id: int) -> Task:
         task = self.get_task(task_id)
-        print(f"[TaskController.stop_task_timer] Before commit: started_at={task.started_at}")
-        try:
+        logger.debug("Stopping timer for task %s (started_at=%s)", task_id, task.started_at)
+        with self._write(f"Error stopping timer for task {task_id}"):
+            started_at = task.started_at
+            time_before = task.time_spent or 0
             task.stop_timer()
-            self.db_session.commit()
-            self.db_session.refresh(task)
-            print(f"[TaskController.stop_task_timer] After commit and refresh: started_at={task.started_at}")
-            return task
-        except Exception as e:
-            self.db_session.rollback()
-            raise DatabaseError(f"Error stopping timer for task {task_id}: {e}")
+            self._record_session(task, started_at, task.time_spent - time_before)
+            self._notify(TASK_UPDATED, task.id, task)
+        return task
+
+    def switch_timer(self, task_id: int) -> Task:
+        # Stops whatever else is running and starts task_id in one commit.
+        with self.batch():
+            for running in self.running_task_query().all():
+                if running.id != task_id:
+                    self.stop_task_timer(running.id)
+            task = self.start_task_timer(task_id)
+        return task
 
     def reset_task_timer(self, task_id: int) -> Task:
         task = self.get_task(task_id)
-        try:
+        with self._write(f"Error resetting timer for task {task_id}"):
             task.reset_timer()
-            self.db_session.commit()
-            self.db_session.refresh(task)
-            return task
+            self._notify(TASK_UPDATED, task.id, task)
+        return task
+
+    def recover_interrupted_session(self, task_id: int, session_started_at: Optional[datetime],
+                                    last_seen: datetime) -> Optional[Task]:
+        # Credit a session cut short by a crash up to its last checkpoint.
+        # Only that session: if the task was restarted since (e.g. from the
+        # CLI), the open session is a live one and is left alone.
+        task = self.db_session.get(Task, task_id)
+        if task is None or task.started_at is None or session_started_at is None:
+            return None
+        started_at = as_utc(task.started_at)
+        if as_utc(session_started_at) != started_at or last_seen < started_at:
+            return None
+        with self._write(f"Error recovering session for task {task_id}"):
+            elapsed = int((last_seen - started_at).total_seconds())
+            task.time_spent += elapsed
+            task.started_at = None
+            self._record_session(task, started_at, elapsed)
+            # Same outcome as a clean Task.stop_timer.
+            task.status = "Completed"
+            self._notify(TASK_UPDATED, task.id, task)
+        return task
+
+    def _record_session(self, task: Task, started_at: Optional[datetime], seconds: int) -> None:
+        if started_at is None:
+            return
+        started_at = as_utc(started_at)
+        record_time_entry(self.db_session.connection(), task.id, task.category,
+                          started_at, started_at + timedelta(seconds=seconds))
+
+    def _move_time_history(self, task_ids: Sequence[int], category: str) -> None:
+        connection = self.db_session.connection()
+        connection.execute(update(TimeEntry).where(TimeEntry.task_id.in_(task_ids)).values(category=category))
+        connection.execute(update(TimeRollup).where(TimeRollup.task_id.in_(task_ids)).values(category=category))
+
+    def _delete_time_history(self, task_ids: Sequence[int]) -> None:
+        connection = self.db_session.connection()
+        connection.execute(delete(TimeEntry).where(TimeEntry.task_id.in_(task_ids)))
+        connection.execute(delete(TimeRollup).where(TimeRollup.task_id.in_(task_ids)))
+
+    def get_time_by_category(self, start: date, end: date, include_archived: bool = False) -> List[Tuple[str, int]]:
+        # Inclusive UTC day range, answered from the rollups alone.
+        rows = [tuple(row) for row in self.db_session.execute(
+            select(TimeRollup.category, func.sum(TimeRollup.seconds))
+            .where(TimeRollup.day.between(start, end))
+            .group_by(TimeRollup.category)
+            .order_by(TimeRollup.category)
+        )]
+        if include_archived and self.has_archive:
+            rows = _merge_totals(rows, self.archive.time_by("category", start, end))
+        return rows
+
+    def get_time_by_day(self, start: date, end: date, category: Optional[str] = None,
+                        include_archived: bool = False) -> List[Tuple[date, int]]:
+        query = select(TimeRollup.day, func.sum(TimeRollup.seconds)).where(TimeRollup.day.between(start, end))
+        if category is not None:
+            query = query.where(TimeRollup.category == category)
+        rows = [tuple(row) for row in self.db_session.execute(query.group_by(TimeRollup.day).order_by(TimeRollup.day))]
+        if include_archived and self.has_archive:
+            rows = _merge_totals(rows, self.archive.time_by("day", start, end, category))
+        return rows
+
+    def get_time_by_task(self, start: date, end: date, include_archived: bool = False) -> List[Tuple[int, int]]:
+        rows = [tuple(row) for row in self.db_session.execute(
+            select(TimeRollup.task_id, func.sum(TimeRollup.seconds))
+            .where(TimeRollup.day.between(start, end))
+            .group_by(TimeRollup.task_id)
+            .order_by(TimeRollup.task_id)
+        )]
+        if include_archived and self.has_archive:
+            rows = _merge_totals(rows, self.archive.time_by("task_id", start, end))
+        return rows
+
+    def get_category_times(self, include_archived: bool = False) -> List[Tuple[str, int]]:
+        # Total tracked time per category, straight from the category index.
+        rows = [tuple(row) for row in self.db_session.execute(
+            select(Category.name, Category.time_spent).order_by(Category.name)
+        )]
+        if include_archived and self.has_archive:
+            rows = _merge_totals(rows, self.archive.category_times())
+        return rows
+
+    @property
+    def archive(self) -> Optional[ArchiveStore]:
+        if self._archive is None:
+            path = default_archive_path(self.db_session.get_bind().url)
+            if path is not None:
+                self._archive = shared_archive_store(self.db_session.get_bind().url, path)
+        return self._archive
+
+    @property
+    def has_archive(self) -> bool:
+        # Reads never create the archive file.
+        return self.archive is not None and self.archive.exists
+
+    def archive_completed_tasks(self, older_than_days: int = ARCHIVE_AFTER_DAYS) -> int:
+        # Moves old completed tasks to the archive on the archive's own
+        # connection, then has listeners reload: rows left the hot table.
+        if self.in_batch:
+            raise TaskFlowError("Cannot archive inside a batch.")
+        if self.archive is None:
+            raise TaskFlowError("This database has no archive location.")
+        self.db_session.commit()
+        try:
+            moved = self.archive.archive_completed(archive_cutoff(older_than_days))
         except Exception as e:
-            self.db_session.rollback()
-            raise DatabaseError(f"Error resetting timer for task {task_id}: {e}")
+            raise DatabaseError(f"Error archiving tasks: {e}")
+        if moved:
+            self.db_session.expunge_all()
+            self.cache.clear()
+            self._notify(TASKS_RELOADED, 0)
+            self._dispatch_pending()
+        return moved
+
+    def get_time_entries(self, task_id: int) -> List[TimeEntry]:
+        return self.db_session.query(TimeEntry).filter_by(task_id=task_id).order_by(TimeEntry.started_at).all()
 
     def save_task_progress(self, task: Task) -> None:
-        try:
+        with self._write(f"Error saving task progress for task {task.id}"):
             self.db_session.add(task)
-            self.db_session.commit()
-            self.db_session.refresh(task)
-        except Exception as e:
-            self.db_session.rollback()
-            raise DatabaseError(f"Error saving task progress for task {task.id}: {e}")
+            self._notify(TASK_UPDATED, task.id, task)
+
+    def get_categories(self) -> List[Category]:
+        # The index is written with Core statements: never trust loaded rows.
+        return self.db_session.query(Category).populate_existing().order_by(Category.name).all()
+
+    def get_category_names(self) -> List[str]:
+        return [name for (name,) in self.db_session.query(Category.name).order_by(Category.name)]
+
+    def tasks_by_category_query(self, category: str) -> Query:
+        # Served by ix_tasks_category_id (or ix_tasks_category_status).
+        return self.db_session.query(Task).filter_by(category=category)
+
+    def running_task_query(self) -> Query:
+        # Served by the partial index ix_tasks_running.
+        return self.db_session.query(Task).filter(Task.started_at.isnot(None)).order_by(Task.started_at.desc())
 
     def get_tasks_by_category(self, category: str) -> List[Task]:
-        return self.db_session.query(Task).filter_by(category=category).all()
+        return self.tasks_by_category_query(category).all()
 
     def get_running_task(self) -> Optional[Task]:
-        return self.db_session.query(Task).filter(Task.started_at.isnot(None)).order_by(Task.started_at.desc()).first()
\ No newline at end of file
+        return self.running_task_query().first()
@@ -0,0 +1,93 @@
+from collections import defaultdict
+from typing import Dict, List, Tuple
+from sqlalchemy import Column, Integer, String, Table, event, func, select, delete, inspect
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from src.models.task import Base, Task, DEFAULT_CATEGORY
+
+# Materialized per-category aggregate of the tasks table.
+class Category(Base):
+    __tablename__ = "categories"
+
+    name = Column(String, primary_key=True)
+    task_count = Column(Integer, nullable=False, default=0)
+    time_spent = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return f"<Category(name='{self.name}', task_count={self.task_count}, time_spent={self.time_spent})>"
+
+
+def track_category_index(session: Session) -> None:
+    event.listen(session, "before_flush", _apply_task_changes)
+
+
+def untrack_category_index(session: Session) -> None:
+    event.remove(session, "before_flush", _apply_task_changes)
+
+
+def apply_category_deltas(connection: Connection, deltas: Dict[str, Tuple[int, int]],
+                          table: Table = Category.__table__) -> None:
+    # deltas: category -> (task count delta, time_spent delta). `table` lets
+    # the archive keep its own index with the same shape.
+    deltas = {name: delta for name, delta in deltas.items() if delta != (0, 0)}
+    if not deltas:
+        return
+    for name, (count_delta, time_delta) in deltas.items():
+        stmt = insert(table).values(name=name, task_count=count_delta, time_spent=time_delta)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.name],
+            set_={
+                "task_count": table.c.task_count + stmt.excluded.task_count,
+                "time_spent": table.c.time_spent + stmt.excluded.time_spent,
+            },
+        )
+        connection.execute(stmt)
+    connection.execute(delete(table).where(table.c.name.in_(list(deltas)), table.c.task_count <= 0))
+
+
+def rebuild_category_index(connection: Connection) -> None:
+    connection.execute(delete(Category))
+    connection.execute(
+        insert(Category).from_select(
+            ["name", "task_count", "time_spent"],
+            select(Task.category, func.count(Task.id), func.coalesce(func.sum(Task.time_spent), 0))
+            .where(Task.category.isnot(None))
+            .group_by(Task.category),
+        )
+    )
+
+
+def _apply_task_changes(session: Session, flush_context, instances) -> None:
+    deltas: Dict[str, List[int]] = defaultdict(lambda: [0, 0])
+
+    for task in session.new:
+        if isinstance(task, Task):
+            delta = deltas[task.category or DEFAULT_CATEGORY]
+            delta[0] += 1
+            delta[1] += task.time_spent or 0
+
+    for task in session.deleted:
+        if isinstance(task, Task):
+            delta = deltas[task.category]
+            delta[0] -= 1
+            delta[1] -= task.time_spent or 0
+
+    for task in session.dirty:
+        if not isinstance(task, Task) or not session.is_modified(task):
+            continue
+        state = inspect(task)
+        category_history = state.attrs.category.history
+        time_history = state.attrs.time_spent.history
+        if not category_history.has_changes() and not time_history.has_changes():
+            continue
+        old_category = category_history.deleted[0] if category_history.deleted else task.category
+        old_time = (time_history.deleted[0] if time_history.deleted else task.time_spent) or 0
+        old_delta = deltas[old_category]
+        old_delta[0] -= 1
+        old_delta[1] -= old_time
+        new_delta = deltas[task.category]
+        new_delta[0] += 1
+        new_delta[1] += task.time_spent or 0
+
+    apply_category_deltas(session.connection(), {name: tuple(delta) for name, delta in deltas.items()})
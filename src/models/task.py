@@ -1,22 +1,108 @@
 
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Optional
-from sqlalchemy import Column, Integer, String, DateTime, func
-from sqlalchemy.orm import declarative_base
+from sqlalchemy import Column, Integer, String, DateTime, Index, func, text
+from sqlalchemy.orm import declarative_base, column_property
 
 Base = declarative_base()
 
-class Task(Base):
+DEFAULT_CATEGORY = "General"
+
+def as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    # SQLite hands back naive datetimes; they are always stored as UTC.
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+def format_duration(total_seconds: int) -> str:
+    hours = total_seconds // 3600
+    minutes = (total_seconds % 3600) // 60
+    seconds = total_seconds % 60
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+
+class TaskTimeMixin:
+    def get_current_session_time(self) -> int:
+        if self.started_at is not None:
+            elapsed = datetime.now(timezone.utc) - as_utc(self.started_at)
+            return int(elapsed.total_seconds())
+        return 0
+
+    def get_total_time_seconds(self) -> int:
+        total = self.time_spent
+        if self.started_at is not None:
+            total += self.get_current_session_time()
+        return total
+
+    def total_time_str(self) -> str:
+        return format_duration(self.get_total_time_seconds())
+
+    @property
+    def time_spent_human(self) -> str:
+        return self.total_time_str()
+
+    @property
+    def is_running(self) -> bool:
+        return self.started_at is not None
+
+# Immutable, session-free copy of a task used by caches and views.
+@dataclass(frozen=True)
+class TaskSnapshot(TaskTimeMixin):
+    id: int
+    title: str
+    category: str
+    status: str
+    time_spent: int
+    started_at: Optional[datetime]
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
+    version: int = 1
+
+    @classmethod
+    def from_row(cls, row) -> "TaskSnapshot":
+        # Builds a snapshot straight from a tasks row (e.g. RETURNING *).
+        return cls(
+            id=row.id,
+            title=row.title,
+            category=row.category,
+            status=row.status,
+            time_spent=row.time_spent or 0,
+            started_at=as_utc(row.started_at),
+            created_at=as_utc(row.created_at),
+            updated_at=as_utc(row.updated_at),
+            version=row.version,
+        )
+
+class Task(TaskTimeMixin, Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_category_status", "category", "status"),
+        Index("ix_tasks_updated_at", "updated_at"),
+        Index("ix_tasks_running", "started_at", sqlite_where=text("started_at IS NOT NULL")),
+        Index("ix_tasks_category_id", "category", "id"),
+        Index("ix_tasks_title", "title", "id"),
+        Index("ix_tasks_time_spent", "time_spent", "id"),
+        Index("ix_tasks_created_at", "created_at", "id"),
+        # Ids are never handed out twice, even after the highest rows are
+        # archived or deleted: hot and archived tasks never share one.
+        {"sqlite_autoincrement": True},
+    )
 
     id = Column(Integer, primary_key=True)
     title = Column(String, nullable=False)
-    category = Column(String, default="General")
+    # active_history keeps the previous value around for the category index.
+    category = column_property(Column(String, default=DEFAULT_CATEGORY), active_history=True)
     status = Column(String, default="Pending")
-    time_spent = Column(Integer, default=0)
+    time_spent = column_property(Column(Integer, default=0), active_history=True)
     started_at = Column(DateTime(timezone=True), nullable=True)
     created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
     updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+    # Bumped by every write. The ORM checks it on UPDATE/DELETE, so a row
+    # changed by another window or process is never silently overwritten;
+    # set-based UPDATEs bump it themselves.
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
+    __mapper_args__ = {"version_id_col": version}
 
     def __repr__(self) -> str:
         return f"<Task(id={self.id}, title='{self.title}', status='{self.status}')>"
@@ -27,7 +113,6 @@ class Task(Base):
             self.status = "In Progress"
 
     def stop_timer(self) -> None:
-        print(f"[Task.stop_timer] Before: started_at={self.started_at}")
         if self.started_at is not None:
             # Ensure started_at is timezone-aware before subtraction
             if self.started_at.tzinfo is None:
@@ -39,42 +124,21 @@ class Task(Base):
             self.time_spent += int(elapsed.total_seconds())
             self.started_at = None
             self.status = "Completed"
-        print(f"[Task.stop_timer] After: started_at={self.started_at}")
 
     def reset_timer(self) -> None:
         self.time_spent = 0
         self.started_at = None
         self.status = "Pending"
 
-    def get_current_session_time(self) -> int:
-        if self.started_at is not None:
-            # Ensure started_at is timezone-aware before subtraction
-            if self.started_at.tzinfo is None:
-                started_at_aware = self.started_at.replace(tzinfo=timezone.utc)
-            else:
-                started_at_aware = self.started_at
-
-            elapsed = datetime.now(timezone.utc) - started_at_aware
-            return int(elapsed.total_seconds())
-        return 0
-
-    def get_total_time_seconds(self) -> int:
-        total = self.time_spent
-        if self.started_at is not None:
-            total += self.get_current_session_time()
-        return total
-
-    def total_time_str(self) -> str:
-        total_seconds = self.get_total_time_seconds()
-        hours = total_seconds // 3600
-        minutes = (total_seconds % 3600) // 60
-        seconds = total_seconds % 60
-        return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
-
-    @property
-    def time_spent_human(self) -> str:
-        return self.total_time_str()
-
-    @property
-    def is_running(self) -> bool:
-        return self.started_at is not None
+    def snapshot(self) -> TaskSnapshot:
+        return TaskSnapshot(
+            id=self.id,
+            title=self.title,
+            category=self.category,
+            status=self.status,
+            time_spent=self.time_spent or 0,
+            started_at=as_utc(self.started_at),
+            created_at=as_utc(self.created_at),
+            updated_at=as_utc(self.updated_at),
+            version=self.version,
+        )
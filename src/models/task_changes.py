@@ -0,0 +1,89 @@
+from typing import List, NamedTuple, Optional
+from sqlalchemy import Column, Integer, String, Table, delete, func, select
+from sqlalchemy.engine import Connection
+from src.models.task import Base
+
+CHANGE_INSERTED = "I"
+CHANGE_UPDATED = "U"
+CHANGE_DELETED = "D"
+# Not stored: the log was pruned past a reader's watermark (task_id is 0).
+CHANGE_GAP = "R"
+
+# Rows kept by prune_change_log; a reader further behind reloads instead.
+CHANGE_LOG_KEEP = 10000
+
+# Append-only log of task writes, filled by triggers so every writer (other
+# windows, the CLI, the archiver) shows up. seq is AUTOINCREMENT: it never
+# goes back, even after pruning, so it works as a watermark.
+task_changes = Table(
+    "task_changes", Base.metadata,
+    Column("seq", Integer, primary_key=True),
+    Column("task_id", Integer, nullable=False),
+    Column("op", String(1), nullable=False),
+    Column("version", Integer, nullable=True),
+    sqlite_autoincrement=True,
+)
+
+CHANGE_LOG_DDL = [
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_changes_ai AFTER INSERT ON tasks BEGIN
+        INSERT INTO task_changes(task_id, op, version) VALUES (new.id, 'I', new.version);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_changes_au AFTER UPDATE ON tasks BEGIN
+        INSERT INTO task_changes(task_id, op, version) VALUES (new.id, 'U', new.version);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_changes_ad AFTER DELETE ON tasks BEGIN
+        INSERT INTO task_changes(task_id, op, version) VALUES (old.id, 'D', NULL);
+    END
+    """,
+]
+
+
+class TaskChange(NamedTuple):
+    seq: int
+    task_id: int
+    op: str
+    version: Optional[int]
+
+
+def add_version_column(connection: Connection, schema: Optional[str] = None) -> None:
+    prefix = f"{schema}." if schema else ""
+    columns = [row[1] for row in connection.exec_driver_sql(f"PRAGMA {prefix}table_info(tasks)")]
+    if "version" not in columns:
+        connection.exec_driver_sql(f"ALTER TABLE {prefix}tasks ADD COLUMN version INTEGER NOT NULL DEFAULT 1")
+
+
+def create_change_log(connection: Connection) -> None:
+    add_version_column(connection)
+    task_changes.create(bind=connection, checkfirst=True)
+    for statement in CHANGE_LOG_DDL:
+        connection.exec_driver_sql(statement)
+
+
+def last_change_seq(connection: Connection) -> int:
+    return connection.execute(select(func.coalesce(func.max(task_changes.c.seq), 0))).scalar()
+
+
+def read_changes(connection: Connection, after: int) -> List[TaskChange]:
+    # Everything committed after the `after` watermark, oldest first. A gap
+    # (rows pruned that the reader never saw) comes back as one CHANGE_GAP.
+    rows = connection.execute(
+        select(task_changes.c.seq, task_changes.c.task_id, task_changes.c.op, task_changes.c.version)
+        .where(task_changes.c.seq > after)
+        .order_by(task_changes.c.seq)
+    ).all()
+    if rows and rows[0].seq > after + 1:
+        oldest = connection.execute(select(func.min(task_changes.c.seq))).scalar()
+        if oldest > after + 1:
+            return [TaskChange(rows[-1].seq, 0, CHANGE_GAP, None)]
+    return [TaskChange(*row) for row in rows]
+
+
+def prune_change_log(connection: Connection, keep: int = CHANGE_LOG_KEEP) -> int:
+    return connection.execute(
+        delete(task_changes).where(task_changes.c.seq <= last_change_seq(connection) - keep)
+    ).rowcount
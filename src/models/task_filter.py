@@ -0,0 +1,140 @@
+from dataclasses import dataclass, field, fields, replace
+from datetime import datetime, timezone
+from functools import cmp_to_key
+from typing import Callable, FrozenSet, Iterable, Optional, Tuple
+from sqlalchemy import func, select
+from src.models.task import Task, TaskSnapshot, as_utc
+from src.utils.exceptions import TaskValidationError
+
+# Sortable columns. All but status lead an index ending in id, so a sort
+# with no other filter walks an index instead of sorting the table.
+FILTER_SORT_KEYS = {
+    "id": Task.id,
+    "title": Task.title,
+    "category": Task.category,
+    "status": Task.status,
+    "time_spent": Task.time_spent,
+    "created_at": Task.created_at,
+    "updated_at": Task.updated_at,
+}
+
+# (key, descending) pairs, most significant first; id always breaks ties.
+SortSpec = Tuple[Tuple[str, bool], ...]
+
+
+# Immutable, hashable description of a filtered task list, so it can key a
+# result cache. Empty sets and None bounds mean "no restriction"; ranges are
+# inclusive. Lists passed in are frozen:
+#
+#     TaskFilter(statuses={"Pending"}, min_time_spent=3600, sort=(("time_spent", True),))
+@dataclass(frozen=True)
+class TaskFilter:
+    categories: FrozenSet[str] = frozenset()
+    statuses: FrozenSet[str] = frozenset()
+    running: Optional[bool] = None
+    created_from: Optional[datetime] = None
+    created_to: Optional[datetime] = None
+    updated_from: Optional[datetime] = None
+    updated_to: Optional[datetime] = None
+    min_time_spent: Optional[int] = None
+    max_time_spent: Optional[int] = None
+    sort: SortSpec = field(default=(("id", False),))
+
+    def __post_init__(self):
+        object.__setattr__(self, "categories", frozenset(self.categories))
+        object.__setattr__(self, "statuses", frozenset(self.statuses))
+        object.__setattr__(self, "sort", tuple((key, bool(descending)) for key, descending in self.sort))
+        for name in ("created_from", "created_to", "updated_from", "updated_to"):
+            value = as_utc(getattr(self, name))
+            object.__setattr__(self, name, value.astimezone(timezone.utc) if value is not None else None)
+        unknown = [key for key, _ in self.sort if key not in FILTER_SORT_KEYS]
+        if unknown:
+            raise TaskValidationError(f"Cannot sort tasks by {', '.join(unknown)}.")
+
+    @property
+    def is_sorted(self) -> bool:
+        # Anything but plain id order, where rows never move once placed.
+        return self.sort != (("id", False),)
+
+    @property
+    def is_empty(self) -> bool:
+        return all(getattr(self, spec.name) == spec.default for spec in fields(self) if spec.name != "sort")
+
+    def with_categories(self, categories: Iterable[str]) -> "TaskFilter":
+        return replace(self, categories=frozenset(categories))
+
+    def matches(self, task: TaskSnapshot) -> bool:
+        # The same conditions as filter_query, for rows changed after loading.
+        if self.categories and task.category not in self.categories:
+            return False
+        if self.statuses and task.status not in self.statuses:
+            return False
+        if self.running is not None and task.is_running != self.running:
+            return False
+        if not _within(task.created_at, self.created_from, self.created_to):
+            return False
+        if not _within(task.updated_at, self.updated_from, self.updated_to):
+            return False
+        return _within(task.time_spent, self.min_time_spent, self.max_time_spent)
+
+    def sort_key(self) -> Callable[[TaskSnapshot], object]:
+        # The same order as filter_query's ORDER BY, for placing a changed row.
+        order = _order(self.sort)
+
+        def compare(left: TaskSnapshot, right: TaskSnapshot) -> int:
+            for key, descending in order:
+                # SQLite sorts NULL before any value.
+                a, b = getattr(left, key), getattr(right, key)
+                a, b = (a is not None, a), (b is not None, b)
+                if a != b:
+                    return (-1 if a < b else 1) * (-1 if descending else 1)
+            return 0
+
+        return cmp_to_key(compare)
+
+
+def _within(value, low, high) -> bool:
+    if low is None and high is None:
+        return True
+    if value is None:
+        return False
+    return (low is None or value >= low) and (high is None or value <= high)
+
+
+def filter_query(spec: TaskFilter, limit: int):
+    # One SELECT: set filters become IN lists, ranges BETWEEN-style bounds,
+    # "running" the partial-index condition.
+    tasks = Task.__table__
+    query = select(*tasks.c)
+    if spec.categories:
+        query = query.where(tasks.c.category.in_(sorted(spec.categories)))
+    if spec.statuses:
+        query = query.where(tasks.c.status.in_(sorted(spec.statuses)))
+    if spec.running:
+        # Only a handful of tasks run at once, but with ORDER BY ... LIMIT
+        # the planner would rather scan in order than use the partial index;
+        # unlikely() tells it how selective the condition is.
+        query = query.where(func.unlikely(tasks.c.started_at.isnot(None)))
+    elif spec.running is not None:
+        query = query.where(tasks.c.started_at.is_(None))
+    for column, low, high in (
+        (tasks.c.created_at, spec.created_from, spec.created_to),
+        (tasks.c.updated_at, spec.updated_from, spec.updated_to),
+        (tasks.c.time_spent, spec.min_time_spent, spec.max_time_spent),
+    ):
+        if low is not None:
+            query = query.where(column >= low)
+        if high is not None:
+            query = query.where(column <= high)
+    order = []
+    for key, descending in _order(spec.sort):
+        column = tasks.c[FILTER_SORT_KEYS[key].key]
+        order.append(column.desc() if descending else column)
+    return query.order_by(*order).limit(limit)
+
+
+def _order(sort: SortSpec) -> SortSpec:
+    # id breaks ties in the direction of the last key.
+    if any(key == "id" for key, _ in sort):
+        return sort
+    return sort + (("id", sort[-1][1] if sort else False),)
@@ -0,0 +1,79 @@
+import re
+from typing import Optional
+from sqlalchemy import Table, column, func, select, table, text
+from sqlalchemy.engine import Connection
+from src.models.task import Task
+
+# External-content FTS5 index over tasks.title/category. Triggers keep it in
+# step with every write path, including the set-based UPDATE/DELETEs.
+# Object names take a schema prefix so an attached archive can carry its own
+# index; trigger bodies stay unqualified, as SQLite requires.
+SEARCH_INDEX_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS {prefix}tasks_fts USING fts5(
+        title, category, content='tasks', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS {prefix}tasks_fts_ai AFTER INSERT ON tasks BEGIN
+        INSERT INTO tasks_fts(rowid, title, category) VALUES (new.id, new.title, new.category);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS {prefix}tasks_fts_ad AFTER DELETE ON tasks BEGIN
+        INSERT INTO tasks_fts(tasks_fts, rowid, title, category) VALUES ('delete', old.id, old.title, old.category);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS {prefix}tasks_fts_au AFTER UPDATE OF title, category ON tasks BEGIN
+        INSERT INTO tasks_fts(tasks_fts, rowid, title, category) VALUES ('delete', old.id, old.title, old.category);
+        INSERT INTO tasks_fts(rowid, title, category) VALUES (new.id, new.title, new.category);
+    END
+    """,
+]
+
+# Title matches weigh more than category matches.
+TITLE_WEIGHT = 10.0
+CATEGORY_WEIGHT = 1.0
+
+
+def _fts_table(schema: Optional[str] = None):
+    return table("tasks_fts", column("rowid"), column("title"), column("category"), schema=schema)
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def create_search_index(connection: Connection, schema: Optional[str] = None) -> None:
+    prefix = f"{schema}." if schema else ""
+    for statement in SEARCH_INDEX_DDL:
+        connection.exec_driver_sql(statement.format(prefix=prefix))
+    rebuild_search_index(connection, schema)
+
+
+def rebuild_search_index(connection: Connection, schema: Optional[str] = None) -> None:
+    prefix = f"{schema}." if schema else ""
+    connection.exec_driver_sql(f"INSERT INTO {prefix}tasks_fts(tasks_fts) VALUES ('rebuild')")
+
+
+def build_match_expression(query: str) -> Optional[str]:
+    # Every word must match as a prefix: "rep fin" -> "rep"* "fin"*.
+    # Quoting each token keeps FTS5 operators in user input inert.
+    tokens = _TOKEN.findall(query)
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+def search_query(match_expression: str, limit: int, category: Optional[str] = None, tasks: Table = Task.__table__):
+    # `tasks` may be the archive's copy of the table; its FTS index lives in
+    # the same schema. Rows carry their bm25 score as `rank` (lower is better).
+    fts = _fts_table(tasks.schema)
+    rank = func.bm25(text("tasks_fts"), TITLE_WEIGHT, CATEGORY_WEIGHT).label("rank")
+    query = (
+        select(*tasks.c, rank)
+        .select_from(fts.join(tasks, tasks.c.id == fts.c.rowid))
+        .where(text("tasks_fts MATCH :match").bindparams(match=match_expression))
+    )
+    if category is not None:
+        query = query.where(tasks.c.category == category)
+    return query.order_by(rank).limit(limit)
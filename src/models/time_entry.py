@@ -0,0 +1,79 @@
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Iterator, Tuple
+from sqlalchemy import Column, Date, DateTime, ForeignKey, Index, Integer, String
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.engine import Connection
+from src.models.task import Base
+
+# One closed start/stop interval of a task timer.
+class TimeEntry(Base):
+    __tablename__ = "time_entries"
+    __table_args__ = (
+        Index("ix_time_entries_task_id", "task_id"),
+        Index("ix_time_entries_started_at", "started_at"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    task_id = Column(Integer, ForeignKey("tasks.id"), nullable=False)
+    category = Column(String, nullable=False)
+    started_at = Column(DateTime(timezone=True), nullable=False)
+    ended_at = Column(DateTime(timezone=True), nullable=False)
+    seconds = Column(Integer, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<TimeEntry(id={self.id}, task_id={self.task_id}, seconds={self.seconds})>"
+
+
+# Seconds tracked per (UTC day, task), maintained as entries close. Category
+# is denormalized so per-category ranges never touch the tasks table.
+class TimeRollup(Base):
+    __tablename__ = "time_rollups"
+    __table_args__ = (
+        Index("ix_time_rollups_category_day", "category", "day"),
+    )
+
+    day = Column(Date, primary_key=True)
+    task_id = Column(Integer, primary_key=True)
+    category = Column(String, nullable=False)
+    seconds = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return f"<TimeRollup(day={self.day}, task_id={self.task_id}, seconds={self.seconds})>"
+
+
+def split_by_day(started_at: datetime, ended_at: datetime) -> Iterator[Tuple[date, int]]:
+    # Whole seconds per UTC day; the last bucket absorbs rounding so the
+    # buckets always add up to the entry's total.
+    started_at = started_at.astimezone(timezone.utc)
+    ended_at = ended_at.astimezone(timezone.utc)
+    total = max(int((ended_at - started_at).total_seconds()), 0)
+    assigned = 0
+    cursor = started_at
+    while cursor.date() < ended_at.date():
+        next_midnight = datetime.combine(cursor.date() + timedelta(days=1), time.min, tzinfo=timezone.utc)
+        seconds = min(int((next_midnight - cursor).total_seconds()), total - assigned)
+        if seconds:
+            yield cursor.date(), seconds
+        assigned += seconds
+        cursor = next_midnight
+    if total - assigned or not assigned:
+        yield ended_at.date(), total - assigned
+
+
+def record_time_entry(connection: Connection, task_id: int, category: str,
+                      started_at: datetime, ended_at: datetime) -> int:
+    buckets = [bucket for bucket in split_by_day(started_at, ended_at) if bucket[1] > 0]
+    seconds = sum(bucket_seconds for _, bucket_seconds in buckets)
+    connection.execute(
+        insert(TimeEntry).values(
+            task_id=task_id, category=category, started_at=started_at, ended_at=ended_at, seconds=seconds
+        )
+    )
+    for day, bucket_seconds in buckets:
+        stmt = insert(TimeRollup).values(day=day, task_id=task_id, category=category, seconds=bucket_seconds)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[TimeRollup.day, TimeRollup.task_id],
+            set_={"seconds": TimeRollup.seconds + stmt.excluded.seconds, "category": stmt.excluded.category},
+        )
+        connection.execute(stmt)
+    return seconds
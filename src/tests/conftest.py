@@ -0,0 +1,55 @@
+import os
+
+# Qt-based tests must run without a display.
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+# Tests run on the in-memory profile; read when src.utils.database loads.
+os.environ.setdefault("TASKFLOW_DB_PROFILE", "memory")
+
+import pytest
+from contextlib import contextmanager
+from sqlalchemy import event
+from src.controllers.task_controller import TaskController
+from src.utils.database import get_db_session, migrate, engine, Base
+
+@pytest.fixture(scope="function")
+def db_session():
+    # Ensure a clean database for each test
+    Base.metadata.drop_all(bind=engine)
+    with engine.begin() as connection:
+        connection.exec_driver_sql("PRAGMA user_version = 0")
+    migrate(engine)
+    session = get_db_session()
+    yield session
+    session.close()
+
+@pytest.fixture(scope="function")
+def controller(db_session):
+    return TaskController(db_session)
+
+class QueryLog:
+    def __init__(self):
+        self.statements = []
+        self.commits = 0
+
+    @property
+    def selects(self):
+        return [statement for statement in self.statements if statement.lstrip().upper().startswith("SELECT")]
+
+@contextmanager
+def _count_queries():
+    log = QueryLog()
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        log.statements.append(statement)
+    def commit(conn):
+        log.commits += 1
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(engine, "commit", commit)
+    try:
+        yield log
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+        event.remove(engine, "commit", commit)
+
+@pytest.fixture
+def count_queries():
+    return _count_queries
@@ -0,0 +1,131 @@
+import csv
+from datetime import date, datetime, timedelta, timezone
+import pytest
+from src.controllers.task_controller import TaskController, TASKS_RELOADED
+from src.models.task import Task
+from src.utils import archive as archive_module
+from src.utils.archive import ArchiveStore, dispose_shared_archive_stores, shared_archive_store
+from src.utils.csv_export import export_tasks_csv
+from src.utils.database import engine
+
+@pytest.fixture
+def archive(tmp_path, monkeypatch):
+    path = tmp_path / "taskflow_archive.db"
+    monkeypatch.setattr(archive_module, "ARCHIVE_PATH", str(path))
+    store = ArchiveStore(engine.url, str(path))
+    yield store
+    store.dispose()
+    dispose_shared_archive_stores()
+
+@pytest.fixture
+def archiving_controller(db_session, archive):
+    return TaskController(db_session, archive=archive)
+
+def complete_long_ago(controller, task_id, days=120):
+    controller.update_task(task_id, status="Completed")
+    controller.db_session.query(Task).filter_by(id=task_id).update(
+        {"updated_at": datetime.now(timezone.utc) - timedelta(days=days)}
+    )
+    controller.db_session.commit()
+
+def tracked(controller, title, category, seconds):
+    task = controller.create_task(title, category)
+    started = datetime.now(timezone.utc) - timedelta(seconds=seconds)
+    controller.update_task(task.id, started_at=started)
+    controller.stop_task_timer(task.id)
+    return task.id
+
+def test_archives_only_old_completed_tasks(archiving_controller, archive):
+    controller = archiving_controller
+    old = tracked(controller, "Informe viejo", "Trabajo", 600)
+    recent = tracked(controller, "Informe nuevo", "Trabajo", 300)
+    pending = controller.create_task("Pendiente", "Trabajo").id
+    complete_long_ago(controller, old)
+    controller.update_task(recent, status="Completed")
+    events = []
+    controller.add_listener(lambda event, task_id, task: events.append(event))
+
+    assert controller.archive_completed_tasks(90) == 1
+
+    assert events == [TASKS_RELOADED]
+    assert [task.id for task in controller.list_task_snapshots()] == [recent, pending]
+    assert controller.get_time_entries(old) == []
+    # Hot statistics lose the archived time; the full history keeps it.
+    assert dict(controller.get_category_times())["Trabajo"] == 300
+    assert dict(controller.get_category_times(include_archived=True))["Trabajo"] == 900
+    assert controller.archive_completed_tasks(90) == 0
+
+def test_history_reads_merge_the_archive(archiving_controller):
+    controller = archiving_controller
+    old = tracked(controller, "Informe viejo", "Trabajo", 600)
+    tracked(controller, "Informe nuevo", "Trabajo", 300)
+    complete_long_ago(controller, old)
+    controller.archive_completed_tasks(90)
+    today = datetime.now(timezone.utc).date()
+
+    assert controller.get_time_by_category(today, today) == [("Trabajo", 300)]
+    assert controller.get_time_by_category(today, today, include_archived=True) == [("Trabajo", 900)]
+    assert dict(controller.get_time_by_task(today, today, include_archived=True))[old] == 600
+    assert [task.title for task in controller.search("informe")] == ["Informe nuevo"]
+    assert sorted(task.title for task in controller.search("informe", include_archived=True)) == [
+        "Informe nuevo", "Informe viejo"
+    ]
+
+def test_reads_never_create_the_archive(controller, tmp_path, monkeypatch):
+    monkeypatch.setattr(archive_module, "ARCHIVE_PATH", str(tmp_path / "missing.db"))
+    controller.create_task("Tarea", "General")
+    assert controller.search("tarea", include_archived=True)[0].title == "Tarea"
+    assert controller.get_time_by_category(date.today(), date.today(), include_archived=True) == []
+    assert list(tmp_path.iterdir()) == []
+
+def test_export_includes_archived_tasks(archiving_controller, tmp_path):
+    controller = archiving_controller
+    old = controller.create_task("Viejo", "General").id
+    controller.create_task("Nuevo", "General")
+    complete_long_ago(controller, old)
+    controller.archive_completed_tasks(90)
+    path = tmp_path / "tasks.csv"
+
+    assert export_tasks_csv(str(path), engine) == 1
+    assert export_tasks_csv(str(path), engine, include_archived=True) == 2
+    with open(path, newline='', encoding='utf-8') as csvfile:
+        assert [row["Título"] for row in csv.DictReader(csvfile)] == ["Viejo", "Nuevo"]
+
+def test_archived_ids_are_never_reused(archiving_controller, archive):
+    controller = archiving_controller
+    controller.create_task("Primera", "General")
+    newest = tracked(controller, "Última", "Trabajo", 600)
+    complete_long_ago(controller, newest)
+    assert controller.archive_completed_tasks(90) == 1
+
+    # The highest id went to the archive; the next task does not take it.
+    reborn = tracked(controller, "Otra", "Trabajo", 60)
+    assert reborn > newest
+    today = datetime.now(timezone.utc).date()
+    assert dict(controller.get_time_by_task(today, today, include_archived=True))[newest] == 600
+    complete_long_ago(controller, reborn)
+    assert controller.archive_completed_tasks(90) == 1
+
+def test_copy_left_by_a_crash_is_replaced(archiving_controller, archive):
+    controller = archiving_controller
+    task_id = tracked(controller, "Duplicada", "Trabajo", 600)
+    complete_long_ago(controller, task_id)
+    controller.archive_completed_tasks(90)
+    # As if the hot file's commit was lost: the task is back in both.
+    with archive.engine.begin() as connection:
+        connection.exec_driver_sql(
+            "INSERT INTO main.tasks SELECT * FROM archive.tasks WHERE id = ?", (task_id,))
+        connection.exec_driver_sql(
+            "UPDATE main.categories SET task_count = task_count + 1, time_spent = time_spent + 600 WHERE name = 'Trabajo'")
+
+    assert controller.archive_completed_tasks(90) == 1
+    with archive.engine.connect() as connection:
+        assert connection.exec_driver_sql("SELECT count(*) FROM archive.tasks").scalar() == 1
+    assert dict(controller.get_category_times(include_archived=True))["Trabajo"] == 600
+
+def test_controllers_share_one_store(db_session, archive):
+    # e.g. one controller per statistics refresh: no new engine each time.
+    first = TaskController(db_session).archive
+    assert TaskController(db_session).archive is first
+    assert shared_archive_store(engine.url, archive.path) is first
+    assert first.engine is first.engine
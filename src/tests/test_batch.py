@@ -0,0 +1,44 @@
+import pytest
+from src.utils.exceptions import TaskValidationError
+
+def test_writes_do_not_reload_rows(controller, count_queries):
+    with count_queries() as log:
+        task = controller.create_task("Task", "Work")
+        controller.update_task(task.id, title="Renamed")
+        controller.start_task_timer(task.id)
+    assert log.selects == []
+    assert log.commits == 3
+    assert controller.get_task_snapshot(task.id).title == "Renamed"
+
+def test_timer_switch_is_one_transaction(controller, count_queries):
+    task1 = controller.create_task("Task 1", "Work")
+    task2 = controller.create_task("Task 2", "Work")
+    controller.start_task_timer(task1.id)
+
+    with count_queries() as log:
+        with controller.batch():
+            controller.stop_task_timer(task1.id)
+            controller.start_task_timer(task2.id)
+    assert log.commits == 1
+    assert log.selects == []
+    assert controller.get_running_task().id == task2.id
+
+def test_batch_defers_events_until_commit(controller):
+    events = []
+    controller.add_listener(lambda event, task_id, snapshot: events.append((event, task_id)))
+    with controller.batch():
+        task = controller.create_task("Task", "Work")
+        controller.start_task_timer(task.id)
+        assert events == []
+    assert events == [("inserted", task.id), ("updated", task.id)]
+
+def test_failed_batch_rolls_back_everything(controller):
+    events = []
+    controller.add_listener(lambda event, task_id, snapshot: events.append(event))
+    with pytest.raises(TaskValidationError):
+        with controller.batch():
+            controller.create_task("Kept only if the batch commits", "Work")
+            controller.create_task("", "Work")
+    assert controller.get_all_tasks() == []
+    assert controller.get_category_names() == []
+    assert events == []
@@ -0,0 +1,48 @@
+from sqlalchemy import create_engine, func, select
+from src.benchmarks.datagen import generate_dataset
+from src.benchmarks.suite import BenchContext, BenchResult, compare_results, load_results, run_suite, write_results
+from src.models.category import Category
+from src.models.task import Task
+from src.models.time_entry import TimeEntry, TimeRollup
+from src.utils.database import migrate
+
+def make_engine(path):
+    engine = create_engine(f"sqlite:///{path}")
+    migrate(engine)
+    return engine
+
+def test_generator_is_reproducible_and_consistent(tmp_path):
+    first, second = make_engine(tmp_path / "a.db"), make_engine(tmp_path / "b.db")
+    dataset = generate_dataset(first, 500, seed=7)
+    assert generate_dataset(second, 500, seed=7) == dataset
+
+    with first.connect() as a, second.connect() as b:
+        query = select(Task.title, Task.category, Task.time_spent).order_by(Task.id)
+        assert a.execute(query).all() == b.execute(query).all()
+        tracked = a.execute(select(func.sum(Task.time_spent))).scalar()
+        assert a.execute(select(func.sum(TimeEntry.seconds))).scalar() == tracked
+        assert a.execute(select(func.sum(TimeRollup.seconds))).scalar() == tracked
+        assert a.execute(select(func.sum(Category.task_count))).scalar() == 500
+        assert a.execute(select(Task.id).where(Task.started_at.isnot(None))).scalars().all() == [dataset.running_task_id]
+    first.dispose()
+    second.dispose()
+
+def test_suite_runs_and_round_trips(tmp_path):
+    engine = make_engine(tmp_path / "bench.db")
+    ctx = BenchContext(engine, generate_dataset(engine, 300), str(tmp_path))
+    results = run_suite(ctx, repeat=1)
+    # Write benchmarks clean up after themselves.
+    with engine.connect() as connection:
+        assert connection.execute(select(func.count(Task.id))).scalar() == 300
+    engine.dispose()
+
+    path = tmp_path / "results.json"
+    write_results(str(path), results, seed=1)
+    assert load_results(str(path)) == results
+
+def test_compare_flags_only_real_regressions():
+    baseline = [BenchResult("search", 1000, 5, 0.010, 0.010), BenchResult("csv_export", 1000, 5, 0.0001, 0.0001)]
+    current = [BenchResult("search", 1000, 5, 0.020, 0.020), BenchResult("csv_export", 1000, 5, 0.0003, 0.0003),
+               BenchResult("new", 1000, 5, 1.0, 1.0)]
+    regressions = compare_results(current, baseline)
+    assert [(r.name, round(r.ratio, 1)) for r in regressions] == [("search", 2.0)]
@@ -0,0 +1,76 @@
+from datetime import date, datetime, timedelta, timezone
+from src.controllers.task_controller import TASKS_RELOADED
+
+def category_totals(controller):
+    return {c.name: (c.task_count, c.time_spent) for c in controller.get_categories()}
+
+def test_delete_tasks_is_one_statement(controller, count_queries):
+    tasks = [controller.create_task(f"Task {i}", "Work" if i % 2 else "Home") for i in range(6)]
+    controller.update_task(tasks[1].id, time_spent=30)
+
+    with count_queries() as log:
+        assert controller.delete_tasks([t.id for t in tasks[:4]]) == 4
+    assert len([s for s in log.statements if s.startswith("DELETE FROM tasks")]) == 1
+    assert log.commits == 1
+    assert [t.title for t in controller.get_all_tasks()] == ["Task 4", "Task 5"]
+    assert category_totals(controller) == {"Home": (1, 0), "Work": (1, 0)}
+    assert tasks[0].id not in controller.cache
+
+def test_update_tasks_moves_categories(controller, count_queries):
+    tasks = [controller.create_task(f"Task {i}", "Work") for i in range(3)]
+    controller.update_task(tasks[0].id, time_spent=60)
+    with count_queries() as log:
+        assert controller.update_tasks([tasks[0].id, tasks[1].id], category="Home", status="Completed") == 2
+    assert len([s for s in log.statements if s.startswith("UPDATE tasks")]) == 1
+    assert category_totals(controller) == {"Home": (2, 60), "Work": (1, 0)}
+    snapshot = controller.get_task_snapshot(tasks[0].id)
+    assert (snapshot.category, snapshot.status) == ("Home", "Completed")
+    # The session's own copy is kept in sync as well.
+    assert controller.get_task(tasks[1].id).category == "Home"
+
+def test_rename_category_carries_history(controller):
+    task = controller.create_task("Task", "Old")
+    controller.update_task(task.id, time_spent=90)
+    controller.start_task_timer(task.id)
+    started_at = controller.get_task_snapshot(task.id).started_at
+    controller.recover_interrupted_session(task.id, started_at, started_at + timedelta(seconds=60))
+
+    assert controller.rename_category("Old", "New") == 1
+    assert controller.get_category_names() == ["New"]
+    assert [name for name, _ in controller.get_time_by_category(date(2000, 1, 1), date(2100, 1, 1))] == ["New"]
+    assert controller.get_task(task.id).category == "New"
+
+def test_reset_timers(controller):
+    tasks = [controller.create_task(f"Task {i}", "Work") for i in range(3)]
+    controller.update_task(tasks[0].id, time_spent=100)
+    controller.start_task_timer(tasks[1].id)
+    assert controller.reset_timers([tasks[0].id, tasks[1].id]) == 2
+    assert controller.get_running_task() is None
+    assert category_totals(controller) == {"Work": (3, 0)}
+    # The open session is dropped along with the rest of the tracked time.
+    assert controller.get_time_entries(tasks[1].id) == []
+
+def test_status_change_stops_running_timers(controller):
+    tasks = [controller.create_task(f"Task {i}", "Work") for i in range(3)]
+    controller.update_task(tasks[0].id, time_spent=100)
+    started_at = datetime.now(timezone.utc) - timedelta(seconds=60)
+    controller.update_task(tasks[0].id, started_at=started_at, status="In Progress")
+
+    assert controller.update_tasks([tasks[0].id, tasks[1].id], status="Pending") == 2
+    assert controller.get_running_task() is None
+    snapshot = controller.get_task_snapshot(tasks[0].id)
+    assert snapshot.started_at is None
+    assert 160 <= snapshot.time_spent <= 162
+    # The open session is recorded as a stop would record it.
+    entries = controller.get_time_entries(tasks[0].id)
+    assert [entry.seconds for entry in entries] == [snapshot.time_spent - 100]
+    assert controller.get_time_entries(tasks[1].id) == []
+    assert category_totals(controller) == {"Work": (3, snapshot.time_spent)}
+
+def test_large_sets_are_chunked_and_reload_listeners(controller):
+    controller.bulk_create_tasks([{"title": f"Task {i}", "category": "Work"} for i in range(2000)])
+    events = []
+    controller.add_listener(lambda event, task_id, snapshot: events.append(event))
+    assert controller.delete_tasks(range(1, 1901)) == 1900
+    assert events == [TASKS_RELOADED]
+    assert category_totals(controller) == {"Work": (100, 0)}
@@ -0,0 +1,45 @@
+from sqlalchemy import select, func
+from src.models.task import Task
+from src.models.category import Category, rebuild_category_index
+
+def category_totals(controller):
+    return {c.name: (c.task_count, c.time_spent) for c in controller.get_categories()}
+
+def scanned_totals(db_session):
+    rows = db_session.execute(
+        select(Task.category, func.count(Task.id), func.sum(Task.time_spent)).group_by(Task.category)
+    ).all()
+    return {name: (count, seconds) for name, count, seconds in rows}
+
+def test_create_and_delete_maintain_counts(controller):
+    task1 = controller.create_task("Task 1", "Work")
+    controller.create_task("Task 2", "Work")
+    controller.create_task("Task 3", "Home")
+    assert category_totals(controller) == {"Home": (1, 0), "Work": (2, 0)}
+
+    controller.delete_task(task1.id)
+    assert category_totals(controller) == {"Home": (1, 0), "Work": (1, 0)}
+
+def test_empty_category_is_dropped(controller):
+    task = controller.create_task("Task", "Temporary")
+    controller.update_task(task.id, category="Work")
+    assert controller.get_category_names() == ["Work"]
+
+def test_time_changes_follow_task(controller, db_session):
+    task = controller.create_task("Task", "Work")
+    controller.update_task(task.id, time_spent=120)
+    controller.update_task(task.id, category="Home")
+    assert category_totals(controller) == {"Home": (1, 120)}
+
+    controller.reset_task_timer(task.id)
+    assert category_totals(controller) == {"Home": (1, 0)}
+    assert category_totals(controller) == scanned_totals(db_session)
+
+def test_rebuild_matches_incremental_index(controller, db_session):
+    for i in range(5):
+        task = controller.create_task(f"Task {i}", "Work" if i % 2 else "Home")
+        controller.update_task(task.id, time_spent=i * 10)
+    incremental = category_totals(controller)
+    rebuild_category_index(db_session.connection())
+    db_session.commit()
+    assert category_totals(controller) == incremental
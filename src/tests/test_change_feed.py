@@ -0,0 +1,92 @@
+import pytest
+from src.controllers.change_feed import ChangeFeed
+from src.controllers.task_controller import (
+    TaskController, TASK_INSERTED, TASK_UPDATED, TASK_REMOVED, TASKS_RELOADED,
+)
+from src.models.task_changes import CHANGE_GAP, prune_change_log
+from src.utils.database import engine, get_db_session
+from src.utils.exceptions import ConcurrentModificationError
+
+@pytest.fixture
+def other(db_session):
+    # A second instance: its own session, like another window or the CLI.
+    session = get_db_session()
+    yield TaskController(session)
+    session.close()
+
+@pytest.fixture
+def feed(db_session):
+    feed = ChangeFeed(engine)
+    feed.start()
+    yield feed
+    feed.close()
+
+def test_stale_update_is_rejected_not_lost(controller, other):
+    task = controller.create_task("Shared", "Work")
+    other.update_task(task.id, time_spent=120)
+
+    with pytest.raises(ConcurrentModificationError):
+        controller.update_task(task.id, time_spent=60)
+    # The failed write rolled back and reloaded: a retry sees the new row.
+    assert controller.get_task(task.id).time_spent == 120
+    assert controller.update_task(task.id, time_spent=180).version == 3
+
+def test_set_based_updates_bump_the_version(controller):
+    task = controller.create_task("Shared", "Work")
+    controller.update_tasks([task.id], status="Completed")
+    controller.rename_category("Work", "Job")
+    assert controller.get_task_snapshot(task.id).version == 3
+
+def test_feed_reports_only_new_commits(controller, feed):
+    assert feed.poll() == []
+    task = controller.create_task("Shared", "Work")
+    controller.update_task(task.id, title="Renamed")
+    controller.delete_task(task.id)
+
+    assert [(change.task_id, change.op) for change in feed.poll()] == [(task.id, "I"), (task.id, "U"), (task.id, "D")]
+    assert feed.poll() == []
+
+def test_feed_skips_the_log_while_nothing_commits(feed, count_queries):
+    with count_queries() as log:
+        for _ in range(3):
+            assert feed.poll() == []
+    assert log.statements == ["PRAGMA data_version"] * 3
+
+def test_apply_changes_refreshes_only_what_changed(controller, other, feed):
+    kept = controller.create_task("Kept", "Work")
+    edited = controller.create_task("Edited", "Work")
+    controller.get_tasks_page()
+    feed.poll()
+    events = []
+    controller.add_listener(lambda event, task_id, task: events.append((event, task_id, task and task.title)))
+
+    other.update_task(edited.id, title="Edited elsewhere")
+    added = other.create_task("Added elsewhere", "Work")
+    other.delete_task(kept.id)
+
+    assert controller.apply_changes(feed.poll()) == 3
+    assert sorted(events) == sorted([
+        (TASK_UPDATED, edited.id, "Edited elsewhere"),
+        (TASK_INSERTED, added.id, "Added elsewhere"),
+        (TASK_REMOVED, kept.id, None),
+    ])
+    assert controller.get_task(edited.id).title == "Edited elsewhere"
+
+    # Our own commits come back through the feed too and are skipped.
+    controller.update_task(edited.id, title="Mine")
+    events.clear()
+    assert controller.apply_changes(feed.poll()) == 0
+    assert events == []
+
+def test_pruned_log_means_reload(controller, other, feed):
+    other.create_task("One", "Work")
+    other.create_task("Two", "Work")
+    with engine.begin() as connection:
+        prune_change_log(connection, keep=1)
+    changes = feed.poll()
+    assert [change.op for change in changes] == [CHANGE_GAP]
+
+    events = []
+    controller.add_listener(lambda event, task_id, task: events.append(event))
+    controller.apply_changes(changes)
+    assert events == [TASKS_RELOADED]
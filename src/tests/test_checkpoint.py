@@ -0,0 +1,87 @@
+from datetime import datetime, timedelta, timezone
+from src.utils.checkpoint import CheckpointJournal, claim_journal
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_heartbeats_are_coalesced(tmp_path):
+    clock = FakeClock()
+    journal = CheckpointJournal(str(tmp_path / "journal"), flush_interval=60, clock=clock)
+    for second in range(300):
+        clock.now = float(second)
+        journal.heartbeat(1)
+    # One write when the session starts, then one per interval.
+    assert journal.flush_count == 5
+    journal.flush()
+    assert journal.last_checkpoint().task_id == 1
+
+def test_clean_shutdown_is_recorded(tmp_path):
+    journal = CheckpointJournal(str(tmp_path / "journal"))
+    journal.heartbeat(7)
+    journal.mark_clean_shutdown(7)
+    assert journal.last_checkpoint().is_clean_shutdown
+
+def test_close_session_clears_journal(tmp_path):
+    journal = CheckpointJournal(str(tmp_path / "journal"))
+    journal.heartbeat(7)
+    journal.close_session()
+    assert journal.last_checkpoint() is None
+
+def test_torn_record_is_ignored(tmp_path):
+    path = tmp_path / "journal"
+    journal = CheckpointJournal(str(path))
+    journal.heartbeat(3)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("H 3 17")
+    assert journal.last_checkpoint().task_id == 3
+
+def test_recover_interrupted_session(controller):
+    task = controller.create_task("Crashed Task", "Work")
+    controller.start_task_timer(task.id)
+    started_at = controller.get_task(task.id).started_at.replace(tzinfo=timezone.utc)
+
+    recovered = controller.recover_interrupted_session(task.id, started_at, started_at + timedelta(seconds=90))
+    assert recovered.time_spent == 90
+    assert recovered.is_running is False
+    assert recovered.status == "Completed"
+
+def test_session_restarted_after_crash_is_not_recovered(controller, tmp_path):
+    task = controller.create_task("Crashed Task", "Work")
+    controller.start_task_timer(task.id)
+    crashed = controller.get_task_snapshot(task.id)
+    journal = CheckpointJournal(str(tmp_path / "journal"))
+    journal.heartbeat(task.id, crashed.started_at, at=crashed.started_at + timedelta(seconds=30))
+    checkpoint = journal.last_checkpoint()
+    assert checkpoint.started_at == crashed.started_at
+
+    # Restarted (e.g. from the CLI) before the GUI came back.
+    restarted_at = crashed.started_at + timedelta(minutes=5)
+    controller.update_task(task.id, started_at=restarted_at, status="In Progress")
+    assert controller.recover_interrupted_session(task.id, checkpoint.started_at, checkpoint.at) is None
+    live = controller.get_task_snapshot(task.id)
+    assert live.started_at == restarted_at and live.status == "In Progress" and live.time_spent == 0
+    # An old record without the session start is never trusted either.
+    assert controller.recover_interrupted_session(task.id, None, restarted_at + timedelta(seconds=30)) is None
+
+def test_live_instance_journal_is_left_alone(tmp_path):
+    path = str(tmp_path / "taskflow.journal")
+    first, orphans = claim_journal(path)
+    assert first.path == path and orphans == []
+    first.heartbeat(7)
+
+    # A second instance gets its own slot and does not see the first's.
+    second, orphans = claim_journal(path)
+    assert second.path != path and orphans == []
+    second.heartbeat(8)
+
+    # The second crashes (the OS drops its lock), the first exits cleanly.
+    second._lock.close()
+    first.mark_clean_shutdown(7)
+    first.release()
+    third, orphans = claim_journal(path)
+    assert third.path == path and third.last_checkpoint().is_clean_shutdown
+    assert [journal.last_checkpoint().task_id for journal in orphans] == [8]
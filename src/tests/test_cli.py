@@ -0,0 +1,55 @@
+import io
+import json
+import os
+import subprocess
+import sys
+from src.cli import main
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def run(*argv):
+    stdout, stderr = io.StringIO(), io.StringIO()
+    code = main(list(argv), stdout=stdout, stderr=stderr)
+    output = stdout.getvalue() if code == 0 else stderr.getvalue()
+    return code, json.loads(output)
+
+def test_start_switches_and_stop(controller):
+    first = controller.create_task("First", "Work")
+    second = controller.create_task("Second", "Home")
+
+    assert run("start", str(first.id))[1]["running"] is True
+    code, started = run("start", str(second.id))
+    assert code == 0 and started["id"] == second.id
+    assert run("status")[1]["running"]["id"] == second.id
+
+    code, stopped = run("stop")
+    assert stopped["stopped"]["id"] == second.id and stopped["stopped"]["running"] is False
+    assert run("status")[1] == {"running": None}
+    assert run("stop")[1] == {"stopped": None}
+
+def test_list_report_and_errors(controller):
+    for number in range(3):
+        controller.create_task(f"Informe {number}", "Work")
+    code, listing = run("list", "--limit", "2")
+    assert [task["title"] for task in listing["tasks"]] == ["Informe 0", "Informe 1"]
+    assert run("list", "--after", str(listing["next_after"]))[1]["tasks"][0]["title"] == "Informe 2"
+    assert len(run("list", "--search", "inf")[1]["tasks"]) == 3
+    controller.update_task(2, time_spent=90, status="Completed")
+    code, filtered = run("list", "--status", "Pending", "--sort=-title")
+    assert [task["title"] for task in filtered["tasks"]] == ["Informe 2", "Informe 0"]
+    assert run("list", "--min-seconds", "60")[1]["tasks"][0]["id"] == 2
+
+    code, report = run("report", "--by", "category", "--indent", "2")
+    assert code == 0 and report["rows"] == [] and report["total_seconds"] == 0
+
+    code, error = run("start", "999")
+    assert code == 1 and "999" in error["error"]
+
+def test_cli_never_imports_gui_modules(tmp_path):
+    code = (
+        "import sys; from src.cli import main; main(['status']);"
+        "print([name for name in ('PyQt5', 'matplotlib', 'plyer', 'qdarkstyle') if name in sys.modules])"
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=tmp_path, capture_output=True, text=True,
+                            env={**os.environ, "PYTHONPATH": REPO_ROOT}, check=True)
+    assert result.stdout.splitlines()[-1] == "[]"
@@ -0,0 +1,38 @@
+import csv
+import pytest
+from src.utils.csv_export import export_tasks_csv, CSV_FIELDNAMES
+from src.utils.database import engine
+from src.utils.exceptions import ExportCancelledError
+from src.views.workers import CsvExportWorker
+
+def test_export_streams_all_rows_in_chunks(controller, tmp_path):
+    for i in range(25):
+        controller.create_task(f"Task {i}", "Work")
+    controller.update_task(1, time_spent=3661)
+    progress = []
+    path = tmp_path / "tasks.csv"
+
+    written = export_tasks_csv(str(path), engine, chunk_size=10, progress=lambda done, total: progress.append((done, total)))
+
+    assert written == 25
+    assert progress == [(10, 25), (20, 25), (25, 25)]
+    with open(path, newline='', encoding='utf-8') as csvfile:
+        rows = list(csv.DictReader(csvfile))
+    assert list(rows[0]) == CSV_FIELDNAMES
+    assert rows[0]['Tiempo Empleado (segundos)'] == '3661'
+    assert rows[0]['Tiempo Empleado (HH:MM:SS)'] == '01:01:01'
+
+def test_cancelled_export_leaves_no_file(controller, tmp_path):
+    for i in range(25):
+        controller.create_task(f"Task {i}", "Work")
+    path = tmp_path / "tasks.csv"
+    with pytest.raises(ExportCancelledError):
+        export_tasks_csv(str(path), engine, chunk_size=10, is_cancelled=lambda: True)
+    assert list(tmp_path.iterdir()) == []
+
+def test_export_worker_reports_finished(qtbot, controller, tmp_path):
+    controller.create_task("Task", "Work")
+    worker = CsvExportWorker(str(tmp_path / "tasks.csv"))
+    with qtbot.waitSignal(worker.signals.finished, timeout=5000) as blocker:
+        worker.run()
+    assert blocker.args == [1]
@@ -0,0 +1,62 @@
+import threading
+import pytest
+from src.controllers.data_access import DataAccess
+from src.controllers.task_controller import TASK_INSERTED, TASK_UPDATED, TASK_REMOVED
+from src.utils.exceptions import TaskNotFoundError
+from src.views.data_bridge import DataBridge
+
+@pytest.fixture
+def data_access(db_session):
+    data_access = DataAccess()
+    yield data_access
+    data_access.shutdown()
+
+def test_writes_run_in_order_on_one_thread(data_access):
+    threads = []
+    def create(title):
+        def command(controller):
+            threads.append(threading.current_thread().name)
+            return controller.create_task(title, "Work").id
+        return command
+
+    futures = [data_access.write(create(f"Task {number}")) for number in range(5)]
+    assert [future.result() for future in futures] == [1, 2, 3, 4, 5]
+    assert len(set(threads)) == 1 and threads[0] != threading.current_thread().name
+
+    data_access.write(lambda controller: controller.switch_timer(1).snapshot())
+    switched = data_access.write(lambda controller: controller.switch_timer(2).snapshot())
+    assert switched.result().is_running
+    running = data_access.read(lambda controller: [task.id for task in controller.running_task_query()])
+    assert running.result() == [2]
+
+    failed = data_access.write(lambda controller: controller.get_task(99))
+    with pytest.raises(TaskNotFoundError):
+        failed.result()
+
+def test_external_changes_reach_the_gui_controller(controller, data_access):
+    events = []
+    controller.add_listener(lambda event, task_id, snapshot: events.append((event, task_id)))
+    data_access.add_listener(controller.apply_external_change)
+
+    task = controller.create_task("Local", "Work")
+    assert controller.get_task(task.id) is task
+    data_access.write(lambda writer: writer.update_task(task.id, title="Remote")).result()
+    # The identity-map copy was expired and the cache refreshed.
+    assert controller.get_task(task.id).title == "Remote"
+    assert controller.get_task_snapshot(task.id).title == "Remote"
+
+    data_access.write(lambda writer: writer.delete_task(task.id)).result()
+    with pytest.raises(TaskNotFoundError):
+        controller.get_task(task.id)
+    assert events == [(TASK_INSERTED, task.id), (TASK_UPDATED, task.id), (TASK_REMOVED, task.id)]
+
+def test_bridge_delivers_events_before_results(qtbot, data_access):
+    bridge = DataBridge(data_access)
+    delivered = []
+    bridge.task_changed.connect(lambda event, task_id, snapshot: delivered.append(event))
+
+    bridge.write(lambda controller: controller.create_task("Bridged", "Work").id,
+                 on_done=lambda task_id: delivered.append(("done", task_id)))
+    bridge.write(lambda controller: controller.get_task(42), on_error=lambda e: delivered.append(type(e)))
+    qtbot.waitUntil(lambda: len(delivered) == 3)
+    assert delivered == [TASK_INSERTED, ("done", 1), TaskNotFoundError]
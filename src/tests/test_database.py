@@ -0,0 +1,143 @@
+import re
+import threading
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.orm import sessionmaker
+from src.controllers.change_feed import ChangeFeed
+from src.controllers.task_controller import TaskController
+from src.models.category import Category
+from src.models.task import Task
+from src.utils.database import (
+    migrate, explain_query_plan, get_schema_version, SCHEMA_VERSION,
+    create_database_engine, get_engine_settings, get_profile,
+)
+
+def test_migrate_upgrades_legacy_database(tmp_path):
+    legacy_engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with legacy_engine.begin() as connection:
+        connection.exec_driver_sql(
+            "CREATE TABLE tasks (id INTEGER PRIMARY KEY, title VARCHAR NOT NULL, category VARCHAR, "
+            "status VARCHAR, time_spent INTEGER, started_at DATETIME, created_at DATETIME, updated_at DATETIME)"
+        )
+        connection.exec_driver_sql(
+            "INSERT INTO tasks (title, category, status, time_spent) VALUES "
+            "('A', 'Work', 'Pending', 10), ('B', 'Work', 'Completed', 20), ('C', 'Home', 'Pending', 5)"
+        )
+
+    assert migrate(legacy_engine) == 0
+    index_names = {index["name"] for index in inspect(legacy_engine).get_indexes("tasks")}
+    assert {"ix_tasks_category_status", "ix_tasks_updated_at", "ix_tasks_running"} <= index_names
+
+    with legacy_engine.connect() as connection:
+        assert get_schema_version(connection) == SCHEMA_VERSION
+        rows = connection.execute(Category.__table__.select().order_by(Category.name)).all()
+    assert [tuple(row) for row in rows] == [("Home", 1, 5), ("Work", 2, 30)]
+
+    # Already current: nothing left to run.
+    assert migrate(legacy_engine) == SCHEMA_VERSION
+
+    # tasks was rebuilt with AUTOINCREMENT; its search and change-log
+    # triggers came along.
+    controller = TaskController(sessionmaker(bind=legacy_engine, expire_on_commit=False)())
+    controller.delete_task(3)
+    assert controller.create_task("After delete", "Home").id == 4
+    assert [task.title for task in controller.search("delete")] == ["After delete"]
+    with legacy_engine.connect() as connection:
+        assert connection.exec_driver_sql("SELECT op FROM task_changes ORDER BY seq").scalars().all() == ["D", "I"]
+
+def test_migrated_schema_matches_fresh(tmp_path):
+    # The steps spell out their DDL; a legacy database must still end up
+    # with what the models create.
+    def schema(engine):
+        with engine.connect() as connection:
+            return set(connection.exec_driver_sql(
+                "SELECT type, name, tbl_name FROM sqlite_master WHERE name NOT LIKE 'sqlite_%'"
+            ).all())
+    fresh = create_engine(f"sqlite:///{tmp_path / 'fresh.db'}")
+    migrate(fresh)
+    legacy = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with legacy.begin() as connection:
+        connection.exec_driver_sql(
+            "CREATE TABLE tasks (id INTEGER PRIMARY KEY, title VARCHAR NOT NULL, category VARCHAR, "
+            "status VARCHAR, time_spent INTEGER, started_at DATETIME, created_at DATETIME, updated_at DATETIME)"
+        )
+    migrate(legacy)
+    assert schema(legacy) == schema(fresh)
+
+def indexes_used(plan):
+    # Exact names: "ix_tasks_category" must not pass for "ix_tasks_category_id".
+    return [match.group(1) for step in plan for match in [re.search(r"USING (?:COVERING )?INDEX (\w+)", step)] if match]
+
+def test_category_filter_uses_index(controller, db_session):
+    query = controller.tasks_by_category_query("Work")
+    plan = explain_query_plan(db_session.connection(), query.statement)
+    assert indexes_used(plan) in (["ix_tasks_category_status"], ["ix_tasks_category_id"])
+
+    plan = explain_query_plan(db_session.connection(), query.filter(Task.status == "Pending").statement)
+    assert indexes_used(plan) == ["ix_tasks_category_status"]
+    assert any("(category=? AND status=?)" in step for step in plan)
+
+def test_running_task_uses_partial_index(controller, db_session):
+    plan = explain_query_plan(db_session.connection(), controller.running_task_query().limit(1).statement)
+    assert any("ix_tasks_running" in step for step in plan)
+    assert not any("TEMP B-TREE" in step for step in plan)
+
+def test_pages_seek_on_indexes(controller, db_session):
+    for sort_key, index in (("id", "PRIMARY KEY"), ("title", "ix_tasks_title"), ("updated_at", "ix_tasks_updated_at")):
+        query = controller.tasks_page_query(after=("x", 10), sort_key=sort_key)
+        plan = explain_query_plan(db_session.connection(), query)
+        assert any(index in step for step in plan), (sort_key, plan)
+        assert not any("TEMP B-TREE" in step for step in plan), (sort_key, plan)
+
+    plan = explain_query_plan(db_session.connection(), controller.tasks_page_query(after=(None, 10), category="Work"))
+    assert any("ix_tasks_category_id" in step for step in plan)
+    assert not any("TEMP B-TREE" in step for step in plan)
+
+def test_desktop_profile_applies_pragmas_to_every_connection(tmp_path):
+    engine = create_database_engine(f"sqlite:///{tmp_path / 'tuned.db'}", "desktop")
+    try:
+        settings = get_engine_settings(engine)
+        assert settings["profile"] == "desktop"
+        assert settings["pool"] == "QueuePool"
+        assert settings["pragmas"]["journal_mode"] == "wal"
+        assert settings["pragmas"]["synchronous"] == "NORMAL"
+        assert settings["pragmas"]["temp_store"] == "MEMORY"
+        # A second pooled connection is configured too.
+        with engine.connect() as first, engine.connect() as second:
+            assert second.exec_driver_sql("PRAGMA cache_size").scalar() == get_profile("desktop").cache_size
+    finally:
+        engine.dispose()
+
+def test_memory_profile_shares_one_database(tmp_path):
+    engine = create_database_engine(profile="memory")
+    migrate(engine)
+    Session = sessionmaker(bind=engine, expire_on_commit=False)
+    writer = TaskController(Session())
+    thread = threading.Thread(target=lambda: writer.create_task("From a thread", "Work"))
+    thread.start()
+    thread.join()
+    assert [task.title for task in TaskController(Session()).get_all_tasks()] == ["From a thread"]
+    assert get_engine_settings(engine)["pool"] == "QueuePool"
+    assert list(tmp_path.iterdir()) == []
+    # Each engine has a database of its own.
+    assert inspect(create_database_engine(profile="memory")).get_table_names() == []
+
+def test_memory_profile_isolates_transactions():
+    engine = create_database_engine(profile="memory")
+    migrate(engine)
+    Session = sessionmaker(bind=engine, expire_on_commit=False)
+    controller = TaskController(Session())
+    feed = ChangeFeed(engine)
+    feed.start()
+    try:
+        with controller.batch():
+            controller.create_task("A", "Work")
+            # The feed's rollback ends its own read, not the open batch.
+            assert feed.poll() == []
+            controller.create_task("B", "Work")
+        assert [task.title for task in TaskController(Session()).get_all_tasks()] == ["A", "B"]
+        assert [change.op for change in feed.poll()] == ["I", "I"]
+    finally:
+        feed.close()
+
+def test_unknown_profile_falls_back_to_desktop():
+    assert get_profile("turbo").name == "desktop"
@@ -0,0 +1,61 @@
+import json
+import pytest
+from src.controllers.data_access import DataAccess
+from src.utils.csv_export import export_tasks_csv
+from src.utils.database import engine
+from src.utils.exceptions import TaskValidationError
+from src.views.data_bridge import DataBridge
+from src.views.workers import ChunkedImport
+
+def test_bulk_create_uses_one_transaction(controller):
+    rows = [{"title": f"Task {i}", "category": "Work" if i % 2 else "Home", "time_spent": 10} for i in range(25)]
+    assert controller.bulk_create_tasks(rows, batch_size=10) == 25
+    assert len(controller.get_all_tasks()) == 25
+    totals = {c.name: (c.task_count, c.time_spent) for c in controller.get_categories()}
+    assert totals == {"Home": (13, 130), "Work": (12, 120)}
+
+def test_invalid_row_rolls_back_whole_import(controller):
+    rows = [{"title": "Good"}] * 12 + [{"title": ""}]
+    with pytest.raises(TaskValidationError):
+        controller.bulk_create_tasks(rows, batch_size=5)
+    assert controller.get_all_tasks() == []
+
+def test_csv_export_round_trip(controller, tmp_path):
+    controller.create_task("Exported", "Work")
+    controller.update_task(1, time_spent=42, status="Completed")
+    path = tmp_path / "tasks.csv"
+    export_tasks_csv(str(path), engine)
+
+    result = controller.import_tasks(str(path))
+    assert result.rows == 1
+    assert result.rows_per_second > 0
+    imported = controller.get_task(2)
+    assert (imported.title, imported.category, imported.status, imported.time_spent) == ("Exported", "Work", "Completed", 42)
+
+def test_jsonl_import(controller, tmp_path):
+    path = tmp_path / "tasks.jsonl"
+    path.write_text("\n".join(json.dumps(row) for row in [
+        {"title": "From JSON", "category": "Home", "time_spent": 5},
+        {"Título": "Export headers", "Categoría": "Work"},
+    ]), encoding="utf-8")
+    assert controller.import_tasks(str(path)).rows == 2
+    assert controller.get_category_names() == ["Home", "Work"]
+
+def test_gui_import_commits_in_chunks_through_the_writer(qtbot, controller, tmp_path):
+    path = tmp_path / "tasks.jsonl"
+    rows = [{"title": f"Task {i}"} for i in range(12)] + [{"title": ""}]
+    path.write_text("\n".join(json.dumps(row) for row in rows), encoding="utf-8")
+    data_access = DataAccess()
+    try:
+        job = ChunkedImport(DataBridge(data_access), str(path), chunk_rows=5)
+        progress, failures = [], []
+        job.progress.connect(progress.append)
+        job.failed.connect(lambda message, imported: failures.append((message, imported)))
+        job.start()
+        qtbot.waitUntil(lambda: len(failures) == 1)
+    finally:
+        data_access.shutdown()
+    # The chunks before the bad row committed; the one holding it did not.
+    assert progress == [5, 10]
+    assert failures[0][1] == 10 and "Line 13" in failures[0][0]
+    assert len(controller.get_all_tasks()) == 10
@@ -0,0 +1,69 @@
+import json
+from PyQt5.QtWidgets import QPushButton
+from sqlalchemy import create_engine, text
+from src.utils.instrumentation import (
+    Instrumentation, instrument_engine, statement_key, timed, MAX_HISTOGRAMS, OTHER_KEY, QUERY, ACTION,
+)
+
+def test_histogram_percentiles_and_slow_log():
+    stats = Instrumentation(slow_query_ms=50, slow_action_ms=1000)
+    for milliseconds in range(1, 101):
+        stats.record(QUERY, "SELECT 1", milliseconds / 1000)
+    report = stats.to_dict()
+    query = report["queries"]["SELECT 1"]
+    assert query["count"] == 100
+    assert round(query["p50_ms"]) == 51 and round(query["max_ms"]) == 100
+    assert sum(query["buckets"]) == 100
+    assert len(report["slow_log"]) == 51
+    assert report["actions"] == {}
+
+def test_engine_hooks_time_every_statement(tmp_path):
+    stats = Instrumentation()
+    engine = create_engine(f"sqlite:///{tmp_path / 'stats.db'}")
+    instrument_engine(engine, stats)
+    with engine.connect() as connection:
+        for _ in range(3):
+            connection.execute(text("SELECT 1"))
+        try:
+            connection.execute(text("SELECT * FROM missing"))
+        except Exception:
+            pass
+        connection.execute(text("SELECT 2"))
+    assert stats.histograms[QUERY]["SELECT 1"].count == 3
+    assert stats.histograms[QUERY]["SELECT 2"].count == 1
+
+    path = tmp_path / "dump.json"
+    stats.dump_json(str(path))
+    assert "SELECT 1" in json.loads(path.read_text())["queries"]
+
+def test_statement_keys_stay_bounded():
+    # Lists and pages of any size share one key...
+    keys = {statement_key(f"SELECT * FROM tasks WHERE id IN ({', '.join('?' * size)}) LIMIT {size}")
+            for size in range(1, 50)}
+    assert keys == {"SELECT * FROM tasks WHERE id IN (...) LIMIT ?"}
+    assert statement_key("INSERT INTO t (a) VALUES (?), (?), (?)") == "INSERT INTO t (a) VALUES (?)"
+
+    # ...and text that still varies ends up in one overflow histogram.
+    stats = Instrumentation()
+    for number in range(MAX_HISTOGRAMS + 50):
+        stats.record(QUERY, f"SELECT {number}", 0.001)
+    assert len(stats.histograms[QUERY]) == MAX_HISTOGRAMS + 1
+    assert stats.histograms[QUERY][OTHER_KEY].count == 50
+    stats.record(QUERY, "SELECT 0", 0.001)
+    assert stats.histograms[QUERY]["SELECT 0"].count == 2
+
+def test_timed_slot_drops_signal_arguments(qapp):
+    stats = Instrumentation(slow_action_ms=0)
+    calls = []
+
+    class Button(QPushButton):
+        @timed("click", target=stats)
+        def on_click(self):
+            calls.append(True)
+
+    button = Button()
+    button.clicked.connect(button.on_click)
+    button.click()
+    assert calls == [True]
+    assert stats.histograms[ACTION]["click"].count == 1
+    assert stats.slow_log[0].name == "click"
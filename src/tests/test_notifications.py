@@ -0,0 +1,76 @@
+import json
+import threading
+from datetime import date
+from src.utils.notifications import (
+    CategoryRule, Notification, NotificationDispatcher, NotificationRules, NotificationScheduler, load_rules,
+)
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+def make_scheduler(rules, clock):
+    return NotificationScheduler(rules, clock=clock, today=lambda: date(2024, 3, 1))
+
+def test_pomodoro_and_budget_deadlines():
+    clock = FakeClock()
+    rules = NotificationRules(categories={"Work": CategoryRule(pomodoro_minutes=25, daily_budget_minutes=60)})
+    scheduler = make_scheduler(rules, clock)
+    # 20 minutes into the session, 30 minutes already tracked today.
+    scheduler.session_started(1, "Report", "Work", elapsed=20 * 60, spent_today=30 * 60)
+    assert scheduler.next_due_in() == 5 * 60
+    assert scheduler.due() == []
+
+    clock.now += 5 * 60
+    assert [n.key for n in scheduler.due()] == ["pomodoro:1:1"]
+    # A late tick still fires everything that came due, in deadline order.
+    clock.now += 30 * 60
+    assert [n.key for n in scheduler.due()] == ["budget:Work:2024-03-01", "pomodoro:1:2"]
+
+    # The budget fires once per category and day.
+    scheduler.session_started(2, "Other", "Work")
+    assert scheduler.next_due_in() == 25 * 60
+
+def test_idle_reminders_and_stale_deadlines():
+    clock = FakeClock()
+    scheduler = make_scheduler(NotificationRules(idle_minutes=10), clock)
+    scheduler.session_started(1, "Focus", "General")
+    scheduler.session_stopped()
+    # The running session's pomodoro was retired with its generation.
+    assert scheduler.next_due_in() == 10 * 60
+    clock.now += 25 * 60
+    notifications = scheduler.due()
+    assert [n.title for n in notifications] == ["TaskFlow - Sin tarea activa"] * 2
+    assert "20 minutos" in notifications[-1].message
+
+def test_load_rules_merges_category_overrides(tmp_path):
+    path = tmp_path / "notifications.json"
+    path.write_text(json.dumps({"default": {"pomodoro_minutes": 30},
+                                "categories": {"Work": {"daily_budget_minutes": 480}}, "idle_minutes": 15}))
+    rules = load_rules(str(path))
+    assert rules.for_category("Work") == CategoryRule(30, 480)
+    assert rules.for_category("Home") == CategoryRule(30, None)
+    assert rules.idle_minutes == 15
+    path.write_text("{not json")
+    assert load_rules(str(path)) == NotificationRules()
+
+def test_dispatcher_deduplicates_off_the_calling_thread():
+    shown, threads = [], []
+    done = threading.Event()
+
+    def backend(notification):
+        threads.append(threading.current_thread().name)
+        shown.append(notification.key)
+        if notification.key == "b":
+            done.set()
+
+    dispatcher = NotificationDispatcher(backend, min_interval=0)
+    for key in ["a", "a", "b"]:
+        dispatcher.send(Notification(key, "t", "m"))
+    assert done.wait(2)
+    dispatcher.close()
+    assert shown == ["a", "b"] and dispatcher.dropped == 1
+    assert threads == ["taskflow-notifier"] * 2
@@ -0,0 +1,40 @@
+import pytest
+from src.utils.exceptions import TaskValidationError
+from src.views.task_list_model import TaskListModel
+
+def walk_pages(controller, **kwargs):
+    cursor, titles = None, []
+    while True:
+        page = controller.get_tasks_page(after=cursor, **kwargs)
+        titles.extend(task.title for task in page.items)
+        if not page.has_more:
+            return titles
+        cursor = page.next_cursor
+
+def test_pages_cover_every_task_once(controller):
+    controller.bulk_create_tasks([{"title": f"Task {i:03d}", "category": "Work" if i % 3 else "Home"} for i in range(95)])
+    assert walk_pages(controller, limit=10) == [f"Task {i:03d}" for i in range(95)]
+    assert walk_pages(controller, limit=10, category="Home") == [f"Task {i:03d}" for i in range(0, 95, 3)]
+
+def test_pages_by_title_with_duplicates(controller):
+    controller.bulk_create_tasks([{"title": title} for title in ["b", "a", "b", "c", "a", "b"]])
+    assert walk_pages(controller, limit=2, sort_key="title") == ["a", "a", "b", "b", "b", "c"]
+    assert walk_pages(controller, limit=4, sort_key="title", descending=True) == ["c", "b", "b", "b", "a", "a"]
+
+def test_unknown_sort_key(controller):
+    with pytest.raises(TaskValidationError):
+        controller.get_tasks_page(sort_key="status")
+
+def test_model_fetches_pages_on_demand(qapp, controller):
+    controller.bulk_create_tasks([{"title": f"Task {i}"} for i in range(25)])
+    model = TaskListModel(controller, page_size=10)
+    model.reload()
+    assert model.rowCount() == 10
+    assert model.canFetchMore()
+
+    # New tasks past the loaded pages show up with a later page.
+    controller.create_task("Late", "General")
+    assert model.rowCount() == 10
+    while model.canFetchMore():
+        model.fetchMore()
+    assert model.rowCount() == 26
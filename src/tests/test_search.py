@@ -0,0 +1,47 @@
+from src.views.task_list_model import TaskListModel
+
+def titles(snapshots):
+    return [task.title for task in snapshots]
+
+def test_prefix_search_ranks_title_matches_first(controller):
+    controller.create_task("Informe trimestral", "Trabajo")
+    controller.create_task("Comprar pan", "Informes")
+    controller.create_task("Llamar a Ana", "Casa")
+    assert titles(controller.search("inform")) == ["Informe trimestral", "Comprar pan"]
+    assert titles(controller.search("inf trim")) == ["Informe trimestral"]
+    assert titles(controller.search("pan", category="Casa")) == []
+
+def test_search_ignores_operators_and_accents(controller):
+    controller.create_task("Revisión de código", "Trabajo")
+    assert titles(controller.search("revision")) == ["Revisión de código"]
+    assert titles(controller.search('revis* "código')) == ["Revisión de código"]
+    assert controller.search("  ") == []
+
+def test_index_follows_every_write_path(controller):
+    task = controller.create_task("Old title", "General")
+    other = controller.create_task("Another", "General")
+    controller.update_task(task.id, title="New title")
+    assert titles(controller.search("old")) == []
+    assert titles(controller.search("new")) == ["New title"]
+
+    controller.rename_category("General", "Personal")
+    assert len(controller.search("personal")) == 2
+    controller.delete_tasks([task.id, other.id])
+    assert controller.search("personal") == []
+
+def test_model_search_mode(qapp, controller):
+    for title in ["alpha one", "alpha two", "beta"]:
+        controller.create_task(title, "General")
+    model = TaskListModel(controller)
+    model.set_search_text("alpha")
+    assert model.rowCount() == 2
+
+    # New tasks don't pop into a result list; edits and deletes apply live.
+    controller.create_task("alpha three", "General")
+    assert model.rowCount() == 2
+    first = model.task_id_at(model.index(0))
+    controller.delete_task(first)
+    assert model.rowCount() == 1
+
+    model.set_search_text("")
+    assert model.rowCount() == 3
@@ -0,0 +1,31 @@
+import os
+from PyQt5.QtWidgets import QMainWindow
+from src.utils import ui_loader
+from src.utils.startup_profiler import StartupProfiler
+
+def test_load_ui_uses_compiled_cache(qtbot, monkeypatch):
+    window = QMainWindow()
+    qtbot.addWidget(window)
+    ui_loader.load_ui(window, "main_window")
+    assert window.task_list_view is not None
+    assert ui_loader.is_compiled_ui_current("main_window")
+
+    def fail_compile(ui_name):
+        raise AssertionError("cached UI should not be recompiled")
+    monkeypatch.setattr(ui_loader, "compile_ui", fail_compile)
+    second = QMainWindow()
+    qtbot.addWidget(second)
+    ui_loader.load_ui(second, "main_window")
+    assert second.toggle_timer_button.text()
+
+def test_profiler_reports_phases():
+    ticks = iter([0.0, 0.0, 0.1, 0.1, 0.4, 0.5])
+    profiler = StartupProfiler(clock=lambda: next(ticks))
+    with profiler.phase("imports"):
+        pass
+    with profiler.phase("db_init"):
+        pass
+    profiler.mark("first_paint")
+    assert [name for name, _ in profiler.phases] == ["imports", "db_init", "first_paint"]
+    assert abs(profiler.total - 0.5) < 1e-9
+    assert "first_paint" in profiler.report()
@@ -0,0 +1,63 @@
+import os
+import subprocess
+import sys
+from src.views.statistics_dialog import StatisticsDialog
+from src.views.workers import StatisticsWorker
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+def test_statistics_worker_reports_category_totals(qtbot, controller):
+    task = controller.create_task("Task", "Work")
+    controller.update_task(task.id, time_spent=3600)
+    worker = StatisticsWorker()
+    with qtbot.waitSignal(worker.signals.finished, timeout=5000) as blocker:
+        worker.run()
+    assert blocker.args == [[("Work", 3600)]]
+
+def test_dialog_shows_placeholder_then_results(qtbot, controller):
+    controller.create_task("Task", "Work")
+    dialog = StatisticsDialog()
+    qtbot.addWidget(dialog)
+    assert dialog.layout.itemAt(0).widget().text() == "Calculando estadísticas..."
+    qtbot.waitUntil(lambda: dialog.layout.count() > 1, timeout=5000)
+
+def test_main_window_import_does_not_load_matplotlib():
+    code = "import sys; import src.views.main_window; print('matplotlib' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "False"
+
+def test_chart_updates_bars_in_place(qtbot):
+    from src.views.category_chart import CategoryChart, RenderCache
+    chart = CategoryChart(cache=RenderCache())
+    qtbot.addWidget(chart)
+    chart.set_data([("Home", 1800), ("Work", 3600)])
+    bars = list(chart._bars)
+    assert chart.full_draws == 1
+
+    chart.set_data([("Home", 2700), ("Work", 3000)])
+    assert chart._bars == bars and chart.blits == 1 and chart.full_draws == 1
+    assert [bar.get_height() for bar in bars] == [0.75, 3000 / 3600]
+    assert [label.get_text() for label in chart._labels] == ["00:45:00", "00:50:00"]
+
+    # Outgrowing the axis rescales it; new categories rebuild the bars.
+    chart.set_data([("Home", 2700), ("Work", 36000)])
+    assert chart._bars == bars and chart.full_draws == 2
+    chart.set_data([("Home", 2700), ("Ocio", 60), ("Work", 36000)])
+    assert len(chart._bars) == 3 and chart.full_draws == 3
+
+def test_reopened_chart_uses_cached_render(qtbot):
+    from src.views.category_chart import CategoryChart, RenderCache
+    cache = RenderCache()
+    data = [("Home", 1800), ("Work", 3600)]
+    first = CategoryChart(cache=cache)
+    qtbot.addWidget(first)
+    first.set_data(data)
+    assert len(cache) == 1
+
+    second = CategoryChart(cache=cache)
+    qtbot.addWidget(second)
+    second.set_data(data)
+    assert second.figure is None and second.showing_cached_image and cache.hits == 1
+
+    second.set_data([("Home", 1800), ("Work", 7200)])
+    assert second.figure is not None and not second.showing_cached_image
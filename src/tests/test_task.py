@@ -1,22 +1,7 @@
 import pytest
-from src.controllers.task_controller import TaskController
-from src.utils.database import get_db_session, create_tables, engine, Base
 from src.models.task import Task
 import time
 
-@pytest.fixture(scope="function")
-def db_session():
-    # Ensure a clean database for each test
-    Base.metadata.drop_all(bind=engine)
-    Base.metadata.create_all(bind=engine)
-    session = get_db_session()
-    yield session
-    session.close()
-
-@pytest.fixture(scope="function")
-def controller(db_session):
-    return TaskController(db_session)
-
 def test_create_task(controller):
     task = controller.create_task("Test Task", "Test Category")
     assert task.id is not None
@@ -0,0 +1,31 @@
+def test_snapshot_reads_hit_cache(controller, count_queries):
+    task = controller.create_task("Cached Task", "Work")
+    with count_queries() as log:
+        for _ in range(10):
+            snapshot = controller.get_task_snapshot(task.id)
+    assert log.statements == []
+    assert snapshot.title == "Cached Task"
+    assert controller.cache.hits == 10
+
+def test_controller_write_refreshes_snapshot(controller):
+    task = controller.create_task("Task", "Work")
+    controller.get_task_snapshot(task.id)
+    controller.start_task_timer(task.id)
+    snapshot = controller.get_task_snapshot(task.id)
+    assert snapshot.is_running
+    assert snapshot.status == "In Progress"
+
+def test_external_commit_invalidates_snapshot(controller, db_session):
+    task = controller.create_task("Task", "Work")
+    controller.get_task_snapshot(task.id)
+    task.title = "Changed outside the controller"
+    db_session.commit()
+    assert task.id not in controller.cache
+    misses = controller.cache.misses
+    assert controller.get_task_snapshot(task.id).title == "Changed outside the controller"
+    assert controller.cache.misses == misses + 1
+
+def test_delete_evicts_snapshot(controller):
+    task = controller.create_task("Task", "Work")
+    controller.delete_task(task.id)
+    assert task.id not in controller.cache
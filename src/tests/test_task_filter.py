@@ -0,0 +1,114 @@
+from datetime import datetime, timedelta, timezone
+import pytest
+from src.controllers.task_controller import TaskController
+from src.models.task import Task
+from src.models.task_filter import TaskFilter, filter_query
+from src.utils.database import explain_query_plan, get_db_session
+from src.utils.exceptions import TaskValidationError
+from src.views.task_list_model import TaskListModel
+
+def titles(result):
+    return [task.title for task in result.items]
+
+@pytest.fixture
+def tasks(controller):
+    rows = [("Informe", "Work", "Pending", 7200), ("Correo", "Work", "Completed", 600),
+            ("Compra", "Home", "Pending", 0), ("Jardín", "Home", "Completed", 5400)]
+    for title, category, status, time_spent in rows:
+        task = controller.create_task(title, category)
+        controller.update_task(task.id, status=status, time_spent=time_spent)
+    return controller
+
+def test_spec_combines_filters_and_sorts(tasks):
+    assert titles(tasks.filter_tasks(TaskFilter(categories=["Work"], statuses=["Pending"]))) == ["Informe"]
+    longest = TaskFilter(min_time_spent=600, sort=[("time_spent", True)])
+    assert titles(tasks.filter_tasks(longest)) == ["Informe", "Jardín", "Correo"]
+    by_category = TaskFilter(sort=[("category", False), ("title", True)])
+    assert titles(tasks.filter_tasks(by_category)) == ["Jardín", "Compra", "Informe", "Correo"]
+    assert titles(tasks.filter_tasks(TaskFilter(max_time_spent=0))) == ["Compra"]
+
+    truncated = tasks.filter_tasks(TaskFilter(), limit=3)
+    assert len(truncated.items) == 3 and truncated.truncated
+
+def test_running_and_date_ranges(tasks):
+    informe = tasks.filter_tasks(TaskFilter(categories=["Work"], statuses=["Pending"])).items[0]
+    tasks.start_task_timer(informe.id)
+    assert titles(tasks.filter_tasks(TaskFilter(running=True))) == ["Informe"]
+    assert len(tasks.filter_tasks(TaskFilter(running=False)).items) == 3
+
+    tasks.db_session.query(Task).filter(Task.title == "Correo").update(
+        {"created_at": datetime.now(timezone.utc) - timedelta(days=30)}
+    )
+    tasks.db_session.commit()
+    week_ago = datetime.now(timezone.utc) - timedelta(days=7)
+    assert titles(tasks.filter_tasks(TaskFilter(created_to=week_ago))) == ["Correo"]
+    assert "Correo" not in titles(tasks.filter_tasks(TaskFilter(created_from=week_ago)))
+
+def test_results_are_cached_until_any_task_changes(tasks, count_queries):
+    spec = TaskFilter(statuses=["Pending"])
+    first = tasks.filter_tasks(spec)
+    with count_queries() as log:
+        assert tasks.filter_tasks(TaskFilter(statuses={"Pending"})) is first
+    assert len(log.selects) == 1 and "task_changes" in log.selects[0]
+
+    # A write from another session moves the data version.
+    session = get_db_session()
+    try:
+        TaskController(session).create_task("Nueva", "Home")
+    finally:
+        session.close()
+    assert titles(tasks.filter_tasks(spec)) == ["Informe", "Compra", "Nueva"]
+    assert tasks.filter_cache.stats["hits"] == 1
+
+def test_invalid_specs_are_rejected(controller):
+    with pytest.raises(TaskValidationError):
+        TaskFilter(sort=[("priority", False)])
+    with pytest.raises(TaskValidationError):
+        controller.filter_tasks(TaskFilter(statuses=["Done"]))
+
+def test_filters_use_indexes(controller, db_session):
+    for spec, index in (
+        (TaskFilter(categories=["Work"], statuses=["Pending"]), "ix_tasks_category_status"),
+        (TaskFilter(running=True), "ix_tasks_running"),
+        (TaskFilter(sort=[("time_spent", True)]), "ix_tasks_time_spent"),
+        (TaskFilter(sort=[("created_at", False)]), "ix_tasks_created_at"),
+    ):
+        plan = explain_query_plan(db_session.connection(), filter_query(spec, 100))
+        assert any(index in step for step in plan), (spec, plan)
+
+def test_model_filter_mode(qapp, tasks):
+    model = TaskListModel(tasks)
+    model.set_filter(TaskFilter(statuses=["Pending"]))
+    assert model.rowCount() == 2
+
+    compra = tasks.filter_tasks(TaskFilter(categories=["Home"], statuses=["Pending"])).items[0]
+    tasks.update_task(compra.id, status="Completed")
+    assert model.rowCount() == 1
+    # A task that starts matching re-runs the filter.
+    tasks.update_task(compra.id, status="Pending")
+    assert model.rowCount() == 2
+
+    model.set_category("Home")
+    assert [model.data(model.index(row)).split(" (")[0] for row in range(model.rowCount())] == ["Compra"]
+    model.set_filter(None)
+    assert model.rowCount() == 2
+
+def test_model_keeps_sorted_filter_order(qapp, controller):
+    for title in ("T0", "T1", "T2"):
+        controller.create_task(title, "Work")
+    model = TaskListModel(controller)
+    recent = TaskFilter(sort=[("updated_at", True)])
+    model.set_filter(recent)
+    shown = lambda: [model.data(model.index(row)).split(" (")[0] for row in range(model.rowCount())]
+    assert shown() == ["T2", "T1", "T0"]
+
+    t0 = controller.filter_tasks(TaskFilter(sort=[("title", False)])).items[0]
+    controller.update_task(t0.id, title="T0 edited")
+    assert shown() == titles(controller.filter_tasks(recent)) == ["T0 edited", "T2", "T1"]
+
+    longest = TaskFilter(sort=[("time_spent", True)])
+    model.set_filter(longest)
+    t1 = controller.filter_tasks(TaskFilter(sort=[("title", False)])).items[1]
+    controller.update_task(t1.id, time_spent=3600)
+    assert shown() == titles(controller.filter_tasks(longest))
+    assert shown()[0] == "T1"
@@ -0,0 +1,44 @@
+import pytest
+from src.views.task_list_model import TaskListModel, TaskIdRole
+
+@pytest.fixture(scope="function")
+def model(qapp, controller):
+    return TaskListModel(controller)
+
+def test_model_loads_tasks(controller, model):
+    controller.create_task("Task 1", "Work")
+    controller.create_task("Task 2", "Home")
+    model.reload()
+    assert model.rowCount() == 2
+
+def test_insert_emits_rows_inserted_only(qtbot, controller, model):
+    model.reload()
+    with qtbot.assertNotEmitted(model.modelReset):
+        with qtbot.waitSignal(model.rowsInserted, timeout=100):
+            task = controller.create_task("New Task", "Work")
+    assert model.rowCount() == 1
+    assert model.data(model.index(0), TaskIdRole) == task.id
+
+def test_update_emits_data_changed_for_row(qtbot, controller, model):
+    task1 = controller.create_task("Task 1", "Work")
+    task2 = controller.create_task("Task 2", "Work")
+    model.reload()
+    with qtbot.waitSignal(model.dataChanged, timeout=100) as blocker:
+        controller.update_task(task2.id, title="Renamed")
+    top_left, bottom_right = blocker.args[0], blocker.args[1]
+    assert top_left.row() == bottom_right.row() == 1
+    assert "Renamed" in model.data(model.index(1))
+
+def test_delete_and_filter_remove_rows(controller, model):
+    task1 = controller.create_task("Task 1", "Work")
+    task2 = controller.create_task("Task 2", "Home")
+    task3 = controller.create_task("Task 3", "Work")
+    model.set_category("Work")
+    assert model.rowCount() == 2
+
+    controller.delete_task(task1.id)
+    assert model.rowCount() == 1
+    assert model.index_of(task3.id).row() == 0
+
+    controller.update_task(task3.id, category="Home")
+    assert model.rowCount() == 0
@@ -0,0 +1,60 @@
+import time
+from datetime import date, datetime, timedelta, timezone
+from sqlalchemy import select, func
+from src.models.time_entry import TimeRollup, split_by_day
+from src.utils.database import explain_query_plan
+
+def test_split_by_day_crosses_midnight():
+    started_at = datetime(2024, 3, 1, 23, 30, tzinfo=timezone.utc)
+    ended_at = datetime(2024, 3, 3, 0, 15, tzinfo=timezone.utc)
+    assert list(split_by_day(started_at, ended_at)) == [
+        (date(2024, 3, 1), 30 * 60),
+        (date(2024, 3, 2), 24 * 3600),
+        (date(2024, 3, 3), 15 * 60),
+    ]
+
+def test_stop_timer_records_entry_and_rollup(controller):
+    task = controller.create_task("Timer Task", "Work")
+    controller.start_task_timer(task.id)
+    time.sleep(1)
+    controller.stop_task_timer(task.id)
+
+    entries = controller.get_time_entries(task.id)
+    assert len(entries) == 1
+    assert entries[0].seconds == controller.get_task(task.id).time_spent
+
+    today = datetime.now(timezone.utc).date()
+    assert controller.get_time_by_category(today - timedelta(days=30), today) == [("Work", entries[0].seconds)]
+    assert controller.get_time_by_task(today, today) == [(task.id, entries[0].seconds)]
+
+def test_recovered_session_is_rolled_up(controller):
+    task = controller.create_task("Crashed Task", "Work")
+    controller.start_task_timer(task.id)
+    started_at = controller.get_task(task.id).started_at.replace(tzinfo=timezone.utc)
+    controller.recover_interrupted_session(task.id, started_at, started_at + timedelta(seconds=45))
+    # The session may straddle midnight, so check the two-day total.
+    day = started_at.date()
+    assert sum(seconds for _, seconds in controller.get_time_by_day(day, day + timedelta(days=1))) == 45
+
+def test_category_change_and_delete_follow_rollups(controller):
+    task = controller.create_task("Task", "Work")
+    controller.start_task_timer(task.id)
+    started_at = controller.get_task(task.id).started_at.replace(tzinfo=timezone.utc)
+    controller.recover_interrupted_session(task.id, started_at, started_at + timedelta(seconds=60))
+
+    start, end = date(2000, 1, 1), date(2100, 1, 1)
+    controller.update_task(task.id, category="Home")
+    assert controller.get_time_by_category(start, end) == [("Home", 60)]
+
+    controller.delete_task(task.id)
+    assert controller.get_time_by_category(start, end) == []
+    assert controller.get_time_entries(task.id) == []
+
+def test_category_range_uses_rollup_index(db_session):
+    query = (
+        select(TimeRollup.day, func.sum(TimeRollup.seconds))
+        .where(TimeRollup.category == "Work", TimeRollup.day.between(date(2024, 1, 1), date(2024, 1, 31)))
+        .group_by(TimeRollup.day)
+    )
+    plan = explain_query_plan(db_session.connection(), query)
+    assert any("ix_time_rollups_category_day" in step for step in plan)
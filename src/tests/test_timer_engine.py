@@ -0,0 +1,67 @@
+from datetime import datetime, timedelta, timezone
+from src.models.task import TaskSnapshot
+from src.utils.session_clock import SessionClock
+from src.views.timer_engine import TimerEngine
+
+NOW = datetime(2024, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+class FakeClock:
+    def __init__(self):
+        self.monotonic = 1000.0
+        self.wall = NOW
+
+    def advance(self, seconds):
+        self.monotonic += seconds
+
+def make_clock(fake):
+    return SessionClock(monotonic=lambda: fake.monotonic, wall=lambda: fake.wall)
+
+def running_task(started_seconds_ago, time_spent=0):
+    return TaskSnapshot(1, "Focus", "Work", "In Progress", time_spent,
+                        NOW - timedelta(seconds=started_seconds_ago), NOW, NOW)
+
+def test_clock_ignores_wall_clock_jumps():
+    fake = FakeClock()
+    clock = make_clock(fake)
+    clock.start(1, NOW - timedelta(seconds=90), base_seconds=10)
+    assert clock.total_seconds() == 100
+    fake.wall = NOW - timedelta(hours=1)
+    fake.advance(5.5)
+    assert clock.elapsed() == 95.5 and clock.total_seconds() == 105
+
+def test_boundaries():
+    assert SessionClock.seconds_until_next(12.25, 1) == 0.75
+    assert SessionClock.seconds_until_next(1499.0, 1500) == 1.0
+
+def test_engine_ticks_adaptively_and_idles(qapp):
+    fake = FakeClock()
+    engine = TimerEngine(clock=make_clock(fake), heartbeat_seconds=60)
+    ticks = []
+    engine.tick.connect(ticks.append)
+
+    engine.start(running_task(1499.6, time_spent=100))
+    assert ticks == [1599] and engine.scheduled
+    assert 400 <= engine._timer.remainingTime() <= 410
+
+    fake.advance(2.0)
+    engine._on_timeout()
+    assert ticks[-1] == 1601
+
+    engine.set_display_active(False)
+    assert 58000 <= engine._timer.remainingTime() <= 60010
+
+    engine.stop()
+    assert not engine.scheduled and not engine.running
+
+def test_engine_reanchors_a_restarted_session(qapp):
+    fake = FakeClock()
+    engine = TimerEngine(clock=make_clock(fake))
+    engine.start(running_task(600))
+    # A refreshed snapshot of the same session keeps the anchor...
+    fake.advance(10)
+    engine.start(running_task(600, time_spent=5))
+    assert engine.clock.elapsed() == 610
+    # ...a restart of the same task (e.g. in another instance) does not.
+    engine.start(running_task(30, time_spent=900))
+    assert engine.clock.elapsed() == 30 and engine.clock.total_seconds() == 930
+    engine.stop()
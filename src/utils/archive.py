@@ -0,0 +1,213 @@
+import logging
+import os
+import threading
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import MetaData, delete, event, func, insert, select
+from sqlalchemy.engine import Connection, Engine, URL
+from src.models.category import Category, apply_category_deltas
+from src.models.task import Task, TaskSnapshot
+from src.models.task_search import create_search_index, search_query
+from src.models.task_changes import add_version_column
+from src.models.time_entry import TimeEntry, TimeRollup
+from src.utils.database import create_database_engine, is_memory_url
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_SCHEMA = "archive"
+ARCHIVE_PATH = os.environ.get("TASKFLOW_ARCHIVE_PATH")
+ARCHIVE_AFTER_DAYS = int(os.environ.get("TASKFLOW_ARCHIVE_AFTER_DAYS", "90"))
+# Tasks moved per transaction: one id chunk, under SQLite's parameter limit.
+ARCHIVE_BATCH_SIZE = 900
+
+# The archive mirrors the hot tables, qualified with the attached schema.
+archive_metadata = MetaData()
+archived_tasks = Task.__table__.to_metadata(archive_metadata, schema=ARCHIVE_SCHEMA)
+archived_time_entries = TimeEntry.__table__.to_metadata(archive_metadata, schema=ARCHIVE_SCHEMA)
+archived_time_rollups = TimeRollup.__table__.to_metadata(archive_metadata, schema=ARCHIVE_SCHEMA)
+archived_categories = Category.__table__.to_metadata(archive_metadata, schema=ARCHIVE_SCHEMA)
+
+
+def default_archive_path(url: URL) -> Optional[str]:
+    # taskflow.db -> taskflow_archive.db next to it; in-memory databases
+    # have nowhere to archive to.
+    if ARCHIVE_PATH:
+        return ARCHIVE_PATH
+    if is_memory_url(url):
+        return None
+    root, extension = os.path.splitext(url.database)
+    return f"{root}_archive{extension or '.db'}"
+
+
+def _reserve_archived_ids(connection: Connection) -> None:
+    # An archive filled before tasks.id was AUTOINCREMENT can hold ids above
+    # the hot table's sequence; new tasks start past them.
+    highest = connection.execute(select(func.max(archived_tasks.c.id))).scalar()
+    if highest is None:
+        return
+    current = connection.exec_driver_sql("SELECT seq FROM main.sqlite_sequence WHERE name = 'tasks'").scalar()
+    if current is None:
+        connection.exec_driver_sql("INSERT INTO main.sqlite_sequence (name, seq) VALUES ('tasks', ?)", (highest,))
+    elif current < highest:
+        connection.exec_driver_sql("UPDATE main.sqlite_sequence SET seq = ? WHERE name = 'tasks'", (highest,))
+
+
+# Cold storage for completed tasks in a separate SQLite file.
+#
+# The archive is only ever ATTACHed on this store's own engine, so the hot
+# path (the application's engine and sessions) never sees it. Only requests
+# that explicitly span history come through here.
+class ArchiveStore:
+    def __init__(self, database_url: URL, path: str):
+        self.database_url = database_url
+        self.path = os.path.abspath(path)
+        self._engine: Optional[Engine] = None
+        self._engine_lock = threading.Lock()
+
+    @property
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    @property
+    def engine(self) -> Engine:
+        # Shared stores are used from the writer, readers and workers at once.
+        with self._engine_lock:
+            if self._engine is None:
+                engine = create_database_engine(self.database_url)
+                event.listen(engine, "connect", self._attach)
+                with engine.begin() as connection:
+                    archive_metadata.create_all(connection)
+                    add_version_column(connection, ARCHIVE_SCHEMA)
+                    if not connection.exec_driver_sql(
+                        f"SELECT 1 FROM {ARCHIVE_SCHEMA}.sqlite_master WHERE name = 'tasks_fts'"
+                    ).first():
+                        create_search_index(connection, ARCHIVE_SCHEMA)
+                    _reserve_archived_ids(connection)
+                self._engine = engine
+            return self._engine
+
+    def _attach(self, dbapi_connection, connection_record) -> None:
+        dbapi_connection.execute(f"ATTACH DATABASE ? AS {ARCHIVE_SCHEMA}", (self.path,))
+
+    def dispose(self) -> None:
+        with self._engine_lock:
+            if self._engine is not None:
+                self._engine.dispose()
+                self._engine = None
+
+    def archive_completed(self, older_than: datetime, batch_size: int = ARCHIVE_BATCH_SIZE) -> int:
+        # Completed, stopped tasks not touched since `older_than` move with
+        # their time entries and rollups; both category indexes follow.
+        hot = Task.__table__
+        candidates = (
+            select(hot.c.id)
+            .where(hot.c.status == "Completed", hot.c.started_at.is_(None), hot.c.updated_at < older_than)
+            .order_by(hot.c.id)
+            .limit(batch_size)
+        )
+        moved = 0
+        while True:
+            with self.engine.begin() as connection:
+                task_ids = connection.execute(candidates).scalars().all()
+                if not task_ids:
+                    return moved
+                moved += self._move(connection, task_ids)
+
+    def _move(self, connection: Connection, task_ids: List[int]) -> int:
+        hot = Task.__table__
+        self._drop_archived_copies(connection, task_ids)
+        deltas: Dict[str, List[int]] = {}
+        for category, count, seconds in connection.execute(
+            select(hot.c.category, func.count(), func.coalesce(func.sum(hot.c.time_spent), 0))
+            .where(hot.c.id.in_(task_ids)).group_by(hot.c.category)
+        ):
+            deltas[category] = [count, seconds]
+
+        connection.execute(insert(archived_tasks).from_select(
+            [column.name for column in hot.c], select(*hot.c).where(hot.c.id.in_(task_ids))
+        ))
+        entry_columns = [column.name for column in TimeEntry.__table__.c if column.name != "id"]
+        connection.execute(insert(archived_time_entries).from_select(
+            entry_columns,
+            select(*(TimeEntry.__table__.c[name] for name in entry_columns)).where(TimeEntry.task_id.in_(task_ids)),
+        ))
+        connection.execute(insert(archived_time_rollups).from_select(
+            [column.name for column in TimeRollup.__table__.c],
+            select(*TimeRollup.__table__.c).where(TimeRollup.task_id.in_(task_ids)),
+        ))
+        connection.execute(delete(TimeEntry).where(TimeEntry.task_id.in_(task_ids)))
+        connection.execute(delete(TimeRollup).where(TimeRollup.task_id.in_(task_ids)))
+        connection.execute(delete(hot).where(hot.c.id.in_(task_ids)))
+
+        apply_category_deltas(connection, {name: (-count, -seconds) for name, (count, seconds) in deltas.items()})
+        apply_category_deltas(connection, {name: (count, seconds) for name, (count, seconds) in deltas.items()},
+                              table=archived_categories)
+        return len(task_ids)
+
+    def _drop_archived_copies(self, connection: Connection, task_ids: List[int]) -> None:
+        # Under WAL a crash between the two files' commits can leave a task
+        # in both. Ids are never reused, so the archived row is an older copy
+        # of the same task: it goes, and the hot one is archived again.
+        deltas = {
+            category: (-count, -seconds)
+            for category, count, seconds in connection.execute(
+                select(archived_tasks.c.category, func.count(), func.coalesce(func.sum(archived_tasks.c.time_spent), 0))
+                .where(archived_tasks.c.id.in_(task_ids)).group_by(archived_tasks.c.category)
+            )
+        }
+        if not deltas:
+            return
+        logger.warning("Replacing archived copies of tasks still in the hot table")
+        connection.execute(delete(archived_time_entries).where(archived_time_entries.c.task_id.in_(task_ids)))
+        connection.execute(delete(archived_time_rollups).where(archived_time_rollups.c.task_id.in_(task_ids)))
+        connection.execute(delete(archived_tasks).where(archived_tasks.c.id.in_(task_ids)))
+        apply_category_deltas(connection, deltas, table=archived_categories)
+
+    def category_times(self) -> List[Tuple[str, int]]:
+        with self.engine.connect() as connection:
+            return [tuple(row) for row in connection.execute(
+                select(archived_categories.c.name, archived_categories.c.time_spent)
+            )]
+
+    def time_by(self, key: str, start: date, end: date, category: Optional[str] = None) -> List[Tuple]:
+        # key: "category", "day" or "task_id" over the archived rollups.
+        column = archived_time_rollups.c[key]
+        query = (select(column, func.sum(archived_time_rollups.c.seconds))
+                 .where(archived_time_rollups.c.day.between(start, end)))
+        if category is not None:
+            query = query.where(archived_time_rollups.c.category == category)
+        with self.engine.connect() as connection:
+            return [tuple(row) for row in connection.execute(query.group_by(column))]
+
+    def search(self, match_expression: str, limit: int, category: Optional[str] = None) -> List[Tuple[float, TaskSnapshot]]:
+        with self.engine.connect() as connection:
+            rows = connection.execute(search_query(match_expression, limit, category, archived_tasks)).all()
+        return [(row.rank, TaskSnapshot.from_row(row)) for row in rows]
+
+
+_shared_stores: Dict[Tuple[str, str], ArchiveStore] = {}
+_shared_stores_lock = threading.Lock()
+
+
+def shared_archive_store(database_url: URL, path: str) -> ArchiveStore:
+    # One store (engine, pool, ATTACH) per database and archive file for the
+    # whole process; controllers come and go (one per statistics refresh),
+    # the store stays.
+    key = (database_url.render_as_string(hide_password=False), os.path.abspath(path))
+    with _shared_stores_lock:
+        store = _shared_stores.get(key)
+        if store is None:
+            store = _shared_stores[key] = ArchiveStore(database_url, path)
+        return store
+
+
+def dispose_shared_archive_stores() -> None:
+    with _shared_stores_lock:
+        stores = list(_shared_stores.values())
+        _shared_stores.clear()
+    for store in stores:
+        store.dispose()
+
+
+def archive_cutoff(older_than_days: int, now: Optional[datetime] = None) -> datetime:
+    return (now or datetime.now(timezone.utc)) - timedelta(days=older_than_days)
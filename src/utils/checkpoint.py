@@ -0,0 +1,209 @@
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from typing import Callable, List, NamedTuple, Optional, Tuple
+from src.models.task import as_utc
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_PATH = "taskflow.journal"
+# Journal slots: taskflow.journal, taskflow.2.journal, ... one per running
+# instance.
+MAX_INSTANCES = 16
+CHECKPOINT_INTERVAL = int(os.environ.get("TASKFLOW_CHECKPOINT_INTERVAL", "60"))
+
+# Rewrite the journal down to its last record once it grows past this.
+MAX_JOURNAL_RECORDS = 1000
+
+HEARTBEAT = "H"
+CLEAN_SHUTDOWN = "C"
+
+
+class Checkpoint(NamedTuple):
+    kind: str
+    task_id: int
+    at: datetime
+    # The session's start, so recovery can tell it from a later session of
+    # the same task. None in records written before it was kept.
+    started_at: Optional[datetime] = None
+
+    @property
+    def is_clean_shutdown(self) -> bool:
+        return self.kind == CLEAN_SHUTDOWN
+
+
+def _try_lock(handle) -> bool:
+    try:
+        if fcntl is not None:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:
+        return False
+
+
+# Write-behind journal for the running timer.
+#
+# Heartbeats are coalesced in memory and only the latest one is appended
+# (and fsynced) once per flush interval, so a crash loses at most one
+# interval of tracked time. Records are one line each:
+# "<kind> <task_id> <epoch> <session start, ISO 8601>".
+#
+# The writing instance holds an exclusive lock on "<path>.lock" (the journal
+# itself is replaced by compact()). The OS drops it when the process dies,
+# so a journal anyone can lock was left behind by a crashed instance.
+class CheckpointJournal:
+    def __init__(self, path: Optional[str] = JOURNAL_PATH, flush_interval: float = CHECKPOINT_INTERVAL,
+                 clock: Callable[[], float] = time.monotonic):
+        # path=None: a journal that records nothing.
+        self.path = path
+        self.flush_interval = flush_interval
+        self.clock = clock
+        self.flush_count = 0
+        self._pending: Optional[Checkpoint] = None
+        self._last_flush = clock()
+        self._flushed_session: Optional[Tuple[int, Optional[datetime]]] = None
+        self._records = 0
+        self._lock = None
+
+    @property
+    def locked(self) -> bool:
+        return self._lock is not None
+
+    def acquire(self) -> bool:
+        if self._lock is not None:
+            return True
+        if self.path is None:
+            return False
+        handle = open(f"{self.path}.lock", "a")
+        if not _try_lock(handle):
+            handle.close()
+            return False
+        self._lock = handle
+        return True
+
+    def release(self) -> None:
+        # Closing the file releases the lock.
+        if self._lock is not None:
+            self._lock.close()
+            self._lock = None
+
+    def heartbeat(self, task_id: int, started_at: Optional[datetime] = None, at: Optional[datetime] = None) -> None:
+        self._pending = Checkpoint(HEARTBEAT, task_id, at or datetime.now(timezone.utc), started_at)
+        # A new session is written immediately so its start is never lost.
+        if (task_id, started_at) != self._flushed_session or self.clock() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._pending is None:
+            return
+        self._append([self._pending])
+        self._flushed_session = (self._pending.task_id, self._pending.started_at)
+        self._pending = None
+
+    def mark_clean_shutdown(self, task_id: int) -> None:
+        self._pending = None
+        self._append([Checkpoint(CLEAN_SHUTDOWN, task_id, datetime.now(timezone.utc))])
+        self._flushed_session = None
+
+    def close_session(self) -> None:
+        # The timer was stopped through the controller: nothing to recover.
+        self._pending = None
+        self._flushed_session = None
+        self.compact()
+
+    def last_checkpoint(self) -> Optional[Checkpoint]:
+        if self.path is None or not os.path.exists(self.path):
+            return None
+        last = None
+        with open(self.path, "r", encoding="utf-8") as journal:
+            for line in journal:
+                record = self._parse(line)
+                if record is not None:
+                    last = record
+        return last
+
+    def compact(self, keep_last: bool = False) -> None:
+        if self.path is None:
+            return
+        last = self.last_checkpoint() if keep_last else None
+        if last is None:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            self._records = 0
+            return
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as journal:
+            journal.write(self._format(last))
+            journal.flush()
+            os.fsync(journal.fileno())
+        os.replace(tmp_path, self.path)
+        self._records = 1
+
+    def _append(self, records: List[Checkpoint]) -> None:
+        if self.path is None:
+            return
+        with open(self.path, "a", encoding="utf-8") as journal:
+            journal.write("".join(self._format(record) for record in records))
+            journal.flush()
+            os.fsync(journal.fileno())
+        self.flush_count += 1
+        self._last_flush = self.clock()
+        self._records += len(records)
+        if self._records > MAX_JOURNAL_RECORDS:
+            self.compact(keep_last=True)
+
+    @staticmethod
+    def _format(record: Checkpoint) -> str:
+        line = f"{record.kind} {record.task_id} {record.at.timestamp():.3f}"
+        if record.started_at is not None:
+            line += f" {record.started_at.isoformat()}"
+        return line + "\n"
+
+    @staticmethod
+    def _parse(line: str) -> Optional[Checkpoint]:
+        # A torn last line after a crash is simply ignored.
+        parts = line.split()
+        if len(parts) not in (3, 4) or parts[0] not in (HEARTBEAT, CLEAN_SHUTDOWN):
+            return None
+        try:
+            started_at = as_utc(datetime.fromisoformat(parts[3])) if len(parts) == 4 else None
+            return Checkpoint(parts[0], int(parts[1]), datetime.fromtimestamp(float(parts[2]), timezone.utc),
+                              started_at)
+        except ValueError:
+            return None
+
+
+def journal_slots(path: str = JOURNAL_PATH) -> List[str]:
+    root, extension = os.path.splitext(path)
+    return [path] + [f"{root}.{number}{extension}" for number in range(2, MAX_INSTANCES + 1)]
+
+
+def claim_journal(path: str = JOURNAL_PATH, **kwargs) -> Tuple[CheckpointJournal, List[CheckpointJournal]]:
+    # This instance's journal is the first slot no live instance holds.
+    # Also returns every other unheld journal that still has records: those
+    # were left by crashed instances and are locked until released. Records
+    # already in our own slot are the same kind of leftover.
+    own: Optional[CheckpointJournal] = None
+    orphans: List[CheckpointJournal] = []
+    for slot in journal_slots(path):
+        journal = CheckpointJournal(slot, **kwargs)
+        if (own is None or os.path.exists(slot)) and journal.acquire():
+            if own is None:
+                own = journal
+            elif journal.last_checkpoint() is not None:
+                orphans.append(journal)
+            else:
+                journal.release()
+    if own is None:
+        logger.warning("All %d checkpoint journals are in use; this instance keeps none", MAX_INSTANCES)
+        own = CheckpointJournal(None, **kwargs)
+    return own, orphans
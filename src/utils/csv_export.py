@@ -0,0 +1,94 @@
+import csv
+import os
+from datetime import datetime, timezone
+from typing import Callable, Iterator, List, Optional, Sequence
+from sqlalchemy import func, select, union_all
+from sqlalchemy.engine import Connection, Engine, Row
+from src.models.task import Task, as_utc, format_duration
+from src.utils import database
+from src.utils.archive import archived_tasks, default_archive_path, shared_archive_store
+from src.utils.exceptions import ExportCancelledError
+
+CSV_FIELDNAMES = ['ID', 'Título', 'Categoría', 'Estado', 'Tiempo Empleado (segundos)', 'Tiempo Empleado (HH:MM:SS)', 'Iniciada En', 'Creada En', 'Actualizada En']
+
+EXPORT_CHUNK_SIZE = 2000
+
+# Plain columns only: rows are streamed without building Task objects.
+_EXPORT_COLUMN_NAMES = ["id", "title", "category", "status", "time_spent", "started_at", "created_at", "updated_at"]
+_EXPORT_COLUMNS = [Task.__table__.c[name] for name in _EXPORT_COLUMN_NAMES]
+
+
+def export_query(include_archived: bool = False):
+    if not include_archived:
+        return select(*_EXPORT_COLUMNS).order_by(Task.__table__.c.id)
+    # Needs a connection with the archive attached (ArchiveStore.engine).
+    hot = select(*_EXPORT_COLUMNS)
+    cold = select(*(archived_tasks.c[name] for name in _EXPORT_COLUMN_NAMES))
+    return union_all(hot, cold).order_by("id")
+
+
+def iter_task_chunks(connection: Connection, chunk_size: int = EXPORT_CHUNK_SIZE,
+                     include_archived: bool = False) -> Iterator[Sequence[Row]]:
+    result = connection.execution_options(yield_per=chunk_size).execute(export_query(include_archived))
+    yield from result.partitions()
+
+
+def format_task_row(row: Row, now: datetime) -> List:
+    time_spent = row.time_spent or 0
+    total_seconds = time_spent
+    if row.started_at is not None:
+        total_seconds += int((now - as_utc(row.started_at)).total_seconds())
+    return [
+        row.id,
+        row.title,
+        row.category,
+        row.status,
+        time_spent,
+        format_duration(total_seconds),
+        row.started_at.isoformat() if row.started_at else '',
+        row.created_at.isoformat() if row.created_at else '',
+        row.updated_at.isoformat() if row.updated_at else '',
+    ]
+
+
+def write_tasks_csv(stream, connection: Connection, chunk_size: int = EXPORT_CHUNK_SIZE,
+                    progress: Optional[Callable[[int, int], None]] = None,
+                    is_cancelled: Optional[Callable[[], bool]] = None, include_archived: bool = False) -> int:
+    total = connection.execute(select(func.count()).select_from(Task.__table__)).scalar()
+    if include_archived:
+        total += connection.execute(select(func.count()).select_from(archived_tasks)).scalar()
+    now = datetime.now(timezone.utc)
+    writer = csv.writer(stream)
+    writer.writerow(CSV_FIELDNAMES)
+    written = 0
+    for chunk in iter_task_chunks(connection, chunk_size, include_archived):
+        if is_cancelled is not None and is_cancelled():
+            raise ExportCancelledError("Export cancelled.")
+        writer.writerows(format_task_row(row, now) for row in chunk)
+        written += len(chunk)
+        if progress is not None:
+            progress(written, total)
+    return written
+
+
+# Streams every task into `path` in chunks; the file only replaces `path`
+# once the export completed, so a cancelled or failed export leaves nothing.
+# include_archived adds the archived tasks, when there is an archive.
+def export_tasks_csv(path: str, bind: Optional[Engine] = None, chunk_size: int = EXPORT_CHUNK_SIZE,
+                     progress: Optional[Callable[[int, int], None]] = None,
+                     is_cancelled: Optional[Callable[[], bool]] = None, include_archived: bool = False) -> int:
+    bind = bind or database.engine
+    archive_path = default_archive_path(bind.url) if include_archived else None
+    include_archived = archive_path is not None and os.path.exists(archive_path)
+    if include_archived:
+        bind = shared_archive_store(bind.url, archive_path).engine
+    tmp_path = f"{path}.part"
+    try:
+        with bind.connect() as connection, \
+                open(tmp_path, 'w', newline='', encoding='utf-8', buffering=1024 * 1024) as csvfile:
+            written = write_tasks_csv(csvfile, connection, chunk_size, progress, is_cancelled, include_archived)
+        os.replace(tmp_path, path)
+        return written
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
@@ -1,16 +1,295 @@
-
-from sqlalchemy import create_engine
+import itertools
+import logging
+import os
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Union
+from weakref import WeakKeyDictionary
+from sqlalchemy import create_engine, event, select, func
+from sqlalchemy.engine import Connection, Engine, URL, make_url
 from sqlalchemy.orm import sessionmaker
-from src.models.task import Base
+from sqlalchemy.pool import QueuePool
+from src.models.task import Base, Task
+from src.models.category import Category, rebuild_category_index
+# Registers the time tracking tables on Base.metadata.
+import src.models.time_entry  # noqa: F401
+from src.models.task_search import SEARCH_INDEX_DDL, create_search_index
+from src.models.task_changes import CHANGE_LOG_DDL, create_change_log, prune_change_log
+from src.utils.instrumentation import ENABLED as INSTRUMENTATION_ENABLED, instrument_engine
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DATABASE_URL = "sqlite:///taskflow.db"
+DATABASE_URL = os.environ.get("TASKFLOW_DATABASE_URL", DEFAULT_DATABASE_URL)
+DATABASE_PROFILE = os.environ.get("TASKFLOW_DB_PROFILE", "desktop")
+# Named and shared-cache, so every pooled connection of one engine opens the
+# same database, each with its own transactions.
+MEMORY_URL = "sqlite:///file:taskflow_mem?mode=memory&cache=shared&uri=true"
+
+# Per-connection SQLite settings plus the pool size, picked by name.
+@dataclass(frozen=True)
+class EngineProfile:
+    name: str
+    journal_mode: str = "WAL"
+    # NORMAL under WAL only syncs at checkpoints: a crash may lose the last
+    # commits but never corrupts the database.
+    synchronous: str = "NORMAL"
+    # Negative sizes are KiB: 16 MiB of page cache per connection.
+    cache_size: int = -16384
+    mmap_size: int = 64 * 1024 * 1024
+    temp_store: str = "MEMORY"
+    # How long to wait for another instance's write lock before failing.
+    busy_timeout: int = 5000
+    pool_size: int = 5
+    in_memory: bool = False
+
+    def pragmas(self) -> Dict[str, Any]:
+        # busy_timeout first: switching to WAL may itself wait for a lock.
+        return {
+            "busy_timeout": self.busy_timeout,
+            "journal_mode": self.journal_mode,
+            "synchronous": self.synchronous,
+            "cache_size": self.cache_size,
+            "mmap_size": self.mmap_size,
+            "temp_store": self.temp_store,
+        }
+
+PROFILES: Dict[str, EngineProfile] = {
+    "desktop": EngineProfile("desktop"),
+    # The pre-WAL behaviour, for folders where WAL's shared memory file
+    # doesn't work (network drives).
+    "safe": EngineProfile("safe", journal_mode="DELETE", synchronous="FULL", mmap_size=0),
+    # Throwaway data (benchmarks, scratch imports): durability off.
+    "bulk": EngineProfile("bulk", synchronous="OFF", cache_size=-65536, mmap_size=256 * 1024 * 1024),
+    # One private in-memory database per engine, shared by its sessions.
+    "memory": EngineProfile("memory", journal_mode="MEMORY", synchronous="OFF", mmap_size=0, in_memory=True),
+}
+
+_engine_profiles: "WeakKeyDictionary[Engine, EngineProfile]" = WeakKeyDictionary()
+# An in-memory database is dropped when its last connection closes; the
+# engine keeps one open outside the pool for as long as it lives.
+_memory_keepers: "WeakKeyDictionary[Engine, Any]" = WeakKeyDictionary()
+_memory_names = itertools.count(1)
+
+def get_profile(name: Union[str, EngineProfile, None] = None) -> EngineProfile:
+    if isinstance(name, EngineProfile):
+        return name
+    name = name or DATABASE_PROFILE
+    if name not in PROFILES:
+        logger.warning("Unknown database profile '%s', using 'desktop'", name)
+        return PROFILES["desktop"]
+    return PROFILES[name]
+
+def is_memory_url(url: URL) -> bool:
+    return not url.database or url.database == ":memory:" or url.query.get("mode") == "memory"
+
+def _shared_memory_url(url: URL) -> URL:
+    # sqlite:// and :memory: get a name of their own; a named memory URI is
+    # kept, so a second engine on it (the archive's) sees the same data.
+    if url.query.get("mode") == "memory":
+        return url
+    return make_url(MEMORY_URL).set(database=f"file:taskflow_mem_{next(_memory_names)}")
+
+def configure_engine(bind: Engine, profile: Union[str, EngineProfile, None] = None) -> Engine:
+    # Applies the profile's pragmas to every connection the engine opens.
+    profile = get_profile(profile)
+    pragmas = profile.pragmas()
+
+    def apply_pragmas(dbapi_connection, connection_record):
+        for name, value in pragmas.items():
+            dbapi_connection.execute(f"PRAGMA {name} = {value}")
+
+    event.listen(bind, "connect", apply_pragmas)
+    _engine_profiles[bind] = profile
+    if INSTRUMENTATION_ENABLED:
+        instrument_engine(bind)
+    return bind
+
+def create_database_engine(url: Union[str, URL, None] = None,
+                           profile: Union[str, EngineProfile, None] = None) -> Engine:
+    # The URL defaults to TASKFLOW_DATABASE_URL (a fresh in-memory database
+    # for the memory profile) and the profile to TASKFLOW_DB_PROFILE.
+    profile = get_profile(profile)
+    url = make_url(url or ("sqlite://" if profile.in_memory else DATABASE_URL))
+    memory = is_memory_url(url)
+    if memory:
+        url = _shared_memory_url(url)
+    bind = create_engine(url, poolclass=QueuePool, pool_size=profile.pool_size, max_overflow=10,
+                         connect_args={"check_same_thread": False})
+    configure_engine(bind, profile)
+    if memory:
+        cargs, cparams = bind.dialect.create_connect_args(bind.url)
+        _memory_keepers[bind] = bind.dialect.connect(*cargs, **cparams)
+    return bind
+
+# Numeric pragma values read back as the names they were set with.
+_PRAGMA_VALUE_NAMES = {
+    "synchronous": ("OFF", "NORMAL", "FULL", "EXTRA"),
+    "temp_store": ("DEFAULT", "FILE", "MEMORY"),
+}
+
+def get_engine_settings(bind: Optional[Engine] = None) -> Dict[str, Any]:
+    # What a connection actually runs with, read back from SQLite.
+    bind = bind or engine
+    profile = _engine_profiles.get(bind)
+    names = list((profile or PROFILES["desktop"]).pragmas())
+    with bind.connect() as connection:
+        pragmas = {name: connection.exec_driver_sql(f"PRAGMA {name}").scalar() for name in names}
+    for name, labels in _PRAGMA_VALUE_NAMES.items():
+        if isinstance(pragmas.get(name), int) and 0 <= pragmas[name] < len(labels):
+            pragmas[name] = labels[pragmas[name]]
+    return {
+        "url": bind.url.render_as_string(hide_password=True),
+        "profile": profile.name if profile else None,
+        "pool": type(bind.pool).__name__,
+        "pool_size": bind.pool.size() if isinstance(bind.pool, QueuePool) else 1,
+        "pragmas": pragmas,
+    }
+
+engine = create_database_engine()
+
+# Objects stay loaded after commit: the controller already holds every value
+# it wrote, so reloading them would only cost another SELECT per write.
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+# Every migration must be idempotent: a fresh database gets the current
+# table definitions from the first step and then runs the rest on top.
+# Later steps spell out their own DDL, so what a step does never changes
+# with the models.
+def _create_initial_schema(connection: Connection) -> None:
+    Base.metadata.create_all(bind=connection, tables=[Task.__table__, Category.__table__])
+
+def _backfill_category_index(connection: Connection) -> None:
+    index_empty = connection.execute(select(func.count()).select_from(Category.__table__)).scalar() == 0
+    if index_empty and connection.execute(select(Task.id).limit(1)).first() is not None:
+        rebuild_category_index(connection)
+
+def _execute_all(statements: List[str]) -> Callable[[Connection], None]:
+    def step(connection: Connection) -> None:
+        for statement in statements:
+            connection.exec_driver_sql(statement)
+    return step
+
+_TASK_FILTER_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS ix_tasks_category_status ON tasks (category, status)",
+    "CREATE INDEX IF NOT EXISTS ix_tasks_updated_at ON tasks (updated_at)",
+    "CREATE INDEX IF NOT EXISTS ix_tasks_running ON tasks (started_at) WHERE started_at IS NOT NULL",
+]
+
+_TIME_TRACKING_TABLES = [
+    """
+    CREATE TABLE IF NOT EXISTS time_entries (
+        id INTEGER NOT NULL,
+        task_id INTEGER NOT NULL,
+        category VARCHAR NOT NULL,
+        started_at DATETIME NOT NULL,
+        ended_at DATETIME NOT NULL,
+        seconds INTEGER NOT NULL,
+        PRIMARY KEY (id),
+        FOREIGN KEY(task_id) REFERENCES tasks (id)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_time_entries_started_at ON time_entries (started_at)",
+    "CREATE INDEX IF NOT EXISTS ix_time_entries_task_id ON time_entries (task_id)",
+    """
+    CREATE TABLE IF NOT EXISTS time_rollups (
+        day DATE NOT NULL,
+        task_id INTEGER NOT NULL,
+        category VARCHAR NOT NULL,
+        seconds INTEGER NOT NULL,
+        PRIMARY KEY (day, task_id)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_time_rollups_category_day ON time_rollups (category, day)",
+]
+
+# Keyset pagination: (category, id) and (title, id) orderings.
+_TASK_PAGE_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS ix_tasks_category_id ON tasks (category, id)",
+    "CREATE INDEX IF NOT EXISTS ix_tasks_title ON tasks (title, id)",
+]
+
+# Filter sorts: (time_spent, id) and (created_at, id).
+_TASK_SORT_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS ix_tasks_time_spent ON tasks (time_spent, id)",
+    "CREATE INDEX IF NOT EXISTS ix_tasks_created_at ON tasks (created_at, id)",
+]
+
+# tasks without AUTOINCREMENT, as every step before this one left it; only
+# the table definition changes.
+_TASKS_AUTOINCREMENT_DDL = """
+    CREATE TABLE tasks_autoincrement (
+        id INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT,
+        title VARCHAR NOT NULL,
+        category VARCHAR,
+        status VARCHAR,
+        time_spent INTEGER,
+        started_at DATETIME,
+        created_at DATETIME,
+        updated_at DATETIME,
+        version INTEGER DEFAULT '1' NOT NULL
+    )
+"""
+_TASK_COLUMNS = "id, title, category, status, time_spent, started_at, created_at, updated_at, version"
+
+def _make_task_ids_autoincrement(connection: Connection) -> None:
+    # Plain rowids come back once the highest rows are archived or deleted.
+    # SQLite can't add AUTOINCREMENT in place: copy into a new table (ids
+    # kept, which also seeds sqlite_sequence), swap it in, and recreate the
+    # indexes and triggers that went with the old one.
+    sql = connection.exec_driver_sql("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'tasks'").scalar()
+    if "AUTOINCREMENT" in sql.upper():
+        return
+    connection.exec_driver_sql(_TASKS_AUTOINCREMENT_DDL)
+    connection.exec_driver_sql(f"INSERT INTO tasks_autoincrement ({_TASK_COLUMNS}) SELECT {_TASK_COLUMNS} FROM tasks")
+    connection.exec_driver_sql("DROP TABLE tasks")
+    connection.exec_driver_sql("ALTER TABLE tasks_autoincrement RENAME TO tasks")
+    for statement in _TASK_FILTER_INDEXES + _TASK_PAGE_INDEXES + _TASK_SORT_INDEXES:
+        connection.exec_driver_sql(statement)
+    # Ids are unchanged, so the FTS index still matches; only its triggers
+    # (and the change log's) are gone.
+    for statement in SEARCH_INDEX_DDL[1:] + CHANGE_LOG_DDL:
+        connection.exec_driver_sql(statement.format(prefix=""))
+
+MIGRATIONS: List[Callable[[Connection], None]] = [
+    _create_initial_schema,
+    _backfill_category_index,
+    _execute_all(_TASK_FILTER_INDEXES),
+    _execute_all(_TIME_TRACKING_TABLES),
+    _execute_all(_TASK_PAGE_INDEXES),
+    create_search_index,
+    # Optimistic locking and the cross-instance change feed.
+    create_change_log,
+    _execute_all(_TASK_SORT_INDEXES),
+    # Archived ids are never reused.
+    _make_task_ids_autoincrement,
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
 
-DATABASE_URL = "sqlite:///taskflow.db"
+def get_schema_version(connection: Connection) -> int:
+    return connection.exec_driver_sql("PRAGMA user_version").scalar()
 
-engine = create_engine(DATABASE_URL, echo=False)
+def migrate(bind: Engine = None) -> int:
+    bind = bind or engine
+    with bind.begin() as connection:
+        version = get_schema_version(connection)
+        for number in range(version + 1, SCHEMA_VERSION + 1):
+            MIGRATIONS[number - 1](connection)
+            connection.exec_driver_sql(f"PRAGMA user_version = {number}")
+    return version
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def explain_query_plan(connection: Connection, statement) -> List[str]:
+    # render_postcompile expands IN lists into one placeholder per value.
+    compiled = statement.compile(dialect=connection.dialect, compile_kwargs={"render_postcompile": True})
+    params = tuple(compiled.params[name] for name in compiled.positiontup)
+    rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params).all()
+    return [row[-1] for row in rows]
 
 def create_tables():
-    Base.metadata.create_all(bind=engine)
+    migrate(engine)
+    # Startup is the one moment no reader of this instance is behind.
+    with engine.begin() as connection:
+        prune_change_log(connection)
 
 def get_db_session():
     return SessionLocal()
@@ -10,3 +10,9 @@ class TaskValidationError(TaskFlowError):
 
 class DatabaseError(TaskFlowError):
     pass
+
+class ExportCancelledError(TaskFlowError):
+    pass
+
+class ConcurrentModificationError(TaskFlowError):
+    pass
@@ -0,0 +1,85 @@
+import csv
+import json
+import os
+import time
+from datetime import datetime
+from typing import Dict, Iterator, NamedTuple, Optional
+from src.utils.csv_export import CSV_FIELDNAMES
+from src.utils.exceptions import TaskValidationError
+
+# Export headers -> bulk_create_tasks fields. JSONL lines may use either.
+CSV_COLUMN_FIELDS = {
+    'Título': 'title',
+    'Categoría': 'category',
+    'Estado': 'status',
+    'Tiempo Empleado (segundos)': 'time_spent',
+    'Creada En': 'created_at',
+    'Actualizada En': 'updated_at',
+}
+
+JSONL_EXTENSIONS = ('.jsonl', '.ndjson')
+
+# Rows per transaction when the GUI imports through the shared writer:
+# each chunk commits on its own, so queued timer and checkpoint writes run
+# between chunks instead of waiting out (and timing out on) one long import.
+IMPORT_CHUNK_ROWS = 5000
+
+
+class ImportResult(NamedTuple):
+    rows: int
+    seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else float(self.rows)
+
+
+def _normalize(record: Dict, line: int) -> Dict:
+    row = {'_line': line}
+    for key, value in record.items():
+        field = CSV_COLUMN_FIELDS.get(key, key)
+        if field not in CSV_COLUMN_FIELDS.values() or value in ('', None):
+            continue
+        if field in ('created_at', 'updated_at') and isinstance(value, str):
+            try:
+                value = datetime.fromisoformat(value)
+            except ValueError:
+                raise TaskValidationError(f"Line {line}: invalid date '{value}' for {field}.")
+        row[field] = value
+    return row
+
+
+def read_csv_rows(path: str) -> Iterator[Dict]:
+    with open(path, newline='', encoding='utf-8') as csvfile:
+        reader = csv.DictReader(csvfile)
+        if reader.fieldnames is None or 'Título' not in reader.fieldnames:
+            raise TaskValidationError(f"{path} does not use the TaskFlow CSV layout: {', '.join(CSV_FIELDNAMES)}")
+        for line, record in enumerate(reader, start=2):
+            yield _normalize(record, line)
+
+
+def read_jsonl_rows(path: str) -> Iterator[Dict]:
+    with open(path, encoding='utf-8') as jsonlfile:
+        for line, text in enumerate(jsonlfile, start=1):
+            if not text.strip():
+                continue
+            try:
+                record = json.loads(text)
+            except ValueError as e:
+                raise TaskValidationError(f"Line {line}: invalid JSON ({e}).")
+            if not isinstance(record, dict):
+                raise TaskValidationError(f"Line {line}: expected a JSON object.")
+            yield _normalize(record, line)
+
+
+def read_task_rows(path: str) -> Iterator[Dict]:
+    if os.path.splitext(path)[1].lower() in JSONL_EXTENSIONS:
+        return read_jsonl_rows(path)
+    return read_csv_rows(path)
+
+
+def import_tasks_file(task_controller, path: str, batch_size: Optional[int] = None) -> ImportResult:
+    started = time.perf_counter()
+    kwargs = {} if batch_size is None else {'batch_size': batch_size}
+    rows = task_controller.bulk_create_tasks(read_task_rows(path), **kwargs)
+    return ImportResult(rows, time.perf_counter() - started)
@@ -0,0 +1,204 @@
+import functools
+import inspect
+import json
+import logging
+import os
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Callable, Deque, Dict, List, NamedTuple, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+ENABLED = os.environ.get("TASKFLOW_INSTRUMENTATION", "1") != "0"
+SLOW_QUERY_MS = float(os.environ.get("TASKFLOW_SLOW_QUERY_MS", "100"))
+SLOW_ACTION_MS = float(os.environ.get("TASKFLOW_SLOW_ACTION_MS", "200"))
+
+QUERY = "sql"
+ACTION = "ui"
+
+# Percentiles and buckets are computed over the latest samples only, so a
+# histogram reflects how the app behaves now rather than since startup.
+ROLLING_WINDOW = 1000
+BUCKET_BOUNDS_MS = (1, 5, 10, 50, 100, 500, 1000)
+SLOW_LOG_SIZE = 200
+# Statements are keyed by their normalized text; long ones are cut to keep
+# keys readable.
+STATEMENT_KEY_LENGTH = 160
+# Distinct histograms per kind; later names share OTHER_KEY, so text that
+# still varies can't grow the table for the life of the process.
+MAX_HISTOGRAMS = 200
+OTHER_KEY = "(other)"
+
+_LITERAL = r"(?:\?|'(?:[^']|'')*'|-?\d+(?:\.\d+)?)"
+# IN lists (expanded parameters or inlined values) of any length.
+_IN_LIST = re.compile(rf"\bIN \(\s*{_LITERAL}(?:\s*,\s*{_LITERAL})*\s*\)", re.IGNORECASE)
+# Multi-row VALUES: the first row stands for all of them.
+_VALUES_ROWS = re.compile(r"\bVALUES\s*(\([^()]*\))(?:\s*,\s*\([^()]*\))+", re.IGNORECASE)
+_PAGING = re.compile(r"\b(LIMIT|OFFSET)\s+\d+", re.IGNORECASE)
+
+
+class SlowOperation(NamedTuple):
+    kind: str
+    name: str
+    milliseconds: float
+    at: datetime
+
+
+class Histogram:
+    def __init__(self, window: int = ROLLING_WINDOW):
+        self.samples: Deque[float] = deque(maxlen=window)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, milliseconds: float) -> None:
+        self.samples.append(milliseconds)
+        self.count += 1
+        self.total_ms += milliseconds
+        self.max_ms = max(self.max_ms, milliseconds)
+
+    def percentile(self, fraction: float) -> float:
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+    def buckets(self) -> List[int]:
+        # counts[i] holds samples <= BUCKET_BOUNDS_MS[i]; the last is overflow.
+        counts = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+        for sample in self.samples:
+            counts[bisect_left(BUCKET_BOUNDS_MS, sample)] += 1
+        return counts
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "mean_ms": self.total_ms / self.count if self.count else 0.0,
+            "p50_ms": self.percentile(0.5),
+            "p90_ms": self.percentile(0.9),
+            "p99_ms": self.percentile(0.99),
+            "max_ms": self.max_ms,
+            "buckets": self.buckets(),
+        }
+
+
+# Collects statement and UI-action timings from any thread (workers run
+# their own queries), plus a bounded log of operations over the thresholds.
+class Instrumentation:
+    def __init__(self, slow_query_ms: float = SLOW_QUERY_MS, slow_action_ms: float = SLOW_ACTION_MS):
+        self.thresholds_ms = {QUERY: slow_query_ms, ACTION: slow_action_ms}
+        self.histograms: Dict[str, Dict[str, Histogram]] = {QUERY: {}, ACTION: {}}
+        self.slow_log: Deque[SlowOperation] = deque(maxlen=SLOW_LOG_SIZE)
+        self._lock = threading.Lock()
+
+    def record(self, kind: str, name: str, seconds: float) -> None:
+        milliseconds = seconds * 1000
+        with self._lock:
+            histograms = self.histograms[kind]
+            histogram = histograms.get(name)
+            if histogram is None:
+                key = name if len(histograms) < MAX_HISTOGRAMS else OTHER_KEY
+                histogram = histograms.get(key)
+                if histogram is None:
+                    histogram = histograms[key] = Histogram()
+            histogram.add(milliseconds)
+            slow = milliseconds >= self.thresholds_ms[kind]
+            if slow:
+                self.slow_log.append(SlowOperation(kind, name, milliseconds, datetime.now(timezone.utc)))
+        if slow:
+            logger.warning("Slow %s (%.1f ms): %s", kind, milliseconds, name)
+
+    @contextmanager
+    def span(self, name: str, kind: str = ACTION):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(kind, name, time.perf_counter() - started)
+
+    def reset(self) -> None:
+        with self._lock:
+            for histograms in self.histograms.values():
+                histograms.clear()
+            self.slow_log.clear()
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {
+                "generated_at": datetime.now(timezone.utc).isoformat(),
+                "thresholds_ms": dict(self.thresholds_ms),
+                "bucket_bounds_ms": list(BUCKET_BOUNDS_MS),
+                "queries": {name: histogram.to_dict() for name, histogram in self.histograms[QUERY].items()},
+                "actions": {name: histogram.to_dict() for name, histogram in self.histograms[ACTION].items()},
+                "slow_log": [
+                    {"kind": entry.kind, "name": entry.name, "ms": entry.milliseconds, "at": entry.at.isoformat()}
+                    for entry in self.slow_log
+                ],
+            }
+
+    def dump_json(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as output:
+            json.dump(self.to_dict(), output, indent=2, ensure_ascii=False)
+
+
+instrumentation = Instrumentation()
+
+
+def statement_key(statement: str) -> str:
+    text = " ".join(statement.split())
+    text = _IN_LIST.sub("IN (...)", text)
+    text = _VALUES_ROWS.sub(r"VALUES \1", text)
+    text = _PAGING.sub(r"\1 ?", text)
+    return text[:STATEMENT_KEY_LENGTH]
+
+
+def instrument_engine(engine: Engine, target: Instrumentation = instrumentation) -> None:
+    # Start times are stacked per connection: cursor executes don't nest,
+    # but a stack keeps a failed statement from skewing the next one.
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("instrumentation_started", []).append(time.perf_counter())
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["instrumentation_started"].pop()
+        target.record(QUERY, statement_key(statement), time.perf_counter() - started)
+
+    def handle_error(exception_context):
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("instrumentation_started"):
+            connection.info["instrumentation_started"].pop()
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", after_cursor_execute)
+    event.listen(engine, "handle_error", handle_error)
+
+
+def timed(name: Optional[str] = None, target: Instrumentation = instrumentation) -> Callable:
+    # Wraps a method in an ACTION span. Qt hands slots the signal's own
+    # arguments (clicked's `checked`, for one), so only as many positional
+    # arguments as the method declares are passed on.
+    def decorator(function):
+        if not ENABLED:
+            return function
+        span_name = name or function.__name__
+        parameters = inspect.signature(function).parameters.values()
+        if any(parameter.kind == parameter.VAR_POSITIONAL for parameter in parameters):
+            max_args = None
+        else:
+            max_args = sum(parameter.kind in (parameter.POSITIONAL_ONLY, parameter.POSITIONAL_OR_KEYWORD)
+                           for parameter in parameters)
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if max_args is not None:
+                args = args[:max_args]
+            with target.span(span_name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
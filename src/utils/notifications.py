@@ -0,0 +1,229 @@
+import heapq
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime, timezone
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+RULES_PATH = os.environ.get("TASKFLOW_NOTIFICATION_RULES", "notifications.json")
+
+# Dispatcher limits: at most one notification per interval, and the same
+# key is never shown twice within the de-duplication window.
+MIN_DISPATCH_INTERVAL = 5.0
+DEDUP_WINDOW = 10 * 60
+
+POMODORO = "pomodoro"
+BUDGET = "budget"
+IDLE = "idle"
+
+
+@dataclass(frozen=True)
+class CategoryRule:
+    pomodoro_minutes: Optional[int] = 25
+    daily_budget_minutes: Optional[int] = None
+
+
+# Notification settings, optionally loaded from a JSON file:
+#
+#     {"default": {"pomodoro_minutes": 25},
+#      "categories": {"Trabajo": {"pomodoro_minutes": 50, "daily_budget_minutes": 480}},
+#      "idle_minutes": 30}
+@dataclass(frozen=True)
+class NotificationRules:
+    default: CategoryRule = CategoryRule()
+    categories: Dict[str, CategoryRule] = field(default_factory=dict)
+    idle_minutes: Optional[int] = None
+
+    def for_category(self, category: str) -> CategoryRule:
+        return self.categories.get(category, self.default)
+
+
+def load_rules(path: str = RULES_PATH) -> NotificationRules:
+    if not os.path.exists(path):
+        return NotificationRules()
+    try:
+        with open(path, "r", encoding="utf-8") as source:
+            config = json.load(source)
+        default = CategoryRule(**config.get("default", {}))
+        return NotificationRules(
+            default=default,
+            categories={name: CategoryRule(**{**asdict(default), **rule})
+                        for name, rule in config.get("categories", {}).items()},
+            idle_minutes=config.get("idle_minutes"),
+        )
+    except (OSError, ValueError, TypeError) as e:
+        logger.warning("Ignoring notification rules in %s: %s", path, e)
+        return NotificationRules()
+
+
+class Notification(NamedTuple):
+    key: str
+    title: str
+    message: str
+
+
+class _Deadline(NamedTuple):
+    due: float
+    sequence: int
+    generation: int
+    kind: str
+
+
+# Upcoming deadlines of the current session in a min-heap; each tick only
+# pops the ones that are due. Starting or stopping a session bumps the
+# generation, which retires every older entry without touching the heap.
+class NotificationScheduler:
+    def __init__(self, rules: NotificationRules = None, clock: Callable[[], float] = time.monotonic,
+                 today: Callable[[], date] = lambda: datetime.now(timezone.utc).date()):
+        self.rules = rules or NotificationRules()
+        self.clock = clock
+        self.today = today
+        self.task_id: Optional[int] = None
+        self._heap: List[_Deadline] = []
+        self._sequence = 0
+        self._generation = 0
+        self._session: Dict = {}
+        self._budget_notified: set = set()
+
+    def session_started(self, task_id: int, title: str, category: str,
+                        elapsed: float = 0.0, spent_today: int = 0) -> None:
+        # spent_today: seconds already tracked today in the category, not
+        # counting this session's `elapsed`.
+        self._new_generation()
+        now = self.clock()
+        rule = self.rules.for_category(category)
+        self.task_id = task_id
+        self._session = {"title": title, "category": category, "started": now - elapsed, "pomodoros": 0}
+        if rule.pomodoro_minutes:
+            period = rule.pomodoro_minutes * 60
+            self._session["pomodoros"] = int(elapsed // period)
+            self._push(now + period - elapsed % period, POMODORO)
+        if rule.daily_budget_minutes and (category, self.today()) not in self._budget_notified:
+            remaining = rule.daily_budget_minutes * 60 - spent_today - elapsed
+            self._push(now + max(remaining, 0), BUDGET)
+
+    def session_stopped(self) -> None:
+        self._new_generation()
+        self.task_id = None
+        self._session = {"started": self.clock(), "reminders": 0}
+        if self.rules.idle_minutes:
+            self._push(self.clock() + self.rules.idle_minutes * 60, IDLE)
+
+    def next_due_in(self) -> Optional[float]:
+        self._drop_stale()
+        if not self._heap:
+            return None
+        return max(self._heap[0].due - self.clock(), 0.0)
+
+    def due(self) -> List[Notification]:
+        now = self.clock()
+        notifications = []
+        while True:
+            self._drop_stale()
+            if not self._heap or self._heap[0].due > now:
+                return notifications
+            deadline = heapq.heappop(self._heap)
+            notifications.append(self._fire(deadline, now))
+
+    def _fire(self, deadline: _Deadline, now: float) -> Notification:
+        session = self._session
+        if deadline.kind == POMODORO:
+            period = self.rules.for_category(session["category"]).pomodoro_minutes * 60
+            session["pomodoros"] += 1
+            self._push(deadline.due + period, POMODORO)
+            minutes = session["pomodoros"] * period // 60
+            return Notification(f"{POMODORO}:{self.task_id}:{session['pomodoros']}",
+                                "TaskFlow - ¡Descanso Pomodoro!",
+                                f'¡Has trabajado en "{session["title"]}" por {minutes} minutos! Tómate un descanso.')
+        if deadline.kind == BUDGET:
+            category = session["category"]
+            self._budget_notified.add((category, self.today()))
+            budget = self.rules.for_category(category).daily_budget_minutes
+            return Notification(f"{BUDGET}:{category}:{self.today().isoformat()}",
+                                "TaskFlow - Presupuesto diario",
+                                f'Has alcanzado los {budget} minutos diarios de "{category}".')
+        session["reminders"] += 1
+        self._push(deadline.due + self.rules.idle_minutes * 60, IDLE)
+        minutes = session["reminders"] * self.rules.idle_minutes
+        return Notification(f"{IDLE}:{self._generation}:{session['reminders']}",
+                            "TaskFlow - Sin tarea activa",
+                            f"Llevas {minutes} minutos sin ninguna tarea en marcha.")
+
+    def _push(self, due: float, kind: str) -> None:
+        self._sequence += 1
+        heapq.heappush(self._heap, _Deadline(due, self._sequence, self._generation, kind))
+
+    def _new_generation(self) -> None:
+        self._generation += 1
+        self._drop_stale()
+
+    def _drop_stale(self) -> None:
+        while self._heap and self._heap[0].generation != self._generation:
+            heapq.heappop(self._heap)
+
+
+def plyer_backend(notification: Notification) -> None:
+    # Imported on the dispatcher thread, the first time something is shown.
+    from plyer import notification as desktop
+    desktop.notify(title=notification.title, message=notification.message, app_name="TaskFlow", timeout=10)
+
+
+# Shows notifications from a background thread so a slow desktop backend
+# never stalls the GUI. send() only enqueues.
+class NotificationDispatcher:
+    def __init__(self, backend: Callable[[Notification], None] = plyer_backend,
+                 min_interval: float = MIN_DISPATCH_INTERVAL, dedup_window: float = DEDUP_WINDOW,
+                 clock: Callable[[], float] = time.monotonic):
+        self.backend = backend
+        self.min_interval = min_interval
+        self.dedup_window = dedup_window
+        self.clock = clock
+        self.sent = 0
+        self.dropped = 0
+        self._queue: "queue.Queue[Optional[Notification]]" = queue.Queue()
+        self._recent: Dict[str, float] = {}
+        self._last_sent: Optional[float] = None
+        self._stopping = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="taskflow-notifier", daemon=True)
+        self._thread.start()
+
+    def send(self, notification: Notification) -> None:
+        self._queue.put(notification)
+
+    def close(self, timeout: float = 2.0) -> None:
+        self._stopping.set()
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while True:
+            notification = self._queue.get()
+            if notification is None:
+                return
+            if self._is_duplicate(notification):
+                self.dropped += 1
+                continue
+            if self._last_sent is not None:
+                wait = self.min_interval - (self.clock() - self._last_sent)
+                if wait > 0 and self._stopping.wait(wait):
+                    return
+            try:
+                self.backend(notification)
+                self.sent += 1
+            except Exception as e:
+                logger.warning("Could not show notification %s: %s", notification.key, e)
+            self._last_sent = self.clock()
+
+    def _is_duplicate(self, notification: Notification) -> bool:
+        now = self.clock()
+        self._recent = {key: at for key, at in self._recent.items() if now - at < self.dedup_window}
+        if notification.key in self._recent:
+            return True
+        self._recent[notification.key] = now
+        return False
@@ -0,0 +1,52 @@
+import math
+import time
+from datetime import datetime, timezone
+from typing import Callable, Optional
+from src.models.task import as_utc
+
+
+# Elapsed time of the running session, anchored to the monotonic clock.
+#
+# The wall-clock start (as stored in the database) is read once when the
+# session is attached; after that only time.monotonic() is consulted, so
+# NTP steps or DST changes can't make the timer jump or run backwards.
+class SessionClock:
+    def __init__(self, monotonic: Callable[[], float] = time.monotonic,
+                 wall: Callable[[], datetime] = lambda: datetime.now(timezone.utc)):
+        self.monotonic = monotonic
+        self.wall = wall
+        self.task_id: Optional[int] = None
+        self.started_at: Optional[datetime] = None
+        self.base_seconds = 0
+        self._anchor: Optional[float] = None
+
+    @property
+    def running(self) -> bool:
+        return self._anchor is not None
+
+    def start(self, task_id: int, started_at: datetime, base_seconds: int = 0) -> None:
+        already_elapsed = max((self.wall() - as_utc(started_at)).total_seconds(), 0.0)
+        self.task_id = task_id
+        self.started_at = as_utc(started_at)
+        self.base_seconds = base_seconds
+        self._anchor = self.monotonic() - already_elapsed
+
+    def stop(self) -> None:
+        self.task_id = None
+        self.started_at = None
+        self.base_seconds = 0
+        self._anchor = None
+
+    def elapsed(self) -> float:
+        # Seconds in the current session (0 when idle).
+        if self._anchor is None:
+            return 0.0
+        return self.monotonic() - self._anchor
+
+    def total_seconds(self, elapsed: Optional[float] = None) -> int:
+        return self.base_seconds + int(self.elapsed() if elapsed is None else elapsed)
+
+    @staticmethod
+    def seconds_until_next(elapsed: float, period: float) -> float:
+        # Time left until elapsed next crosses a multiple of period.
+        return (math.floor(elapsed / period) + 1) * period - elapsed
@@ -0,0 +1,45 @@
+import sys
+import time
+from contextlib import contextmanager
+from typing import Callable, List, Tuple
+
+
+# Collects wall-clock timings of named startup phases.
+class StartupProfiler:
+    def __init__(self, enabled: bool = True, clock: Callable[[], float] = time.perf_counter):
+        self.enabled = enabled
+        self.clock = clock
+        self.started_at = clock()
+        self.phases: List[Tuple[str, float]] = []
+        self._last_mark = self.started_at
+
+    @contextmanager
+    def phase(self, name: str):
+        start = self.clock()
+        try:
+            yield
+        finally:
+            end = self.clock()
+            self.phases.append((name, end - start))
+            self._last_mark = end
+
+    def mark(self, name: str) -> None:
+        # Records the time elapsed since the previous phase or mark.
+        now = self.clock()
+        self.phases.append((name, now - self._last_mark))
+        self._last_mark = now
+
+    @property
+    def total(self) -> float:
+        return self._last_mark - self.started_at
+
+    def report(self) -> str:
+        lines = ["Startup profile:"]
+        for name, seconds in self.phases:
+            lines.append(f"  {name:<12} {seconds * 1000:8.1f} ms")
+        lines.append(f"  {'total':<12} {self.total * 1000:8.1f} ms")
+        return "\n".join(lines)
+
+    def print_report(self, stream=None) -> None:
+        if self.enabled:
+            print(self.report(), file=stream or sys.stderr)
@@ -0,0 +1,54 @@
+import importlib.util
+import os
+
+from PyQt5.QtWidgets import QWidget
+
+UI_DIR = os.path.join(os.path.dirname(__file__), "..", "ui")
+CACHE_DIR = os.path.join(UI_DIR, "__pycache__")
+
+
+def compiled_ui_path(ui_name: str) -> str:
+    return os.path.join(CACHE_DIR, f"{ui_name}_ui.py")
+
+
+def compile_ui(ui_name: str) -> str:
+    # uic is only imported when a .ui file actually changed.
+    from PyQt5 import uic
+
+    ui_path = os.path.join(UI_DIR, f"{ui_name}.ui")
+    compiled_path = compiled_ui_path(ui_name)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp_path = f"{compiled_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as compiled:
+        uic.compileUi(ui_path, compiled)
+    os.replace(tmp_path, compiled_path)
+    return compiled_path
+
+
+def is_compiled_ui_current(ui_name: str) -> bool:
+    compiled_path = compiled_ui_path(ui_name)
+    ui_path = os.path.join(UI_DIR, f"{ui_name}.ui")
+    return os.path.exists(compiled_path) and os.path.getmtime(compiled_path) >= os.path.getmtime(ui_path)
+
+
+# Builds a Designer form into `widget` from its precompiled Python module,
+# recompiling only when the .ui file is newer than the cached module. The
+# generated widgets end up as attributes of `widget`, as with uic.loadUi.
+def load_ui(widget: QWidget, ui_name: str) -> None:
+    try:
+        compiled_path = compiled_ui_path(ui_name) if is_compiled_ui_current(ui_name) else compile_ui(ui_name)
+    except OSError:
+        # Read-only install: fall back to parsing the .ui at runtime.
+        from PyQt5.uic import loadUi
+        loadUi(os.path.join(UI_DIR, f"{ui_name}.ui"), widget)
+        return
+
+    spec = importlib.util.spec_from_file_location(f"taskflow_ui_{ui_name}", compiled_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    form_class = next(value for name, value in vars(module).items() if name.startswith("Ui_"))
+
+    form = form_class()
+    form.setupUi(widget)
+    for name, value in vars(form).items():
+        setattr(widget, name, value)
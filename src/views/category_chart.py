@@ -0,0 +1,202 @@
+import hashlib
+import json
+from collections import OrderedDict
+from typing import List, Optional, Sequence, Tuple
+from PyQt5.QtCore import QBuffer, QByteArray, QIODevice, Qt
+from PyQt5.QtGui import QImage, QPixmap
+from PyQt5.QtWidgets import QLabel, QStackedLayout, QWidget
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.figure import Figure
+from src.models.task import format_duration
+
+RENDER_CACHE_SIZE = 8
+# Extra room above the tallest bar; the axis only rescales (a full redraw)
+# when a bar outgrows it or everything shrinks below half of it.
+Y_HEADROOM = 1.15
+
+CategoryTimes = Sequence[Tuple[str, int]]
+
+
+# Rendered charts as PNG bytes, keyed by chart_key (data + pixel size).
+class RenderCache:
+    def __init__(self, max_size: int = RENDER_CACHE_SIZE):
+        self.max_size = max_size
+        self._images: "OrderedDict[str, bytes]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        image = self._images.get(key)
+        if image is None:
+            self.misses += 1
+            return None
+        self._images.move_to_end(key)
+        self.hits += 1
+        return image
+
+    def put(self, key: str, image: bytes) -> None:
+        self._images[key] = image
+        self._images.move_to_end(key)
+        while len(self._images) > self.max_size:
+            self._images.popitem(last=False)
+
+    def clear(self) -> None:
+        self._images.clear()
+
+    def __len__(self) -> int:
+        return len(self._images)
+
+
+render_cache = RenderCache()
+
+
+def chart_key(category_times: CategoryTimes, width: int, height: int) -> str:
+    payload = json.dumps([[name, seconds] for name, seconds in category_times] + [width, height])
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+# Bar chart of tracked hours per category.
+#
+# The figure, bars and value labels are created once. New data with the
+# same categories only moves bar heights and label texts, redrawn by
+# blitting them over the saved background; new categories or a rescaled
+# axis cost one full draw. Every drawn state is kept in the render cache,
+# so a chart opened on data it has already drawn shows the cached PNG and
+# never builds a figure at all.
+class CategoryChart(QWidget):
+    def __init__(self, parent=None, cache: RenderCache = render_cache):
+        super().__init__(parent)
+        self.cache = cache
+        self.data: List[Tuple[str, int]] = []
+        self.figure: Optional[Figure] = None
+        self.canvas: Optional[FigureCanvas] = None
+        self.full_draws = 0
+        self.blits = 0
+        self._ax = None
+        self._bars = []
+        self._labels = []
+        self._background = None
+        self._stack = QStackedLayout(self)
+        self._image_label = QLabel()
+        self._image_label.setAlignment(Qt.AlignCenter)
+        self._stack.addWidget(self._image_label)
+
+    @property
+    def showing_cached_image(self) -> bool:
+        return self.canvas is None or self._stack.currentWidget() is self._image_label
+
+    def set_data(self, category_times: CategoryTimes) -> None:
+        category_times = [(name, int(seconds or 0)) for name, seconds in category_times]
+        if category_times == self.data and self.figure is not None:
+            return
+        self.data = category_times
+        key = chart_key(category_times, self.width(), self.height())
+        if self.figure is None:
+            image = self.cache.get(key)
+            if image is not None:
+                pixmap = QPixmap()
+                pixmap.loadFromData(image, "PNG")
+                self._image_label.setPixmap(pixmap)
+                self._stack.setCurrentWidget(self._image_label)
+                return
+            self._create_figure()
+
+        names = [name for name, _ in category_times]
+        hours = [seconds / 3600 for _, seconds in category_times]
+        if names != [bar.get_label() for bar in self._bars]:
+            self._rebuild_bars(names, hours)
+            self._full_draw()
+        elif self._rescale(hours):
+            self._move_bars(hours)
+            self._full_draw()
+        else:
+            self._move_bars(hours)
+            self._blit()
+        self._stack.setCurrentWidget(self.canvas)
+        self.cache.put(key, self._snapshot_png())
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        # A cached image is only right at the size it was drawn at.
+        if self.canvas is None and self.data and self._image_label.pixmap() is not None:
+            if self._image_label.pixmap().size() != self.size():
+                data, self.data = self.data, []
+                self._create_figure()
+                self.set_data(data)
+
+    def _create_figure(self) -> None:
+        self.figure = Figure(figsize=(max(self.width(), 1) / 100, max(self.height(), 1) / 100), dpi=100,
+                             layout="tight")
+        self.canvas = FigureCanvas(self.figure)
+        self.canvas.resize(self.size())
+        self._ax = self.figure.add_subplot(111)
+        self._ax.set_xlabel("Categoría")
+        self._ax.set_ylabel("Tiempo (horas)")
+        self._ax.set_title("Tiempo Total por Categoría")
+        self._stack.addWidget(self.canvas)
+        # Bars and labels are animated: full draws leave them out of the
+        # saved background, and they are drawn on top afterwards.
+        self.canvas.mpl_connect("draw_event", self._on_draw)
+
+    def _rebuild_bars(self, names: List[str], hours: List[float]) -> None:
+        for artist in self._bars + self._labels:
+            artist.remove()
+        container = self._ax.bar(range(len(names)), hours, animated=True)
+        self._bars = list(container)
+        for bar, name in zip(self._bars, names):
+            bar.set_label(name)
+        self._ax.set_xticks(range(len(names)), names)
+        self._labels = [
+            self._ax.text(bar.get_x() + bar.get_width() / 2, 0, "", ha="center", va="bottom",
+                          fontsize="small", animated=True)
+            for bar in self._bars
+        ]
+        self._rescale(hours, force=True)
+        self._move_bars(hours)
+
+    def _move_bars(self, hours: List[float]) -> None:
+        for bar, label, value, (_, seconds) in zip(self._bars, self._labels, hours, self.data):
+            bar.set_height(value)
+            label.set_y(value)
+            label.set_text(format_duration(seconds))
+
+    def _rescale(self, hours: List[float], force: bool = False) -> bool:
+        top = max(hours, default=0) or 1
+        _, current = self._ax.get_ylim()
+        if force or top > current or top * Y_HEADROOM < current / 2:
+            self._ax.set_ylim(0, top * Y_HEADROOM)
+            return True
+        return False
+
+    def _full_draw(self) -> None:
+        self.full_draws += 1
+        self.canvas.draw()
+
+    def _on_draw(self, event) -> None:
+        self._background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self._draw_animated()
+
+    def _blit(self) -> None:
+        if self._background is None:
+            self._full_draw()
+            return
+        self.blits += 1
+        self.canvas.restore_region(self._background)
+        self._draw_animated()
+        self.canvas.blit(self.figure.bbox)
+
+    def _draw_animated(self) -> None:
+        for artist in self._bars + self._labels:
+            self._ax.draw_artist(artist)
+
+    def _snapshot_png(self) -> bytes:
+        # The Agg buffer already holds the last draw; encoding it is cheap
+        # next to rendering the figure again with savefig.
+        buffer = self.canvas.buffer_rgba()
+        height, width = buffer.shape[:2]
+        image = QImage(bytes(buffer), width, height, QImage.Format_RGBA8888)
+        data = QByteArray()
+        device = QBuffer(data)
+        device.open(QIODevice.WriteOnly)
+        image.save(device, "PNG")
+        return bytes(data)
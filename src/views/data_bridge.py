@@ -0,0 +1,42 @@
+import logging
+from concurrent.futures import Future
+from typing import Callable, Optional
+from PyQt5.QtCore import QObject, Qt, pyqtSignal
+from src.controllers.data_access import DataAccess
+
+logger = logging.getLogger(__name__)
+
+
+# Delivers DataAccess results and change events on the GUI thread.
+#
+# Both signals are queued from the worker threads in the order things
+# happened, so a command's change events always arrive before its on_done.
+class DataBridge(QObject):
+    task_changed = pyqtSignal(str, int, object)
+    _completed = pyqtSignal(object, object, object)
+
+    def __init__(self, data_access: DataAccess, parent=None):
+        super().__init__(parent)
+        self.data_access = data_access
+        self._completed.connect(self._deliver, Qt.QueuedConnection)
+        data_access.add_listener(self.task_changed.emit)
+
+    def write(self, command, on_done: Optional[Callable] = None, on_error: Optional[Callable] = None) -> Future:
+        return self._watch(self.data_access.write(command), on_done, on_error)
+
+    def read(self, query, on_done: Optional[Callable] = None, on_error: Optional[Callable] = None) -> Future:
+        return self._watch(self.data_access.read(query), on_done, on_error)
+
+    def _watch(self, future: Future, on_done, on_error) -> Future:
+        future.add_done_callback(lambda done: self._completed.emit(done, on_done, on_error))
+        return future
+
+    def _deliver(self, future: Future, on_done, on_error) -> None:
+        error = future.exception()
+        if error is None:
+            if on_done is not None:
+                on_done(future.result())
+        elif on_error is not None:
+            on_error(error)
+        else:
+            logger.error("Background database command failed: %s", error)
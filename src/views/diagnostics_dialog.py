@@ -0,0 +1,96 @@
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QTableWidget, QTableWidgetItem, QListWidget, QPushButton,
+    QFileDialog, QMessageBox, QHeaderView,
+)
+from PyQt5.QtCore import Qt
+from src.utils.database import get_engine_settings
+from src.utils.instrumentation import Instrumentation, instrumentation, QUERY, ACTION
+
+COLUMNS = ["Tipo", "Operación", "N", "Media (ms)", "p50", "p90", "p99", "Máx"]
+KIND_LABELS = {QUERY: "SQL", ACTION: "UI"}
+
+
+# Read-only view over the rolling histograms and the slow-operation log.
+class DiagnosticsDialog(QDialog):
+    def __init__(self, parent=None, source: Instrumentation = instrumentation):
+        super().__init__(parent)
+        self.source = source
+        self.setWindowTitle("Diagnóstico de rendimiento")
+        self.resize(900, 600)
+
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+
+        self.thresholds_label = QLabel()
+        layout.addWidget(self.thresholds_label)
+        self.database_label = QLabel()
+        layout.addWidget(self.database_label)
+
+        self.table = QTableWidget(0, len(COLUMNS))
+        self.table.setHorizontalHeaderLabels(COLUMNS)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setSortingEnabled(True)
+        self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
+        layout.addWidget(self.table)
+
+        layout.addWidget(QLabel("Operaciones lentas:"))
+        self.slow_list = QListWidget()
+        layout.addWidget(self.slow_list)
+
+        buttons = QHBoxLayout()
+        self.refresh_button = QPushButton("Actualizar")
+        self.refresh_button.clicked.connect(self.refresh)
+        self.export_button = QPushButton("Exportar JSON")
+        self.export_button.clicked.connect(self.export_json)
+        self.reset_button = QPushButton("Reiniciar")
+        self.reset_button.clicked.connect(self.reset)
+        for button in (self.refresh_button, self.export_button, self.reset_button):
+            buttons.addWidget(button)
+        layout.addLayout(buttons)
+
+        self.refresh()
+
+    def refresh(self):
+        report = self.source.to_dict()
+        thresholds = report["thresholds_ms"]
+        self.thresholds_label.setText(
+            f"Umbrales: SQL {thresholds[QUERY]:.0f} ms, UI {thresholds[ACTION]:.0f} ms"
+        )
+        settings = get_engine_settings()
+        pragmas = ", ".join(f"{name}={value}" for name, value in settings["pragmas"].items())
+        self.database_label.setText(
+            f"Base de datos: {settings['url']} (perfil {settings['profile']}, {settings['pool']} "
+            f"de {settings['pool_size']}) — {pragmas}"
+        )
+
+        rows = [(QUERY, name, stats) for name, stats in report["queries"].items()]
+        rows += [(ACTION, name, stats) for name, stats in report["actions"].items()]
+        self.table.setSortingEnabled(False)
+        self.table.setRowCount(len(rows))
+        for row, (kind, name, stats) in enumerate(rows):
+            values = [KIND_LABELS[kind], name, stats["count"], stats["mean_ms"],
+                      stats["p50_ms"], stats["p90_ms"], stats["p99_ms"], stats["max_ms"]]
+            for column, value in enumerate(values):
+                item = QTableWidgetItem()
+                if isinstance(value, float):
+                    value = round(value, 2)
+                item.setData(Qt.DisplayRole, value)
+                self.table.setItem(row, column, item)
+        self.table.setSortingEnabled(True)
+
+        self.slow_list.clear()
+        for entry in reversed(report["slow_log"]):
+            self.slow_list.addItem(f"{entry['at']}  [{KIND_LABELS[entry['kind']]}] {entry['ms']:.1f} ms  {entry['name']}")
+
+    def export_json(self):
+        file_name, _ = QFileDialog.getSaveFileName(self, "Exportar diagnóstico", "diagnostico.json",
+                                                   "JSON Files (*.json);;All Files (*)")
+        if file_name:
+            try:
+                self.source.dump_json(file_name)
+            except OSError as e:
+                QMessageBox.critical(self, "Error", f"No se pudo guardar el diagnóstico: {e}")
+
+    def reset(self):
+        self.source.reset()
+        self.refresh()
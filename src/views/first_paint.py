@@ -0,0 +1,21 @@
+from typing import Callable
+from PyQt5.QtCore import QEvent, QObject, QTimer
+from PyQt5.QtWidgets import QWidget
+
+
+class _FirstPaintFilter(QObject):
+    def __init__(self, widget: QWidget, callback: Callable[[], None]):
+        super().__init__(widget)
+        self.callback = callback
+
+    def eventFilter(self, watched, event):
+        if event.type() == QEvent.Paint:
+            watched.removeEventFilter(self)
+            self.deleteLater()
+            # Fire once the paint event itself has been processed.
+            QTimer.singleShot(0, self.callback)
+        return False
+
+
+def notify_first_paint(widget: QWidget, callback: Callable[[], None]) -> None:
+    widget.installEventFilter(_FirstPaintFilter(widget, callback))
@@ -1,65 +1,177 @@
-import os
-import csv
-from PyQt5.QtWidgets import QMainWindow, QListWidgetItem, QMessageBox, QFileDialog
-from PyQt5.uic import loadUi
-from PyQt5.QtCore import QTimer
-from plyer import notification
+import logging
+from datetime import datetime, timedelta, timezone
+from PyQt5.QtWidgets import QMainWindow, QMessageBox, QFileDialog, QProgressDialog, QInputDialog, QActionGroup
+from PyQt5.QtCore import Qt, QEvent, QThreadPool, QTimer
 
 from src.controllers.task_controller import TaskController
+from src.controllers.data_access import DataAccess
+from src.controllers.change_feed import ChangeFeed
+from src.utils.archive import ARCHIVE_AFTER_DAYS, dispose_shared_archive_stores
 from src.utils.database import get_db_session
-from src.models.task import Task
+from src.utils.checkpoint import claim_journal
+from src.utils.ui_loader import load_ui
+from src.utils.exceptions import TaskNotFoundError
+from src.utils.instrumentation import instrumentation, timed
+from src.utils.notifications import NotificationDispatcher, NotificationScheduler, load_rules
+from src.models.task import TaskSnapshot, format_duration
+from src.models.task_filter import TaskFilter
 from src.views.task_dialog import TaskDialog
-from src.views.statistics_dialog import StatisticsDialog
+from src.views.task_list_model import TaskListModel, ALL_CATEGORIES
+from src.views.workers import ChunkedImport, CsvExportWorker
+from src.views.data_bridge import DataBridge
+from src.views.timer_engine import TimerEngine
+
+logger = logging.getLogger(__name__)
+
+# Typing is debounced so a search runs once the user pauses.
+SEARCH_DEBOUNCE_MS = 250
+# Other windows' and scripts' commits are picked up this often.
+CHANGE_POLL_MS = 1000
+
+
+# The Filtros menu. Built each time one is chosen so date bounds follow the
+# calendar; within a day the same choice yields an equal spec and hits the
+# controller's filter cache.
+def saved_filters() -> dict:
+    today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    return {
+        "Todas las tareas": None,
+        "En curso": TaskFilter(running=True),
+        "Pendientes": TaskFilter(statuses={"Pending"}, sort=(("updated_at", True),)),
+        "Completadas esta semana": TaskFilter(statuses={"Completed"},
+                                              updated_from=today - timedelta(days=today.weekday())),
+        "Más de una hora": TaskFilter(min_time_spent=3600, sort=(("time_spent", True),)),
+        "Modificadas recientemente": TaskFilter(sort=(("updated_at", True),)),
+    }
+
+
+# Nothing has been scheduled yet (None means "no task running").
+_UNSCHEDULED = object()
 
 
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
-        ui_path = os.path.join(os.path.dirname(__file__), "..", "ui", "main_window.ui")
-        loadUi(ui_path, self)
+        load_ui(self, "main_window")
 
         self.db_session = get_db_session()
         self.task_controller = TaskController(self.db_session)
-        self.current_task: Task | None = None
+        # Writes run on the data access writer thread; the window's own
+        # controller only reads and mirrors the committed changes.
+        self.data_access = DataAccess()
+        self.data = DataBridge(self.data_access, self)
+        self.data.task_changed.connect(self.task_controller.apply_external_change, Qt.QueuedConnection)
+        self.checkpoint_journal, self._orphan_journals = claim_journal()
+        self.current_task: TaskSnapshot | None = None
+        self.timer_engine = TimerEngine(self)
+        self.notification_scheduler = NotificationScheduler(load_rules())
+        self.notification_dispatcher = NotificationDispatcher()
+        self.notification_timer = QTimer(self)
+        self.notification_timer.setSingleShot(True)
+        self.notification_timer.timeout.connect(self.dispatch_due_notifications)
+        self._scheduled_session = _UNSCHEDULED
+        self.change_feed = ChangeFeed(self.db_session.get_bind())
+        self.change_timer = QTimer(self)
+        self.change_timer.setInterval(CHANGE_POLL_MS)
+        self.change_timer.timeout.connect(self.poll_changes)
+        self.recover_interrupted_session()
 
         self.setup_ui()
+        self.change_feed.start()
         self.load_tasks()
         self.setup_timer()
+        self.change_timer.start()
+
+    def recover_interrupted_session(self):
+        # Only journals no live instance holds: another window's running
+        # timer is not an interrupted session.
+        for journal in [self.checkpoint_journal] + self._orphan_journals:
+            checkpoint = journal.last_checkpoint()
+            if checkpoint and not checkpoint.is_clean_shutdown:
+                self.task_controller.recover_interrupted_session(
+                    checkpoint.task_id, checkpoint.started_at, checkpoint.at)
+            journal.compact()
+        for journal in self._orphan_journals:
+            journal.release()
+        self._orphan_journals = []
 
     def setup_ui(self):
         self.setWindowTitle("TaskFlow - Gestor de Tareas")
+        self.task_model = TaskListModel(self.task_controller, self)
+        self.task_list_view.setModel(self.task_model)
+
         self.add_task_button.clicked.connect(self.add_task)
         self.edit_task_button.clicked.connect(self.edit_selected_task)
         self.delete_task_button.clicked.connect(self.delete_selected_task)
         self.toggle_timer_button.clicked.connect(self.toggle_timer)
-        self.task_list_widget.itemSelectionChanged.connect(self.update_button_states)
+        self.task_list_view.selectionModel().currentChanged.connect(self.update_button_states)
+        self.task_list_view.selectionModel().selectionChanged.connect(self.update_button_states)
+        self.task_model.modelReset.connect(self.update_button_states)
+        self.task_model.rowsRemoved.connect(self.update_button_states)
+        self.task_model.dataChanged.connect(self.update_button_states)
         self.category_filter_combobox.currentIndexChanged.connect(self.filter_tasks)
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.search_tasks)
+        self.search_line_edit.textChanged.connect(self.search_timer.start)
         self.action_estadisticas.triggered.connect(self.show_statistics)
+        self.action_diagnostico.triggered.connect(self.show_diagnostics)
         self.action_exportar.triggered.connect(self.export_tasks_to_csv)
+        self.action_importar.triggered.connect(self.import_tasks)
+        self.action_cambiar_categoria.triggered.connect(self.recategorize_selected_tasks)
+        self.action_renombrar_categoria.triggered.connect(self.rename_category)
+        self.action_reiniciar_temporizadores.triggered.connect(self.reset_selected_timers)
+        self.action_archivar.triggered.connect(self.archive_completed_tasks)
+        self.filter_actions = QActionGroup(self)
+        for name in saved_filters():
+            action = self.menuFiltros.addAction(name)
+            action.setCheckable(True)
+            action.setChecked(not self.filter_actions.actions())
+            self.filter_actions.addAction(action)
+        self.filter_actions.triggered.connect(self.apply_saved_filter)
 
         self.update_button_states()
         self.populate_categories()
 
     def populate_categories(self):
+        current = self.category_filter_combobox.currentText() or ALL_CATEGORIES
+        categories = self.task_controller.get_category_names()
+
+        # Repopulating must not trigger a reload of the list on its own.
+        self.category_filter_combobox.blockSignals(True)
         self.category_filter_combobox.clear()
-        self.category_filter_combobox.addItem("Todas")
-        categories = sorted(list(set([task.category for task in self.task_controller.get_all_tasks()])))
+        self.category_filter_combobox.addItem(ALL_CATEGORIES)
         self.category_filter_combobox.addItems(categories)
+        index = self.category_filter_combobox.findText(current)
+        self.category_filter_combobox.setCurrentIndex(max(index, 0))
+        self.category_filter_combobox.blockSignals(False)
 
-    def load_tasks(self, category: str = "Todas"):
-        self.task_list_widget.clear()
-        if category == "Todas":
-            tasks = self.task_controller.get_all_tasks()
-        else:
-            tasks = self.task_controller.get_tasks_by_category(category)
+        if index < 0:
+            self.filter_tasks()
+
+    @timed()
+    def apply_saved_filter(self, action):
+        self.task_model.set_filter(saved_filters()[action.text()])
+        if self.task_model.truncated:
+            self.status_bar.showMessage(f"Mostrando las primeras {self.task_model.rowCount()} tareas del filtro.")
+        self.update_button_states()
 
-        for task in tasks:
-            item = QListWidgetItem(f"{task.title} ({task.category}) - {task.status} - {task.time_spent_human}")
-            item.setData(1, task.id)
-            self.task_list_widget.addItem(item)
+    def search_tasks(self):
+        self.task_model.set_search_text(self.search_line_edit.text())
 
+    @timed()
+    def load_tasks(self, category: str = ALL_CATEGORIES):
+        self.task_model.set_category(category)
         self.update_button_states()
 
+    def selected_task_id(self) -> int | None:
+        return self.task_model.task_id_at(self.task_list_view.currentIndex())
+
+    def selected_task_ids(self) -> list[int]:
+        rows = self.task_list_view.selectionModel().selectedRows()
+        return [self.task_model.task_id_at(index) for index in rows]
+
     def filter_tasks(self):
         selected_category = self.category_filter_combobox.currentText()
         self.load_tasks(selected_category)
@@ -69,101 +181,245 @@ class MainWindow(QMainWindow):
         if dialog.exec_():
             title = dialog.title_input.text()
             category = dialog.category_input.text()
-            try:
-                self.task_controller.create_task(title, category)
-                self.load_tasks()
-                self.populate_categories()
-            except Exception as e:
-                QMessageBox.critical(self, "Error", str(e))
+            self.data.write(lambda controller: controller.create_task(title, category).id,
+                            on_done=lambda task_id: self.populate_categories(), on_error=self.show_error)
 
     def edit_selected_task(self):
-        selected_item = self.task_list_widget.currentItem()
-        if selected_item:
-            task_id = selected_item.data(1)
-            task = self.task_controller.get_task(task_id)
+        task_id = self.selected_task_id()
+        if task_id is not None:
+            task = self.task_controller.get_task_snapshot(task_id)
             dialog = TaskDialog(self, task)
             if dialog.exec_():
                 title = dialog.title_input.text()
                 category = dialog.category_input.text()
-                try:
-                    self.task_controller.update_task(task_id, title=title, category=category)
-                    self.load_tasks()
-                    self.populate_categories()
-                except Exception as e:
-                    QMessageBox.critical(self, "Error", str(e))
+                self.data.write(lambda controller: controller.update_task(task_id, title=title, category=category).id,
+                                on_done=lambda _: self.after_bulk_change(), on_error=self.show_error)
 
     def delete_selected_task(self):
-        selected_item = self.task_list_widget.currentItem()
-        if selected_item:
-            task_id = selected_item.data(1)
-            reply = QMessageBox.question(self, "Eliminar Tarea",
-                                         "¿Estás seguro de que quieres eliminar esta tarea?",
+        task_ids = self.selected_task_ids()
+        if task_ids:
+            message = ("¿Estás seguro de que quieres eliminar esta tarea?" if len(task_ids) == 1
+                       else f"¿Estás seguro de que quieres eliminar {len(task_ids)} tareas?")
+            reply = QMessageBox.question(self, "Eliminar Tarea", message,
                                          QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
             if reply == QMessageBox.Yes:
-                try:
-                    self.task_controller.delete_task(task_id)
-                    self.load_tasks()
-                    self.populate_categories()
-                except Exception as e:
-                    QMessageBox.critical(self, "Error", str(e))
+                self.data.write(lambda controller: controller.delete_tasks(task_ids),
+                                on_done=lambda _: self.after_bulk_change(), on_error=self.show_error)
 
+    def recategorize_selected_tasks(self):
+        task_ids = self.selected_task_ids()
+        if task_ids:
+            category, ok = QInputDialog.getItem(self, "Cambiar Categoría", f"Nueva categoría para {len(task_ids)} tareas:",
+                                                self.task_controller.get_category_names(), 0, True)
+            if ok and category.strip():
+                category = category.strip()
+                self.data.write(lambda controller: controller.update_tasks(task_ids, category=category),
+                                on_done=lambda _: self.after_bulk_change(), on_error=self.show_error)
+
+    def rename_category(self):
+        categories = self.task_controller.get_category_names()
+        if not categories:
+            return
+        current = self.category_filter_combobox.currentText()
+        old_name, ok = QInputDialog.getItem(self, "Renombrar Categoría", "Categoría:", categories,
+                                            categories.index(current) if current in categories else 0, False)
+        if not ok:
+            return
+        new_name, ok = QInputDialog.getText(self, "Renombrar Categoría", f"Nuevo nombre para {old_name}:", text=old_name)
+        if ok and new_name.strip():
+            new_name = new_name.strip()
+
+            def on_renamed(_):
+                self.refresh_current_task()
+                self.populate_categories()
+                if current == old_name:
+                    self.category_filter_combobox.setCurrentText(new_name)
+
+            self.data.write(lambda controller: controller.rename_category(old_name, new_name),
+                            on_done=on_renamed, on_error=self.show_error)
+
+    def reset_selected_timers(self):
+        task_ids = self.selected_task_ids()
+        if task_ids:
+            reply = QMessageBox.question(self, "Reiniciar Temporizadores",
+                                         f"¿Reiniciar el tiempo de {len(task_ids)} tareas?",
+                                         QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+            if reply == QMessageBox.Yes:
+                self.data.write(lambda controller: controller.reset_timers(task_ids),
+                                on_done=lambda _: self.refresh_current_task(), on_error=self.show_error)
+
+    def archive_completed_tasks(self):
+        days, ok = QInputDialog.getInt(self, "Archivar Tareas",
+                                       "Archivar tareas completadas sin cambios desde hace (días):",
+                                       ARCHIVE_AFTER_DAYS, 1, 36500)
+        if not ok:
+            return
+
+        def on_archived(moved):
+            self.after_bulk_change()
+            QMessageBox.information(self, "Archivar Tareas", f"Se archivaron {moved} tareas.")
+
+        self.data.write(lambda controller: controller.archive_completed_tasks(days),
+                        on_done=on_archived, on_error=self.show_error)
+
+    def after_bulk_change(self):
+        self.refresh_current_task()
+        self.populate_categories()
+
+    def show_error(self, error: Exception):
+        QMessageBox.critical(self, "Error", str(error))
+
+    def poll_changes(self):
+        # Applied on the writer, whose events reach the list like our own.
+        changes = self.change_feed.poll()
+        if changes:
+            self.data.write(lambda controller: controller.apply_changes(changes),
+                            on_done=self.after_external_changes, on_error=self.show_error)
+
+    def after_external_changes(self, changed: int):
+        if not changed:
+            return
+        self.populate_categories()
+        # Another instance may have started or stopped a timer.
+        running = self.task_controller.get_running_task()
+        running = running.snapshot() if running else None
+        current = self.current_task
+        if (running and (running.id, running.started_at)) != (current and (current.id, current.started_at)):
+            if current is not None:
+                self.checkpoint_journal.close_session()
+            self.set_current_task(running)
+            self.update_button_states()
+        elif running is not None and (running.title, running.category) != (current.title, current.category):
+            self.set_current_task(running)
+
+    def refresh_current_task(self):
+        # Bulk operations may have renamed, reset or deleted the running task.
+        if self.current_task is None:
+            return
+        try:
+            task = self.task_controller.get_task_snapshot(self.current_task.id)
+        except TaskNotFoundError:
+            task = None
+        if task is None or not task.is_running:
+            self.checkpoint_journal.close_session()
+        self.set_current_task(task)
+
+    @timed()
     def toggle_timer(self):
-        selected_item = self.task_list_widget.currentItem()
-        if selected_item:
-            task_id = selected_item.data(1)
-            task = self.task_controller.get_task(task_id)
+        task_id = self.selected_task_id()
+        if task_id is not None:
+            task = self.task_controller.get_task_snapshot(task_id)
 
+            # The stop-then-start switch is one writer command, so it
+            # commits atomically and in order with anything queued before.
             if task.is_running:
-                self.task_controller.stop_task_timer(task_id)
-                self.current_task = None
+                self.data.write(lambda controller: controller.stop_task_timer(task_id).snapshot(),
+                                on_done=self.on_timer_changed, on_error=self.show_error)
             else:
-                if self.current_task and self.current_task.is_running:
-                    self.task_controller.stop_task_timer(self.current_task.id)
-
-                self.task_controller.start_task_timer(task_id)
-                self.current_task = task
+                self.data.write(lambda controller: controller.switch_timer(task_id).snapshot(),
+                                on_done=self.on_timer_changed, on_error=self.show_error)
 
-            self.load_tasks()
-            self.update_button_states()
+    def on_timer_changed(self, task: TaskSnapshot):
+        self.checkpoint_journal.close_session()
+        self.set_current_task(task)
+        self.update_button_states()
 
     def setup_timer(self):
-        self.ui_timer = QTimer(self)
-        self.ui_timer.setInterval(1000)
-        self.ui_timer.timeout.connect(self.update_timer_display)
-        self.ui_timer.start()
+        self.timer_engine.tick.connect(self.update_timer_display)
 
         running_task = self.task_controller.get_running_task()
-        if running_task:
-            self.current_task = running_task
+        self.set_current_task(running_task.snapshot() if running_task else None)
+
+    def set_current_task(self, task: TaskSnapshot | None):
+        # The engine ticks only while a task runs; it emits the first tick
+        # itself when started.
+        self.current_task = task if task is not None and task.is_running else None
+        if self.current_task is not None:
+            self.timer_engine.start(self.current_task)
+        else:
+            self.timer_engine.stop()
             self.update_timer_display()
+        self.schedule_notifications()
 
-    def update_timer_display(self):
-        if self.current_task and self.current_task.is_running:
-            self.status_bar.showMessage(f"Tarea activa: {self.current_task.title} - {self.current_task.time_spent_human}")
-            if self.current_task.get_current_session_time() % 5 == 0:
-                self.task_controller.save_task_progress(self.current_task)
-            
-            if self.current_task.get_current_session_time() > 0 and self.current_task.get_current_session_time() % (25 * 60) == 0:
-                notification.notify(
-                    title='TaskFlow - ¡Descanso Pomodoro!',
-                    message=f'¡Has trabajado en "{self.current_task.title}" por 25 minutos! Tómate un descanso.',
-                    app_name='TaskFlow',
-                    timeout=10
-                )
+    @timed()
+    def update_timer_display(self, total_seconds: int = 0):
+        if self.current_task is not None:
+            self.status_bar.showMessage(f"Tarea activa: {self.current_task.title} - {format_duration(total_seconds)}")
+            self.checkpoint_journal.heartbeat(self.current_task.id, self.current_task.started_at)
         else:
             self.status_bar.showMessage("No hay tarea activa.")
             self.toggle_timer_button.setText("Iniciar Temporizador")
 
+    def schedule_notifications(self):
+        task = self.current_task
+        # A restart (new started_at) or an edit to the rule's category or the
+        # notified title reschedules as much as a different task does.
+        session = (task.id, task.started_at, task.category, task.title) if task is not None else None
+        if session == self._scheduled_session:
+            return
+        self._scheduled_session = session
+        if task is None:
+            self.notification_scheduler.session_stopped()
+            self.arm_notification_timer()
+            return
+
+        # The daily budget needs today's tracked time, read off the GUI thread.
+        today = datetime.now(timezone.utc).date()
+
+        def start_session(spent_today):
+            if self._scheduled_session != session:
+                return
+            self.notification_scheduler.session_started(
+                task.id, task.title, task.category, self.timer_engine.clock.elapsed(), spent_today,
+            )
+            self.arm_notification_timer()
+
+        def on_spent_today_failed(error):
+            # Without today's total the budget is counted from the task's own
+            # time; notifications must not go unarmed for the whole session.
+            logger.error("Could not read today's time for %s: %s", task.category, error)
+            start_session(task.time_spent or 0)
+
+        self.data.read(lambda controller: controller.get_time_by_day(today, today, task.category),
+                       on_done=lambda rows: start_session(sum(seconds for _, seconds in rows)),
+                       on_error=on_spent_today_failed)
+
+    def arm_notification_timer(self):
+        due_in = self.notification_scheduler.next_due_in()
+        if due_in is None:
+            self.notification_timer.stop()
+        else:
+            self.notification_timer.start(int(due_in * 1000) + 1)
+
+    def dispatch_due_notifications(self):
+        for notification in self.notification_scheduler.due():
+            self.notification_dispatcher.send(notification)
+        self.arm_notification_timer()
+
+    def changeEvent(self, event):
+        # A minimized window needs no per-second repaints.
+        if event.type() == QEvent.WindowStateChange:
+            self.timer_engine.set_display_active(not self.isMinimized())
+        super().changeEvent(event)
+
     def update_button_states(self):
-        has_selection = self.task_list_widget.currentItem() is not None
+        task_id = self.selected_task_id()
+        task = None
+        if task_id is not None:
+            try:
+                task = self.task_controller.get_task_snapshot(task_id)
+            except TaskNotFoundError:
+                # Row about to be removed by a pending change event.
+                task_id = None
+        has_selection = task_id is not None
+        has_multi_selection = bool(self.selected_task_ids())
         self.edit_task_button.setEnabled(has_selection)
-        self.delete_task_button.setEnabled(has_selection)
+        self.delete_task_button.setEnabled(has_multi_selection)
         self.toggle_timer_button.setEnabled(has_selection)
+        self.action_cambiar_categoria.setEnabled(has_multi_selection)
+        self.action_reiniciar_temporizadores.setEnabled(has_multi_selection)
 
         if has_selection:
-            selected_item = self.task_list_widget.currentItem()
-            task_id = selected_item.data(1)
-            task = self.task_controller.get_task(task_id)
             if task.is_running:
                 self.toggle_timer_button.setText("Detener Temporizador")
             else:
@@ -172,39 +428,102 @@ class MainWindow(QMainWindow):
             self.toggle_timer_button.setText("Iniciar Temporizador")
 
     def show_statistics(self):
-        dialog = StatisticsDialog(self.db_session, self)
+        # Only opening is timed; exec_() lasts as long as the user looks.
+        with instrumentation.span("show_statistics"):
+            from src.views.statistics_dialog import StatisticsDialog
+            dialog = StatisticsDialog(self)
+        # Changes from the writer or other instances move the bars live.
+        self.data.task_changed.connect(dialog.schedule_refresh)
+        try:
+            dialog.exec_()
+        finally:
+            self.data.task_changed.disconnect(dialog.schedule_refresh)
+
+    def show_diagnostics(self):
+        from src.views.diagnostics_dialog import DiagnosticsDialog
+
+        dialog = DiagnosticsDialog(self)
         dialog.exec_()
 
     def export_tasks_to_csv(self):
         options = QFileDialog.Options()
         file_name, _ = QFileDialog.getSaveFileName(self, "Exportar Tareas a CSV", "",
                                                    "CSV Files (*.csv);;All Files (*)", options=options)
+        if not file_name:
+            return
+        # The export itself is timed by the worker as "csv_export".
+        with instrumentation.span("export_tasks_to_csv"):
+            self.export_worker = CsvExportWorker(file_name)
+            self.export_progress = QProgressDialog("Exportando tareas...", "Cancelar", 0, 0, self)
+            self.export_progress.setWindowTitle("Exportar CSV")
+            self.export_progress.setWindowModality(Qt.WindowModal)
+            self.export_progress.setMinimumDuration(300)
+            self.export_progress.canceled.connect(self.export_worker.cancel)
+
+            signals = self.export_worker.signals
+            signals.progress.connect(self.on_export_progress)
+            signals.finished.connect(self.on_export_finished)
+            signals.cancelled.connect(self.on_export_cancelled)
+            signals.failed.connect(self.on_export_failed)
+            QThreadPool.globalInstance().start(self.export_worker)
+
+    def on_export_progress(self, written: int, total: int):
+        self.export_progress.setMaximum(total)
+        self.export_progress.setValue(written)
+
+    def on_export_finished(self, written: int):
+        self.export_progress.reset()
+        QMessageBox.information(self, "Exportación Exitosa", f"{written} tareas exportadas a CSV correctamente.")
+
+    def on_export_cancelled(self):
+        self.export_progress.reset()
+        self.status_bar.showMessage("Exportación cancelada.", 5000)
+
+    def on_export_failed(self, message: str):
+        self.export_progress.reset()
+        QMessageBox.critical(self, "Error de Exportación", f"Error al exportar tareas: {message}")
+
+    def import_tasks(self):
+        file_name, _ = QFileDialog.getOpenFileName(self, "Importar Tareas", "",
+                                                   "CSV/JSONL Files (*.csv *.jsonl *.ndjson);;All Files (*)")
         if file_name:
-            try:
-                tasks = self.task_controller.get_all_tasks()
-                with open(file_name, 'w', newline='', encoding='utf-8') as csvfile:
-                    fieldnames = ['ID', 'Título', 'Categoría', 'Estado', 'Tiempo Empleado (segundos)', 'Tiempo Empleado (HH:MM:SS)', 'Iniciada En', 'Creada En', 'Actualizada En']
-                    writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-
-                    writer.writeheader()
-                    for task in tasks:
-                        writer.writerow({
-                            'ID': task.id,
-                            'Título': task.title,
-                            'Categoría': task.category,
-                            'Estado': task.status,
-                            'Tiempo Empleado (segundos)': task.time_spent,
-                            'Tiempo Empleado (HH:MM:SS)': task.time_spent_human,
-                            'Iniciada En': task.started_at.isoformat() if task.started_at else '',
-                            'Creada En': task.created_at.isoformat() if task.created_at else '',
-                            'Actualizada En': task.updated_at.isoformat() if task.updated_at else ''
-                        })
-                QMessageBox.information(self, "Exportación Exitosa", "Tareas exportadas a CSV correctamente.")
-            except Exception as e:
-                QMessageBox.critical(self, "Error de Exportación", f"Error al exportar tareas: {e}")
+            self.action_importar.setEnabled(False)
+            self.status_bar.showMessage("Importando tareas...")
+            self.import_job = ChunkedImport(self.data, file_name, parent=self)
+            self.import_job.progress.connect(
+                lambda rows: self.status_bar.showMessage(f"Importando tareas... {rows} filas"))
+            self.import_job.finished.connect(self.on_import_finished)
+            self.import_job.failed.connect(self.on_import_failed)
+            self.import_job.start()
+
+    def on_import_finished(self, result):
+        self.action_importar.setEnabled(True)
+        self.task_model.reload()
+        self.populate_categories()
+        QMessageBox.information(self, "Importación Exitosa",
+                                f"{result.rows} tareas importadas en {result.seconds:.1f} s "
+                                f"({result.rows_per_second:.0f} filas/s).")
+
+    def on_import_failed(self, message: str, imported: int):
+        self.action_importar.setEnabled(True)
+        self.status_bar.clearMessage()
+        if imported:
+            self.task_model.reload()
+            self.populate_categories()
+            message += f"\n\nSe importaron {imported} tareas antes del error."
+        QMessageBox.critical(self, "Error de Importación", f"Error al importar tareas: {message}")
 
     def closeEvent(self, event):
+        # Queued writes (e.g. a timer stop) still land before shutting down.
+        self.data_access.shutdown()
+        self.timer_engine.stop()
+        self.notification_timer.stop()
+        self.notification_dispatcher.close()
+        self.change_timer.stop()
+        self.change_feed.close()
         if self.current_task and self.current_task.is_running:
-            self.task_controller.save_task_progress(self.current_task)
+            self.checkpoint_journal.mark_clean_shutdown(self.current_task.id)
+        self.checkpoint_journal.release()
         self.db_session.close()
+        dispose_shared_archive_stores()
         event.accept()
\ No newline at end of file
@@ -1,54 +1,70 @@
-
 from PyQt5.QtWidgets import QDialog, QVBoxLayout, QLabel
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from src.models.task import Task
+from PyQt5.QtCore import QThreadPool, QTimer
+from src.models.task import format_duration
+from src.views.category_chart import CategoryChart
+from src.views.workers import StatisticsWorker
+
+# Bursts of task changes (a bulk edit, a sync) refresh the chart once.
+REFRESH_DELAY_MS = 500
 
+# The summary and the chart are built with the first results and then only
+# updated: refresh() re-runs the worker and the chart moves its bars.
 class StatisticsDialog(QDialog):
-    def __init__(self, db_session: Session, parent=None):
+    def __init__(self, parent=None, thread_pool: QThreadPool = None):
         super().__init__(parent)
-        self.db_session = db_session
+        self.thread_pool = thread_pool or QThreadPool.globalInstance()
+        self.worker = None
+        self.summary_label = None
+        self.chart = None
         self.setWindowTitle("Estadísticas de Tareas")
         self.resize(600, 400)
 
         self.layout = QVBoxLayout()
         self.setLayout(self.layout)
+        self.status_label = QLabel("Calculando estadísticas...")
+        self.layout.addWidget(self.status_label)
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setSingleShot(True)
+        self.refresh_timer.setInterval(REFRESH_DELAY_MS)
+        self.refresh_timer.timeout.connect(self.load_statistics)
 
         self.load_statistics()
 
+    def schedule_refresh(self, *args):
+        # Connected to change signals; the arguments are not needed.
+        self.refresh_timer.start()
+
     def load_statistics(self):
-        for i in reversed(range(self.layout.count())):
-            widget = self.layout.itemAt(i).widget()
-            if widget:
-                widget.setParent(None)
+        self.worker = StatisticsWorker()
+        self.worker.signals.finished.connect(self.show_statistics)
+        self.worker.signals.failed.connect(self.show_error)
+        self.thread_pool.start(self.worker)
 
-        category_times = self.db_session.query(
-            Task.category, func.sum(Task.time_spent)
-        ).group_by(Task.category).all()
+    def show_error(self, message: str):
+        self.status_label.setText(f"Error al calcular estadísticas: {message}")
+        self.status_label.show()
 
+    def show_statistics(self, category_times):
         if not category_times:
-            self.layout.addWidget(QLabel("No hay datos de tareas para mostrar estadísticas."))
+            self.status_label.setText("No hay datos de tareas para mostrar estadísticas.")
+            self.status_label.show()
+            if self.chart is not None:
+                self.summary_label.hide()
+                self.chart.hide()
             return
 
-        summary_label = QLabel("Tiempo total por categoría:")
-        self.layout.addWidget(summary_label)
-        for category, total_seconds in category_times:
-            hours = total_seconds // 3600
-            minutes = (total_seconds % 3600) // 60
-            seconds = total_seconds % 60
-            self.layout.addWidget(QLabel(f"  - {category}: {hours:02d}:{minutes:02d}:{seconds:02d}"))
-
-        categories = [item[0] for item in category_times]
-        times_in_hours = [item[1] / 3600]
-
-        fig = Figure()
-        ax = fig.add_subplot(111)
-        ax.bar(categories, times_in_hours)
-        ax.set_xlabel("Categoría")
-        ax.set_ylabel("Tiempo (horas)")
-        ax.set_title("Tiempo Total por Categoría")
-
-        canvas = FigureCanvas(fig)
-        self.layout.addWidget(canvas)
+        if self.chart is None:
+            self.summary_label = QLabel()
+            self.layout.addWidget(self.summary_label)
+            self.chart = CategoryChart(self)
+            self.layout.addWidget(self.chart, 1)
+        self.status_label.hide()
+        lines = ["Tiempo total por categoría:"]
+        lines += [f"  - {category}: {format_duration(total_seconds)}" for category, total_seconds in category_times]
+        self.summary_label.setText("\n".join(lines))
+        self.summary_label.show()
+        self.chart.show()
+        # The chart's size is part of its render-cache key: lay out first.
+        self.layout.activate()
+        self.chart.set_data(category_times)
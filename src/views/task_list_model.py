@@ -0,0 +1,200 @@
+from bisect import bisect_left
+from typing import Dict, List, Optional
+from PyQt5.QtCore import QAbstractListModel, QModelIndex, Qt
+
+from src.controllers.task_controller import (
+    TaskController, PageCursor, TASK_INSERTED, TASK_UPDATED, TASK_REMOVED, TASKS_RELOADED, DEFAULT_PAGE_SIZE,
+    DEFAULT_SEARCH_LIMIT,
+)
+from src.models.task import TaskSnapshot
+from src.models.task_filter import TaskFilter
+
+ALL_CATEGORIES = "Todas"
+
+TaskIdRole = Qt.UserRole + 1
+TaskRunningRole = Qt.UserRole + 2
+
+
+# Fed by TaskController change events: only the rows touched by an insert,
+# update or delete are signalled to the view, never the whole list.
+#
+# Rows are ordered by id and fetched a page at a time through Qt's
+# canFetchMore/fetchMore, so the view pulls more as the user scrolls.
+#
+# With a search text set the model holds the ranked search results instead;
+# they keep their rank order and only updates/removals are applied live.
+#
+# With a TaskFilter set the model holds that filter's (sorted) result; the
+# category combobox narrows it. A matching new task re-runs the filter; an
+# edited one moves to where the filter's sort puts it.
+class TaskListModel(QAbstractListModel):
+    def __init__(self, task_controller: TaskController, parent=None, page_size: int = DEFAULT_PAGE_SIZE):
+        super().__init__(parent)
+        self.task_controller = task_controller
+        self.category = ALL_CATEGORIES
+        self.search_text = ""
+        self.task_filter: Optional[TaskFilter] = None
+        self.truncated = False
+        self.page_size = page_size
+        self._rows: List[TaskSnapshot] = []
+        self._row_by_id: Dict[int, int] = {}
+        self._next_cursor: Optional[PageCursor] = None
+        self._exhausted = True
+        self.task_controller.add_listener(self.on_task_changed)
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self._rows)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self._rows):
+            return None
+        row = self._rows[index.row()]
+        if role == Qt.DisplayRole:
+            return f"{row.title} ({row.category}) - {row.status} - {row.time_spent_human}"
+        if role == TaskIdRole:
+            return row.id
+        if role == TaskRunningRole:
+            return row.is_running
+        return None
+
+    def set_category(self, category: str) -> None:
+        self.category = category or ALL_CATEGORIES
+        self.reload()
+
+    def set_search_text(self, text: str) -> None:
+        self.search_text = text.strip()
+        self.reload()
+
+    def set_filter(self, task_filter: Optional[TaskFilter]) -> None:
+        self.task_filter = task_filter
+        self.reload()
+
+    def reload(self) -> None:
+        self.truncated = False
+        if self.search_text:
+            rows = self.task_controller.search(
+                self.search_text, limit=DEFAULT_SEARCH_LIMIT, category=self._category_filter()
+            )
+            next_cursor, exhausted = None, True
+        elif self.task_filter is not None:
+            result = self.task_controller.filter_tasks(self._effective_filter())
+            rows, next_cursor, exhausted = list(result.items), None, True
+            self.truncated = result.truncated
+        else:
+            page = self.task_controller.get_tasks_page(limit=self.page_size, category=self._category_filter())
+            rows, next_cursor, exhausted = page.items, page.next_cursor, not page.has_more
+
+        self.beginResetModel()
+        self._rows = rows
+        self._next_cursor = next_cursor
+        self._exhausted = exhausted
+        self._reindex(0)
+        self.endResetModel()
+
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        return not parent.isValid() and not self._exhausted
+
+    def fetchMore(self, parent=QModelIndex()) -> None:
+        if not self.canFetchMore(parent):
+            return
+        page = self.task_controller.get_tasks_page(
+            after=self._next_cursor, limit=self.page_size, category=self._category_filter()
+        )
+        self._next_cursor = page.next_cursor
+        self._exhausted = not page.has_more
+        if page.items:
+            start = len(self._rows)
+            self.beginInsertRows(QModelIndex(), start, start + len(page.items) - 1)
+            self._rows.extend(page.items)
+            self._reindex(start)
+            self.endInsertRows()
+
+    def _category_filter(self) -> Optional[str]:
+        return None if self.category == ALL_CATEGORIES else self.category
+
+    def _effective_filter(self) -> TaskFilter:
+        category = self._category_filter()
+        return self.task_filter if category is None else self.task_filter.with_categories([category])
+
+    def task_id_at(self, index) -> Optional[int]:
+        if not index.isValid():
+            return None
+        return self.data(index, TaskIdRole)
+
+    def index_of(self, task_id: int) -> QModelIndex:
+        row = self._row_by_id.get(task_id)
+        if row is None:
+            return QModelIndex()
+        return self.index(row)
+
+    def on_task_changed(self, event: str, task_id: int, task: Optional[TaskSnapshot]) -> None:
+        if event == TASKS_RELOADED:
+            self.reload()
+            return
+
+        row = self._row_by_id.get(task_id)
+        visible = task is not None and self._matches(task)
+
+        if event == TASK_REMOVED or (row is not None and not visible):
+            if row is not None:
+                self._remove_row(row)
+        elif event in (TASK_INSERTED, TASK_UPDATED) and visible:
+            if row is None:
+                if self.search_text:
+                    return
+                if self.task_filter is not None:
+                    self.reload()
+                    return
+                # Rows past the last fetched page arrive with a later page.
+                if self._exhausted or (self._rows and task.id < self._rows[-1].id):
+                    self._insert_row(task)
+            else:
+                self._rows[row] = task
+                if self.task_filter is not None and not self.search_text and self.task_filter.is_sorted:
+                    row = self._move_to_sorted_position(row)
+                index = self.index(row)
+                self.dataChanged.emit(index, index)
+
+    def _matches(self, task: TaskSnapshot) -> bool:
+        if self.task_filter is not None and not self.search_text:
+            return self._effective_filter().matches(task)
+        return self.category == ALL_CATEGORIES or task.category == self.category
+
+    def _insert_row(self, row: TaskSnapshot) -> None:
+        position = bisect_left(self._rows, row.id, key=lambda snapshot: snapshot.id)
+        self.beginInsertRows(QModelIndex(), position, position)
+        self._rows.insert(position, row)
+        self._reindex(position)
+        self.endInsertRows()
+
+    def _move_to_sorted_position(self, row: int) -> int:
+        # An edit can change the sort value (a timer stop moves time_spent
+        # and updated_at): the row moves, keeping the view's selection.
+        key = self.task_filter.sort_key()
+        task = self._rows[row]
+        others = self._rows[:row] + self._rows[row + 1:]
+        position = bisect_left(others, key(task), key=key)
+        if position == row:
+            return row
+        # Qt counts the destination in the list before the move.
+        self.beginMoveRows(QModelIndex(), row, row, QModelIndex(), position if position < row else position + 1)
+        self._rows = others
+        self._rows.insert(position, task)
+        self._reindex(min(row, position))
+        self.endMoveRows()
+        return position
+
+    def _remove_row(self, position: int) -> None:
+        self.beginRemoveRows(QModelIndex(), position, position)
+        removed = self._rows.pop(position)
+        del self._row_by_id[removed.id]
+        self._reindex(position)
+        self.endRemoveRows()
+
+    def _reindex(self, start: int) -> None:
+        if start == 0:
+            self._row_by_id = {}
+        for position in range(start, len(self._rows)):
+            self._row_by_id[self._rows[position].id] = position
@@ -0,0 +1,71 @@
+from PyQt5.QtCore import QObject, Qt, QTimer, pyqtSignal
+from src.models.task import TaskSnapshot
+from src.utils.checkpoint import CHECKPOINT_INTERVAL
+from src.utils.session_clock import SessionClock
+
+# Ticks land just past each second boundary so the display never shows a
+# second twice or skips one because the timer fired a hair early.
+TICK_SLACK_MS = 5
+
+
+# Drives the running-timer display from a SessionClock.
+#
+# A single-shot QTimer is re-armed for the next moment something changes:
+# the next whole second while the display is visible, otherwise only the
+# next journal heartbeat. With no task running the timer is stopped
+# altogether.
+class TimerEngine(QObject):
+    # total seconds of the running task (session included)
+    tick = pyqtSignal(int)
+
+    def __init__(self, parent=None, clock: SessionClock = None, heartbeat_seconds: float = CHECKPOINT_INTERVAL):
+        super().__init__(parent)
+        self.clock = clock or SessionClock()
+        self.heartbeat_seconds = heartbeat_seconds
+        self.display_active = True
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.timeout.connect(self._on_timeout)
+
+    @property
+    def running(self) -> bool:
+        return self.clock.running
+
+    @property
+    def scheduled(self) -> bool:
+        return self._timer.isActive()
+
+    def start(self, task: TaskSnapshot) -> None:
+        # The same session again (a refreshed snapshot) keeps its anchor; a
+        # restart elsewhere brings a new started_at.
+        if self.clock.running and (self.clock.task_id, self.clock.started_at) == (task.id, task.started_at):
+            self.clock.base_seconds = task.time_spent
+        else:
+            self.clock.start(task.id, task.started_at, task.time_spent)
+        self._on_timeout()
+
+    def stop(self) -> None:
+        self.clock.stop()
+        self._timer.stop()
+
+    def set_display_active(self, active: bool) -> None:
+        if active == self.display_active:
+            return
+        self.display_active = active
+        if self.running:
+            self._on_timeout()
+
+    def _on_timeout(self) -> None:
+        if not self.running:
+            return
+        elapsed = self.clock.elapsed()
+        self.tick.emit(self.clock.total_seconds(elapsed))
+        self._schedule(elapsed)
+
+    def _schedule(self, elapsed: float) -> None:
+        if self.display_active:
+            wait = self.clock.seconds_until_next(elapsed, 1)
+        else:
+            wait = self.heartbeat_seconds
+        self._timer.start(int(wait * 1000) + TICK_SLACK_MS)
@@ -0,0 +1,114 @@
+import threading
+import time
+from itertools import islice
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal
+
+from src.controllers.task_controller import TaskController
+from src.utils.csv_export import export_tasks_csv
+from src.utils.database import get_db_session
+from src.utils.exceptions import ExportCancelledError
+from src.utils.importer import IMPORT_CHUNK_ROWS, ImportResult, read_task_rows
+from src.utils.instrumentation import instrumentation
+from src.views.data_bridge import DataBridge
+
+
+class WorkerSignals(QObject):
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    progress = pyqtSignal(int, int)
+    cancelled = pyqtSignal()
+
+
+# Workers never share the GUI's session: each opens and closes its own.
+class StatisticsWorker(QRunnable):
+    def __init__(self):
+        super().__init__()
+        self.signals = WorkerSignals()
+
+    def run(self):
+        db_session = get_db_session()
+        try:
+            # Statistics span the whole history, archive included.
+            category_times = TaskController(db_session).get_category_times(include_archived=True)
+            self.signals.finished.emit(category_times)
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+        finally:
+            db_session.close()
+
+
+class CsvExportWorker(QRunnable):
+    def __init__(self, file_name: str):
+        super().__init__()
+        self.file_name = file_name
+        self.signals = WorkerSignals()
+        self._cancel_requested = threading.Event()
+
+    def cancel(self):
+        self._cancel_requested.set()
+
+    def run(self):
+        try:
+            with instrumentation.span("csv_export"):
+                written = export_tasks_csv(
+                    self.file_name,
+                    progress=self.signals.progress.emit,
+                    is_cancelled=self._cancel_requested.is_set,
+                    include_archived=True,
+                )
+            self.signals.finished.emit(written)
+        except ExportCancelledError:
+            self.signals.cancelled.emit()
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+
+
+# Imports a file through the single writer, one bulk_create_tasks
+# transaction per chunk. The next chunk is only queued once the previous
+# one is done, so other writes take turns with the import. A failing chunk
+# rolls back alone: the chunks before it stay imported.
+class ChunkedImport(QObject):
+    progress = pyqtSignal(int)
+    finished = pyqtSignal(object)
+    # message, rows imported before the error
+    failed = pyqtSignal(str, int)
+
+    def __init__(self, data: DataBridge, file_name: str, chunk_rows: int = IMPORT_CHUNK_ROWS, parent=None):
+        super().__init__(parent)
+        self.data = data
+        self.file_name = file_name
+        self.chunk_rows = chunk_rows
+        self.imported = 0
+        self._rows = None
+        self._started = 0.0
+
+    def start(self):
+        self._started = time.perf_counter()
+        self._submit()
+
+    def _submit(self):
+        self.data.write(self._import_chunk, on_done=self._on_chunk, on_error=self._on_error)
+
+    def _import_chunk(self, controller: TaskController) -> int:
+        # Runs on the writer thread, which also owns the file reader.
+        if self._rows is None:
+            self._rows = read_task_rows(self.file_name)
+        return controller.bulk_create_tasks(islice(self._rows, self.chunk_rows))
+
+    def _on_chunk(self, created: int):
+        self.imported += created
+        if created == self.chunk_rows:
+            self.progress.emit(self.imported)
+            self._submit()
+            return
+        self._close()
+        self.finished.emit(ImportResult(self.imported, time.perf_counter() - self._started))
+
+    def _on_error(self, error: Exception):
+        self._close()
+        self.failed.emit(str(error), self.imported)
+
+    def _close(self):
+        if self._rows is not None:
+            self._rows.close()
+            self._rows = None